@@ -0,0 +1,169 @@
+"""
+Concurrency benchmark: sync (gunicorn + core.wsgi) vs async (gunicorn with
+uvicorn workers + core.asgi and ASYNC_READ_VIEWS) serving the read endpoints.
+The asgi stack is the async server with the sync views, so the async views
+are measured on their own.
+
+Both stacks get the same worker count. ``--slow-clients`` keeps that many
+connections busy by trickling request headers, the way slow mobile clients
+hold a sync worker. Runs against the configured database; a session for
+``--username`` is created there.
+
+    python -m benchmarks.concurrency --clients 32 --requests 2000 --slow-clients 4
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .env import BACKEND_DIR, setup_django
+
+STACKS = {
+    'sync': (['core.wsgi:application', '-k', 'sync'], '0'),
+    'asgi': (['core.asgi:application', '-k', 'uvicorn_worker.UvicornWorker'], '0'),
+    'async': (['core.asgi:application', '-k', 'uvicorn_worker.UvicornWorker'], '1'),
+}
+
+
+def session_cookie(username):
+    setup_django()
+    from django.conf import settings
+    from django.test import Client
+
+    from core.models import User
+
+    user, _ = User.objects.get_or_create(username=username)
+    client = Client()
+    client.force_login(user)
+    return f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+
+def start_server(stack, port, workers):
+    app, async_views = STACKS[stack]
+    env = dict(os.environ, ASYNC_READ_VIEWS=async_views)
+    process = subprocess.Popen(
+        ['gunicorn', *app, '-w', str(workers), '-b', f'127.0.0.1:{port}', '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{stack} server did not start')
+
+
+def slow_client(port, path, stop):
+    """Sends one header line per second until ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            sock = socket.create_connection(('127.0.0.1', port), timeout=5)
+            sock.sendall(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'.encode())
+            while not stop.wait(1):
+                sock.sendall(b'X-Slow: 1\r\n')
+            sock.close()
+        except OSError:
+            stop.wait(0.1)
+
+
+def run_clients(port, paths, cookie, clients, requests):
+    latencies, errors = [], 0
+    lock = threading.Lock()
+    per_client = max(requests // clients, 1)
+
+    def worker(index):
+        nonlocal errors
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        for i in range(per_client):
+            path = paths[(index + i) % len(paths)]
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers={'Cookie': cookie, 'Host': '127.0.0.1'})
+                response = connection.getresponse()
+                response.read()
+                ok = response.status < 400
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                errors += not ok
+        connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(worker, range(clients)))
+    wall = time.perf_counter() - started
+    return latencies, errors, wall
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--paths', nargs='+', default=['/api/projects/', '/api/tasks/', '/api/users/'])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--slow-clients', type=int, default=0)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--username', default='benchmark')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+    args = parser.parse_args(argv)
+
+    cookie = session_cookie(args.username)
+    results = {}
+    for offset, stack in enumerate(STACKS):
+        port = args.port + offset
+        server = start_server(stack, port, args.workers)
+        stop = threading.Event()
+        slow = [
+            threading.Thread(target=slow_client, args=(port, args.paths[0], stop), daemon=True)
+            for _ in range(args.slow_clients)
+        ]
+        try:
+            run_clients(port, args.paths, cookie, min(args.clients, 4), 50)  # warm up
+            for thread in slow:
+                thread.start()
+            time.sleep(0.5 if slow else 0)
+            latencies, errors, wall = run_clients(port, args.paths, cookie, args.clients, args.requests)
+        finally:
+            stop.set()
+            server.terminate()
+            server.wait(10)
+        results[stack] = {
+            'requests': len(latencies),
+            'errors': errors,
+            'rps': round(len(latencies) / wall, 1),
+            'p50_ms': round(statistics.median(latencies) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f'{"stack":<6} {"requests":>8} {"errors":>6} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+    for stack, row in results.items():
+        print(
+            f'{stack:<6} {row["requests"]:>8} {row["errors"]:>6} {row["rps"]:>8} '
+            f'{row["p50_ms"]:>8} {row["p95_ms"]:>8} {row["p99_ms"]:>8}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+What the runner requests for every URL name. ``SKIPPED`` lists the URL
+names that are deliberately not benchmarked; anything else missing from
+``ENDPOINTS`` fails the run, so new URLs must be added here.
+"""
+import json
+from io import BytesIO
+from uuid import uuid4
+
+SKIPPED = {
+    'admin': 'Django admin',
+    'react_app': 'SPA template',
+    '': 'SPA template',
+    'project-events': 'SSE stream never ends; covered by events tests',
+}
+# Префікс для користувачів і проєктів, які створює сам бенчмарк
+SCRATCH_PREFIX = 'bench-run-'
+
+
+class Context:
+    """
+    Sample objects from the benchmark database, looked up once. Writes go to
+    a scratch project so repeated runs read the same data; ``close`` removes
+    it along with the users and projects the run created.
+    """
+
+    def __init__(self):
+        from comment.models import Comment
+        from project.models import Project
+        from task.models import Task
+
+        self.project = (
+            Project.objects.filter(tasks__isnull=False).select_related('created_by').order_by('id').first()
+        )
+        self.user = self.project.created_by
+        self.task = Task.objects.filter(project=self.project).order_by('id').first()
+        self.comment_project = Comment.objects.order_by('id').values_list('project_id', flat=True).first()
+        from project.transfer import export_project
+
+        self.scratch = Project.objects.create(title=self.unique(), description='', created_by=self.user)
+        self.scratch_task = Task.objects.create(description='Benchmark', project=self.scratch, created_by=self.user)
+        # Imported copies keep the title, so close() removes them too
+        self.scratch_export = b''.join(export_project(self.scratch.pk))
+
+    def unique(self):
+        return f'{SCRATCH_PREFIX}{uuid4().hex[:12]}'
+
+    def close(self):
+        from core.models import User
+        from project.models import Project
+
+        self.scratch.delete()
+        Project.objects.filter(title__startswith=SCRATCH_PREFIX).delete()
+        User.objects.filter(username__startswith=SCRATCH_PREFIX).delete()
+
+
+def _png():
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new('RGB', (512, 512), 'teal').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _new_task(ctx):
+    from task.models import Task
+
+    return Task.objects.create(description='Benchmark', project=ctx.scratch, created_by=ctx.user)
+
+
+def _new_project(ctx):
+    from project.models import Project
+
+    return Project.objects.create(title='Benchmark', description='', created_by=ctx.user)
+
+
+def _new_user(ctx):
+    from core.models import User
+
+    return User.objects.create_user(username=ctx.unique())
+
+
+def _new_comment(ctx):
+    from comment.models import Comment
+
+    return Comment.objects.create(project=ctx.scratch, author=ctx.user, text='Delete me')
+
+
+def _new_member(ctx):
+    from project.models import ProjectMember
+
+    return ProjectMember.objects.create(project=ctx.scratch, user=_new_user(ctx), role='MEMBER')
+
+
+def _cold_dashboard(ctx):
+    from django.core.cache import cache
+    from task.dashboard import CACHE_KEY
+
+    # Measures the fill, not the cache hit.
+    cache.delete(CACHE_KEY.format(ctx.user.pk))
+
+
+def _new_upload(ctx, written=False):
+    from core.models import UploadSession
+    from core.uploads import write_chunk
+
+    upload = UploadSession.objects.create(
+        task=ctx.scratch_task, uploaded_by=ctx.user, filename='notes.txt', size=4
+    )
+    if written:
+        write_chunk(upload, 0, BytesIO(b'data'), 4)
+    return upload
+
+
+class Endpoint:
+    def __init__(self, name, method='get', args=None, data=None, prepare=None,
+                 content_type='application/json', query=None, headers=None, login=True, relogin=False):
+        self.name = name
+        self.method = method
+        self.args = args or (lambda ctx, state: [])
+        self.data = data
+        self.prepare = prepare
+        self.content_type = content_type
+        self.query = query or {}
+        self.headers = headers or {}
+        self.login = login
+        # Logout ends the session, so log back in before every iteration.
+        self.relogin = relogin
+        self.label = name + (f"?{'&'.join(f'{k}={v}' for k, v in self.query.items())}" if self.query else '')
+
+    def request(self, client, ctx, state):
+        from django.urls import reverse
+
+        url = reverse(self.name, args=self.args(ctx, state))
+        if self.method == 'get':
+            return client.get(url, self.query, headers=self.headers)
+        data = self.data(ctx, state) if self.data else {}
+        if self.content_type == 'multipart':
+            return getattr(client, self.method)(url, data, headers=self.headers)
+        if self.content_type == 'application/json':
+            data = json.dumps(data)
+        return getattr(client, self.method)(
+            url, data, content_type=self.content_type, headers=self.headers
+        )
+
+
+ENDPOINTS = [
+    Endpoint('csrf_token', login=False),
+    Endpoint('auth_register', 'post', login=False, data=lambda ctx, state: {
+        'username': state, 'email': f'{state}@example.com',
+        'password': 'benchmark-pass', 'password2': 'benchmark-pass',
+    }, prepare=lambda ctx: ctx.unique()),
+    Endpoint('auth_login', 'post', login=False, data=lambda ctx, state: {
+        'email': ctx.user.email, 'password': 'benchmark',
+    }),
+    Endpoint('auth_logout', 'post', relogin=True),
+    Endpoint('auth_user'),
+    Endpoint('current_user'),
+    Endpoint('dashboard', prepare=_cold_dashboard),
+    Endpoint('avatar-upload', 'post', content_type='multipart', data=lambda ctx, state: {
+        'avatar': _upload_file(),
+    }),
+    Endpoint('users'),
+    Endpoint('users', query={'q': 'bench1'}),
+    Endpoint('search', query={'q': 'review'}),
+    Endpoint('sync'),
+    Endpoint('upload-start', 'post', data=lambda ctx, state: {
+        'task': ctx.scratch_task.pk, 'filename': 'notes.txt', 'size': 4,
+    }),
+    Endpoint('upload-detail', 'put', content_type='application/octet-stream',
+             args=lambda ctx, state: [state.pk], data=lambda ctx, state: b'data',
+             headers={'Content-Range': 'bytes 0-3/4'}, prepare=_new_upload),
+    Endpoint('upload-complete', 'post', args=lambda ctx, state: [state.pk],
+             prepare=lambda ctx: _new_upload(ctx, written=True)),
+    Endpoint('comment-list', args=lambda ctx, state: [ctx.comment_project]),
+    Endpoint('comment-add', 'post', args=lambda ctx, state: [ctx.scratch.pk],
+             data=lambda ctx, state: {'text': 'Benchmark comment'}),
+    Endpoint('comment-delete', 'delete', args=lambda ctx, state: [state.pk], prepare=_new_comment),
+    Endpoint('project-list'),
+    Endpoint('project-list', query={'fields': 'id,title'}),
+    Endpoint('project-list', query={'expand': 'comments'}),
+    Endpoint('project-list', query={'expand': 'comments', 'comments': '10'}),
+    Endpoint('project-add', 'post', data=lambda ctx, state: {'title': ctx.unique(), 'description': ''}),
+    Endpoint('project', args=lambda ctx, state: [ctx.project.pk]),
+    Endpoint('project-edit', 'put', args=lambda ctx, state: [ctx.scratch.pk],
+             data=lambda ctx, state: {'title': ctx.scratch.title}),
+    Endpoint('project-delete', 'delete', args=lambda ctx, state: [state.pk], prepare=_new_project),
+    Endpoint('project-export', args=lambda ctx, state: [ctx.project.pk]),
+    Endpoint('project-export', args=lambda ctx, state: [ctx.project.pk], query={'compress': 'gzip'}),
+    Endpoint('project-import', 'post', content_type='application/x-ndjson',
+             data=lambda ctx, state: ctx.scratch_export),
+    Endpoint('comments-list', args=lambda ctx, state: [ctx.comment_project]),
+    Endpoint('members-list', args=lambda ctx, state: [ctx.project.pk]),
+    Endpoint('members-add', 'post', args=lambda ctx, state: [ctx.scratch.pk],
+             data=lambda ctx, state: {'user': state.pk, 'role': 'MEMBER'}, prepare=_new_user),
+    Endpoint('members-remove', 'delete', args=lambda ctx, state: [ctx.scratch.pk, state.pk], prepare=_new_member),
+    Endpoint('board-summary', args=lambda ctx, state: [ctx.project.pk]),
+    Endpoint('analytics-time-in-status', args=lambda ctx, state: [ctx.project.pk]),
+    Endpoint('analytics-cycle-time', args=lambda ctx, state: [ctx.project.pk]),
+    Endpoint('analytics-throughput', args=lambda ctx, state: [ctx.project.pk]),
+    Endpoint('analytics-flow', args=lambda ctx, state: [ctx.project.pk]),
+    Endpoint('task-list'),
+    Endpoint('task-list-by-project', args=lambda ctx, state: [ctx.project.pk]),
+    Endpoint('task-list-by-project', args=lambda ctx, state: [ctx.project.pk], query={'stream': '1'}),
+    Endpoint('task-list-by-project', args=lambda ctx, state: [ctx.project.pk],
+             query={'expand': 'assignee,media_files'}),
+    Endpoint('task', args=lambda ctx, state: [ctx.task.pk]),
+    Endpoint('task-add', 'post', data=lambda ctx, state: {
+        'description': 'Benchmark', 'project': ctx.scratch.pk,
+    }),
+    Endpoint('task-edit', 'put', args=lambda ctx, state: [ctx.scratch_task.pk],
+             data=lambda ctx, state: {'status': 'IN_PROGRESS'}),
+    Endpoint('task-delete', 'delete', args=lambda ctx, state: [state.pk], prepare=_new_task),
+    Endpoint('task-bulk', 'post', data=lambda ctx, state: [
+        {'op': 'move', 'id': task.pk, 'status': 'DONE'} for task in state
+    ], prepare=lambda ctx: [_new_task(ctx) for _ in range(10)]),
+]
+
+
+def _upload_file():
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    global _PNG
+    if _PNG is None:
+        _PNG = _png()
+    return SimpleUploadedFile('avatar.png', _PNG, content_type='image/png')
+
+
+_PNG = None
@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SQLITE_PATH = os.path.join(tempfile.gettempdir(), 'stuck-benchmark.sqlite3')
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(keepdb=True, sqlite_path=None, verbosity=1):
+    """
+    Runs the block against a separate database created the way the test
+    runner does it (``test_<name>``, or a file for SQLite), never the dev
+    one. With ``keepdb`` the generated data survives between runs.
+    """
+    setup_django()
+    from django.db import connections
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    connection = connections['default']
+    if connection.vendor == 'sqlite':
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = (
+            sqlite_path or os.environ.get('BENCHMARK_SQLITE_PATH') or DEFAULT_SQLITE_PATH
+        )
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(
+        verbosity=verbosity, autoclobber=True, keepdb=keepdb
+    )
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity, keepdb=keepdb)
+        teardown_test_environment()
@@ -0,0 +1,189 @@
+"""
+Synthetic dataset for benchmarks, inserted with ``bulk_create``.
+
+``--scale 1`` builds 10k users, 50k projects (about 3 members each), 1M tasks
+with their status history (about 2.5M transitions) and 2M comments; smaller
+scales shrink every table proportionally. Task counters and the search index
+are rebuilt afterwards because bulk inserts do not send signals.
+
+    python -m benchmarks.generate --scale 0.01
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import timedelta
+from itertools import islice
+
+from .env import benchmark_database
+
+SIZES = {'users': 10_000, 'projects': 50_000, 'tasks': 1_000_000, 'comments': 2_000_000}
+MEMBERS_PER_PROJECT = 3
+PASSWORD = 'benchmark'
+
+FIRST_NAMES = ['Іван', 'Олена', 'Софія', 'Андрій', 'Марія', 'Taras', 'Anna', 'Oleh', 'Daria', 'Max']
+LAST_NAMES = ['Шевченко', 'Коваленко', 'Бондар', 'Ткаченко', 'Kravets', 'Melnyk', 'Boyko', 'Lysenko']
+WORDS = (
+    'invoice release review design backend frontend deploy migrate cache index '
+    'report budget client meeting sprint bug feature refactor test docs search '
+    'upload avatar board summary export import sync dashboard analytics'
+).split()
+
+
+def sizes(scale):
+    return {name: max(int(size * scale), 1) for name, size in SIZES.items()}
+
+
+def _sentence(rng, words=8):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, words))).capitalize()
+
+
+def insert(model, objects, batch_size, keep_ids=False):
+    """``bulk_create`` in batches; returns the new ids when ``keep_ids``."""
+    ids = []
+    objects = iter(objects)
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return ids
+        created = model.objects.bulk_create(batch, batch_size=batch_size)
+        if keep_ids:
+            ids.extend(obj.pk for obj in created)
+
+
+def generate(scale=1.0, seed=1, batch_size=5000, stdout=sys.stdout):
+    from django.contrib.auth.hashers import make_password
+    from django.db import transaction
+    from django.utils import timezone
+
+    from comment.models import Comment
+    from core.models import User
+    from project.models import Project, ProjectMember
+    from search.index import rebuild as rebuild_search
+    from task import counters
+    from task.models import Task, TaskStatusChange
+
+    rng = random.Random(seed)
+    counts = sizes(scale)
+    now = timezone.now()
+    statuses = [status for status, _ in Task.STATUS_CHOICES]
+
+    def step(label, started):
+        stdout.write(f'{label}: {time.perf_counter() - started:.1f}s\n')
+        stdout.flush()
+
+    started = time.perf_counter()
+    # One hash for everyone: PBKDF2 per user would dominate the run.
+    password = make_password(PASSWORD)
+    with transaction.atomic():
+        user_ids = insert(User, (
+            User(
+                username=f'bench{i}',
+                email=f'bench{i}@example.com',
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                password=password,
+                date_joined=now - timedelta(minutes=i),
+            )
+            for i in range(counts['users'])
+        ), batch_size, keep_ids=True)
+    step(f"{counts['users']} users", started)
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        project_ids = insert(Project, (
+            Project(
+                title=_sentence(rng, 4),
+                description=_sentence(rng, 20),
+                created_by_id=rng.choice(user_ids),
+            )
+            for _ in range(counts['projects'])
+        ), batch_size, keep_ids=True)
+        members = {}
+
+        def memberships():
+            for project_id in project_ids:
+                chosen = rng.sample(user_ids, min(MEMBERS_PER_PROJECT, len(user_ids)))
+                members[project_id] = chosen
+                for user_id in chosen:
+                    yield ProjectMember(
+                        project_id=project_id,
+                        user_id=user_id,
+                        role=rng.choice(ProjectMember.ROLE_CHOICES)[0],
+                    )
+        insert(ProjectMember, memberships(), batch_size)
+    step(f"{counts['projects']} projects", started)
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        task_states = []
+
+        def tasks():
+            for _ in range(counts['tasks']):
+                project_id = rng.choice(project_ids)
+                status = rng.choice(statuses)
+                task_states.append((project_id, status))
+                yield Task(
+                    description=_sentence(rng, 16),
+                    project_id=project_id,
+                    status=status,
+                    assigned_to_id=rng.choice(members[project_id] + [None]),
+                    created_by_id=rng.choice(members[project_id]),
+                    due_date=now + timedelta(days=rng.randint(-60, 60)) if rng.random() < 0.7 else None,
+                )
+        task_ids = insert(Task, tasks(), batch_size, keep_ids=True)
+
+        def history():
+            # Every task walks the board from TODO to its status over the last 90 days.
+            for task_id, (project_id, status) in zip(task_ids, task_states):
+                changed_at = now - timedelta(hours=rng.randint(24 * 14, 24 * 90))
+                previous, entered_at = '', None
+                for next_status in statuses[:statuses.index(status) + 1]:
+                    yield TaskStatusChange(
+                        task_id=task_id, project_id=project_id, from_status=previous,
+                        to_status=next_status, entered_at=entered_at, changed_at=changed_at,
+                    )
+                    previous, entered_at = next_status, changed_at
+                    changed_at += timedelta(hours=rng.randint(1, 24 * 4))
+        insert(TaskStatusChange, history(), batch_size)
+    step(f"{counts['tasks']} tasks", started)
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        def comments():
+            for _ in range(counts['comments']):
+                project_id = rng.choice(project_ids)
+                yield Comment(
+                    project_id=project_id,
+                    author_id=rng.choice(members[project_id]),
+                    text=_sentence(rng, 24),
+                )
+        insert(Comment, comments(), batch_size)
+    step(f"{counts['comments']} comments", started)
+
+    started = time.perf_counter()
+    counters.rebuild()
+    rebuild_search()
+    step('counters and search index', started)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--sqlite-path', help='Benchmark database file (SQLite only).')
+    args = parser.parse_args(argv)
+
+    with benchmark_database(keepdb=True, sqlite_path=args.sqlite_path):
+        from core.models import User
+
+        if User.objects.exists():
+            print('The benchmark database already has data; delete it to regenerate.')
+            return
+        generate(args.scale, args.seed, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
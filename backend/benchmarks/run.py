@@ -0,0 +1,201 @@
+"""
+Endpoint benchmark: requests every API URL against the synthetic dataset
+and reports p50/p95/p99 latency, queries per request and peak memory.
+
+The run fails when an endpoint goes over its budget in ``budgets.json``,
+returns an error, or when a URL has no entry in ``endpoints.ENDPOINTS``.
+Results can be saved as JSON and compared with an earlier run.
+
+    python -m benchmarks.run --scale 0.01 --iterations 50 --output before.json
+    python -m benchmarks.run --compare before.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from .concurrency import percentile
+from .env import BACKEND_DIR, benchmark_database
+
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'budgets.json')
+
+
+def url_names(patterns=None):
+    """Names of every URL pattern; unnamed ones come back as ``''``."""
+    from django.urls import URLResolver, get_resolver
+
+    names = set()
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace:
+                names.add(pattern.namespace)
+            else:
+                names |= url_names(pattern.url_patterns)
+        else:
+            names.add(pattern.name or '')
+    return names
+
+
+def consume(response):
+    if not response.streaming:
+        return response.content
+    from asgiref.sync import async_to_sync
+
+    if response.is_async:
+        async def collect():
+            return b''.join([chunk async for chunk in response.streaming_content])
+        return async_to_sync(collect)()
+    return b''.join(response.streaming_content)
+
+
+def measure(endpoint, ctx, iterations):
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+    if endpoint.login:
+        client.force_login(ctx.user)
+
+    def call():
+        if endpoint.relogin:
+            client.force_login(ctx.user)
+        state = endpoint.prepare(ctx) if endpoint.prepare else None
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = endpoint.request(client, ctx, state)
+            consume(response)
+            elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            raise AssertionError(f'{endpoint.label}: HTTP {response.status_code} {response.content[:200]!r}')
+        return elapsed, len(queries)
+
+    # Перший запит прогріває кеші і не рахується
+    call()
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies, query_counts = [], []
+    for _ in range(iterations):
+        elapsed, queries = call()
+        latencies.append(elapsed * 1000)
+        query_counts.append(queries)
+    return {
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'queries': max(query_counts),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def check_budgets(results, budgets):
+    failures = []
+    for label, result in results.items():
+        budget = budgets.get(label)
+        if budget is None:
+            failures.append(f'{label}: no budget')
+            continue
+        for key in ('queries', 'p95_ms'):
+            if key in budget and result[key] > budget[key]:
+                failures.append(f'{label}: {key} {result[key]} > {budget[key]}')
+    return failures
+
+
+def commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results, previous=None):
+    print(f"{'endpoint':40} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8} {'peak KB':>9}")
+    for label, result in results.items():
+        line = (
+            f"{label:40} {result['p50_ms']:8.1f} {result['p95_ms']:8.1f} {result['p99_ms']:8.1f} "
+            f"{result['queries']:8} {result['peak_kb']:9.1f}"
+        )
+        before = (previous or {}).get(label)
+        if before:
+            line += (
+                f"   p95 {result['p95_ms'] - before['p95_ms']:+.1f} ms,"
+                f" queries {result['queries'] - before['queries']:+d}"
+            )
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scale', type=float, default=0.01,
+                        help='Dataset size when the benchmark database is empty (1.0 = full size).')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--only', nargs='+', help='Run only these endpoint labels.')
+    parser.add_argument('--budgets', default=BUDGETS_PATH)
+    parser.add_argument('--output', help='Save results as JSON.')
+    parser.add_argument('--compare', help='Earlier JSON results to compare with.')
+    parser.add_argument('--sqlite-path', help='Benchmark database file (SQLite only).')
+    args = parser.parse_args(argv)
+
+    with benchmark_database(keepdb=True, sqlite_path=args.sqlite_path), \
+            tempfile.TemporaryDirectory() as media_root:
+        from django.test.utils import override_settings
+
+        from core.models import User
+
+        from .endpoints import ENDPOINTS, SKIPPED, Context
+        from .generate import generate
+
+        missing = url_names() - {endpoint.name for endpoint in ENDPOINTS} - set(SKIPPED)
+        if missing:
+            sys.exit(f'URLs without a benchmark: {", ".join(sorted(missing))}')
+        if not User.objects.exists():
+            generate(args.scale)
+
+        endpoints = [e for e in ENDPOINTS if not args.only or e.label in args.only]
+        results = {}
+        with override_settings(
+            MEDIA_ROOT=media_root, UPLOAD_TEMP_DIR=os.path.join(media_root, 'uploads'),
+            ALLOWED_HOSTS=['testserver'],
+        ):
+            ctx = Context()
+            try:
+                for endpoint in endpoints:
+                    results[endpoint.label] = measure(endpoint, ctx, args.iterations)
+            finally:
+                ctx.close()
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)['results']
+    print_table(results, previous)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'commit': commit(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'iterations': args.iterations,
+                'results': results,
+            }, f, indent=2)
+
+    with open(args.budgets) as f:
+        failures = check_budgets(results, json.load(f))
+    if failures:
+        print('\nOver budget:\n  ' + '\n  '.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
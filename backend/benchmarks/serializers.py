@@ -0,0 +1,107 @@
+"""
+ModelSerializer vs ValuesSerializer on the list endpoints' serializers:
+rows per second for fetching, serializing and rendering ``--rows`` rows.
+
+    python -m benchmarks.serializers --rows 1000 --repeat 5
+"""
+import argparse
+import json
+import time
+
+from .env import benchmark_database
+
+
+def cases():
+    from core.models import User
+    from core.serializers import UserListSerializer, UserListValuesSerializer
+    from project.models import ProjectMember
+    from project.serializers import ProjectMemberSerializer, ProjectMemberValuesSerializer
+    from task.models import Task
+    from task.serializers import TaskSerializer, TaskValuesSerializer
+
+    return {
+        'tasks': (Task.objects.order_by('id'), TaskSerializer, TaskValuesSerializer),
+        'users': (User.objects.order_by('id'), UserListSerializer, UserListValuesSerializer),
+        'members': (
+            ProjectMember.objects.select_related('user').order_by('id'),
+            ProjectMemberSerializer, ProjectMemberValuesSerializer,
+        ),
+    }
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def measure(queryset, serializer_class, values_class, rows, repeat, context):
+    from rest_framework.renderers import JSONRenderer
+
+    renderer = JSONRenderer()
+    queryset = queryset[:rows]
+    count = queryset.count()
+
+    def model():
+        return renderer.render(serializer_class(list(queryset.all()), many=True, context=context).data)
+
+    def values():
+        page = list(values_class.values(queryset))
+        return renderer.render(values_class(page, many=True, context=context).data)
+
+    assert model() == values(), f'{serializer_class.__name__} output differs'
+    objects, dicts = list(queryset), list(values_class.values(queryset))
+    result = {
+        'rows': count,
+        'model_rows_per_s': count / best_of(repeat, model),
+        'values_rows_per_s': count / best_of(repeat, values),
+        'model_serialize_rows_per_s': count / best_of(
+            repeat, lambda: serializer_class(objects, many=True, context=context).data),
+        'values_serialize_rows_per_s': count / best_of(
+            repeat, lambda: values_class(dicts, many=True, context=context).data),
+    }
+    result['speedup'] = result['values_rows_per_s'] / result['model_rows_per_s']
+    result['serialize_speedup'] = result['values_serialize_rows_per_s'] / result['model_serialize_rows_per_s']
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=0.01,
+                        help='Dataset size when the benchmark database is empty.')
+    parser.add_argument('--sqlite-path', help='Benchmark database file (SQLite only).')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+    args = parser.parse_args(argv)
+
+    with benchmark_database(keepdb=True, sqlite_path=args.sqlite_path, verbosity=0):
+        from rest_framework.test import APIRequestFactory
+
+        from core.models import User
+        from .generate import generate
+
+        if not User.objects.exists():
+            generate(args.scale)
+        context = {'request': APIRequestFactory().get('/api/')}
+        results = {
+            name: measure(*case, args.rows, args.repeat, context)
+            for name, case in cases().items()
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'list':10} {'rows':>6} {'model rows/s':>14} {'values rows/s':>14} {'speedup':>8} {'serialize only':>15}")
+    for name, result in results.items():
+        print(
+            f"{name:10} {result['rows']:6} {result['model_rows_per_s']:14.0f} "
+            f"{result['values_rows_per_s']:14.0f} {result['speedup']:7.1f}x {result['serialize_speedup']:14.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+from django.db import migrations, models
+
+
+def _columns(schema_editor, table):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        return {column.name for column in connection.introspection.get_table_description(cursor, table)}
+
+
+def _drop_column(schema_editor, table, column):
+    # Not in the migration state, so no RemoveField: plain SQL, indexes first
+    # (SQLite refuses to drop an indexed column).
+    connection = schema_editor.connection
+    quote = schema_editor.quote_name
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    for name, info in constraints.items():
+        if info['index'] and info['columns'] == [column] and not (info['primary_key'] or info['unique']):
+            schema_editor.execute(f'DROP INDEX {quote(name)}')
+    schema_editor.execute(f'ALTER TABLE {quote(table)} DROP COLUMN {quote(column)}')
+
+
+def move_comments_to_projects(apps, schema_editor):
+    """
+    Databases created before the migrations were checked in have comments
+    on tasks (``comment_comment.task_id``) and a ``comment_id`` on media
+    files; their 0001/0002 records stand for that older schema. Moves every
+    comment to its task's project and drops both columns. Does nothing on
+    databases built by 0001/0002.
+    """
+    Comment = apps.get_model('comment', 'Comment')
+    Task = apps.get_model('task', 'Task')
+    MediaFile = apps.get_model('core', 'MediaFile')
+    table = Comment._meta.db_table
+    columns = _columns(schema_editor, table)
+    if 'task_id' not in columns:
+        return
+
+    project = Comment._meta.get_field('project')
+    nullable = models.ForeignKey(apps.get_model('project', 'Project'), models.CASCADE, null=True, related_name='+')
+    nullable.set_attributes_from_name('project')
+    nullable.model = Comment
+    if 'project_id' not in columns:
+        schema_editor.add_field(Comment, nullable)
+    quote = schema_editor.quote_name
+    comments, tasks = quote(table), quote(Task._meta.db_table)
+    schema_editor.execute(
+        f'UPDATE {comments} SET project_id = '
+        f'(SELECT project_id FROM {tasks} WHERE {tasks}.id = {comments}.task_id)'
+    )
+    schema_editor.execute(f'DELETE FROM {comments} WHERE project_id IS NULL')
+    _drop_column(schema_editor, table, 'task_id')
+    schema_editor.alter_field(Comment, nullable, project)
+
+    if 'comment_id' in _columns(schema_editor, MediaFile._meta.db_table):
+        _drop_column(schema_editor, MediaFile._meta.db_table, 'comment_id')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comment', '0002_initial'),
+        ('core', '0002_initial'),
+        ('project', '0001_initial'),
+        ('task', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_comments_to_projects, migrations.RunPython.noop),
+    ]
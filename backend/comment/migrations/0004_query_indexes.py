@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comment', '0003_comment_project'),
+        ('project', '0002_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['project', '-created_at', '-id'], name='comment_project_created_idx'),
+        ),
+    ]
@@ -18,6 +18,9 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', '-created_at', '-id'], name='comment_project_created_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.username} on {self.project.title}"
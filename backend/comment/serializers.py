@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Comment
-from core.serializers import UserSerializer  # Предполагается, что UserSerializer в core
+from core.fast_serializers import ValuesSerializer
+from core.serializers import UserSerializer, UserValuesSerializer  # Предполагается, что UserSerializer в core
 
 class CommentSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
@@ -23,4 +24,16 @@ class CommentSerializer(serializers.ModelSerializer):
     def validate_text(self, value):
         if not value or not value.strip():
             raise serializers.ValidationError("Comment text cannot be empty")
-        return value
\ No newline at end of file
+        return value
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """``CommentSerializer`` over ``values()`` rows."""
+    fields = (
+        ('id', 'id'),
+        ('project', 'project_id'),
+        ('author', UserValuesSerializer.prefixed('author__')),
+        ('text', 'text'),
+        ('created_at', 'created_at', 'datetime'),
+        ('updated_at', 'updated_at', 'datetime'),
+    )
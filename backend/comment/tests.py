@@ -1,3 +1,27 @@
 from django.test import TestCase
 
-# Create your tests here.
+from core.models import User
+from core.testing import QueryPlanMixin
+from project.models import Project
+from .models import Comment
+
+
+class CommentIndexTests(QueryPlanMixin, TestCase):
+    def test_latest_comments_use_project_created_index(self):
+        user = User.objects.create_user(username='author')
+        project = Project.objects.create(title='Board', description='', created_by=user)
+        self.assertUsesIndex(
+            Comment.objects.filter(project=project).order_by('-created_at', '-id'),
+            'comment_project_created_idx',
+        )
+
+    def test_latest_per_project_ranks_on_project_created_index(self):
+        from project.serializers import ProjectValuesSerializer
+
+        user = User.objects.create_user(username='author')
+        projects = [Project.objects.create(title=f'P{i}', description='', created_by=user) for i in range(2)]
+        expansion = ProjectValuesSerializer.expansions['comments']
+        plan = self.explain(expansion.related_queryset([project.pk for project in projects], {}))
+        # Ranking reads the index; only the kept rows are sorted afterwards.
+        self.assertIn('comment_project_created_idx', plan)
+        self.assertNotIn('SCAN comment_comment', plan)
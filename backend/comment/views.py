@@ -4,14 +4,16 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from .models import Comment
-from task.models import Task
+from project.models import Project
+from core.pagination import KeysetPagination
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def comment_list(request, task_id):
-    comments = Comment.objects.filter(task_id=task_id)
+def comment_list(request, project_id):
+    comments = Comment.objects.filter(project_id=project_id).select_related('author')
+    paginator = KeysetPagination(ordering=('-created_at', '-id'))
     result = []
-    for comment in comments:
+    for comment in paginator.paginate_queryset(comments, request):
         result.append({
             'id': comment.id,
             'author_id': comment.author.id,
@@ -20,19 +22,19 @@ def comment_list(request, task_id):
             'created_at': comment.created_at,
             'updated_at': comment.updated_at,
         })
-    return Response(result)
+    return paginator.get_paginated_response(result)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def comment_add(request, task_id):
+def comment_add(request, project_id):
     try:
-        task = Task.objects.get(pk=task_id)
-    except Task.DoesNotExist:
-        return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
+        project = Project.objects.get(pk=project_id)
+    except Project.DoesNotExist:
+        return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
 
     data = request.data
     comment = Comment.objects.create(
-        task=task,
+        project=project,
         author=request.user,
         text=data.get('text', '')
     )
@@ -43,7 +45,7 @@ def comment_add(request, task_id):
 def comment_delete(request, pk):
     try:
         comment = Comment.objects.get(pk=pk)
-        if comment.author != request.user:
+        if comment.author_id != request.user.pk:
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         comment.delete()
         return Response({'success': True})
@@ -0,0 +1,58 @@
+"""
+``@api_view`` for async read-only views.
+
+DRF views are sync only. ``async_api_view`` builds the same ``APIView`` that
+``@api_view`` would and runs its ``initial()`` (content negotiation,
+authentication, permissions, throttles) off the event loop, then awaits the
+view. Errors go through ``handle_exception``, so ``EXCEPTION_HANDLER`` and
+``WWW-Authenticate`` apply, and the response is finalized with the negotiated
+renderer: bodies, headers and ``response.data`` match the sync views.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import exceptions
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def read_view(sync_view, async_view):
+    """The view to route, picked by ``ASYNC_READ_VIEWS``."""
+    return async_view if getattr(settings, 'ASYNC_READ_VIEWS', False) else sync_view
+
+
+def async_api_view(permission_classes=(IsAuthenticated,), renderer_classes=None):
+    def decorator(view):
+        view_class = type(view.__name__, (APIView,), {
+            'permission_classes': permission_classes,
+            'renderer_classes': renderer_classes or api_settings.DEFAULT_RENDERER_CLASSES,
+            # Only for Allow and the browsable API; the view itself is awaited below.
+            'get': view,
+            'head': view,
+            '__doc__': view.__doc__,
+        })
+
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            drf_view = view_class()
+            drf_view.args, drf_view.kwargs = args, kwargs
+            drf_request = drf_view.initialize_request(request, *args, **kwargs)
+            drf_view.request = drf_request
+            drf_view.headers = drf_view.default_response_headers
+            try:
+                if request.method not in SAFE_METHODS:
+                    raise exceptions.MethodNotAllowed(request.method)
+                await sync_to_async(drf_view.initial)(drf_request, *args, **kwargs)
+                response = await view(drf_request, *args, **kwargs)
+            except Exception as exc:
+                response = drf_view.handle_exception(exc)
+            # Rendered by Django's handler, in a thread like other deferred responses.
+            return drf_view.finalize_response(drf_request, response, *args, **kwargs)
+
+        inner.csrf_exempt = True
+        return inner
+    return decorator
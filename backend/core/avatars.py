@@ -0,0 +1,159 @@
+"""
+Avatar storage and thumbnails.
+
+Originals are stored under their SHA-256 (``avatars/ab/abcd….png``), so the
+same upload is written once however many users pick it. Thumbnails for every
+size in ``AVATAR_SIZES`` are rendered as WebP and PNG in a thread pool after
+the upload commits and live under ``avatars/thumbs/<digest>/``. Until they
+exist ``User.avatar_thumbs`` is empty and the original is served instead.
+"""
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+FORMATS = (('webp', 'WEBP'), ('png', 'PNG'))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def avatar_sizes():
+    return getattr(settings, 'AVATAR_SIZES', (32, 64, 256))
+
+
+def file_digest(file):
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def original_name(digest, filename):
+    ext = os.path.splitext(filename)[1].lower() or '.png'
+    return f'avatars/{digest[:2]}/{digest}{ext}'
+
+
+def thumbnail_name(digest, size, ext):
+    return f'avatars/thumbs/{digest[:2]}/{digest}/{size}.{ext}'
+
+
+def thumbnail_urls(digest):
+    """``{size: {format: url}}`` for a digest whose thumbnails exist."""
+    return {
+        size: {ext: default_storage.url(thumbnail_name(digest, size, ext)) for ext, _ in FORMATS}
+        for size in avatar_sizes()
+    }
+
+
+def thumbnails_exist(digest):
+    return all(
+        default_storage.exists(thumbnail_name(digest, size, ext))
+        for size in avatar_sizes() for ext, _ in FORMATS
+    )
+
+
+def render_thumbnails(digest, file):
+    """Writes the missing thumbnails of ``file`` for ``digest``."""
+    with Image.open(file) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA')
+        for size in avatar_sizes():
+            thumb = ImageOps.fit(image, (size, size), Image.LANCZOS)
+            for ext, fmt in FORMATS:
+                name = thumbnail_name(digest, size, ext)
+                if default_storage.exists(name):
+                    continue
+                buffer = BytesIO()
+                thumb.save(buffer, fmt, optimize=True)
+                default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def process_avatar(user_id, digest, name):
+    """Renders thumbnails and marks them ready unless the avatar changed meanwhile."""
+    from .models import User
+
+    try:
+        if not thumbnails_exist(digest):
+            with default_storage.open(name) as file:
+                render_thumbnails(digest, file)
+        User.objects.filter(pk=user_id, avatar=name).update(avatar_thumbs=digest)
+    except Exception:
+        logger.exception('Avatar thumbnails failed for user %s', user_id)
+
+
+def _run_in_pool(user_id, digest, name):
+    try:
+        process_avatar(user_id, digest, name)
+    finally:
+        close_old_connections()
+
+
+def _submit(user_id, digest, name):
+    global _executor
+    if not getattr(settings, 'AVATAR_PROCESSING_ASYNC', True):
+        process_avatar(user_id, digest, name)
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'AVATAR_WORKERS', 2),
+                thread_name_prefix='avatars',
+            )
+    _executor.submit(_run_in_pool, user_id, digest, name)
+
+
+def store_avatar(user, upload):
+    """
+    Saves ``upload`` as ``user``'s avatar and schedules its thumbnails once
+    the transaction commits. Returns the stored name.
+    """
+    digest = file_digest(upload)
+    name = original_name(digest, upload.name)
+    if not default_storage.exists(name):
+        name = default_storage.save(name, upload)
+
+    # A plain name: the field must not save the upload a second time.
+    user.avatar = name
+    user.avatar_thumbs = ''
+    user.save(update_fields=['avatar', 'avatar_thumbs'])
+    transaction.on_commit(lambda: _submit(user.pk, digest, name))
+    return name
+
+
+def avatar_urls(user, build_url=None):
+    """
+    Per-size URLs for ``user``'s avatar, falling back to the original for
+    every size while thumbnails are pending. ``None`` without an avatar.
+    """
+    if not user.avatar:
+        return None
+    return stored_avatar_urls(user.avatar.name, user.avatar_thumbs, build_url)
+
+
+def stored_avatar_urls(name, thumbs, build_url=None):
+    """``avatar_urls`` from the stored ``avatar`` and ``avatar_thumbs`` values."""
+    if not name:
+        return None
+    build_url = build_url or (lambda url: url)
+    if thumbs:
+        urls = thumbnail_urls(thumbs)
+    else:
+        original = default_storage.url(name)
+        urls = {size: {ext: original for ext, _ in FORMATS} for size in avatar_sizes()}
+    return {
+        str(size): {ext: build_url(url) for ext, url in formats.items()}
+        for size, formats in urls.items()
+    }
@@ -0,0 +1,11 @@
+"""
+``core.session_backend`` with reads from the cache (``cached_db``). Only for
+a cache shared by all workers: ``settings`` picks it when one is configured.
+"""
+from django.contrib.sessions.backends import cached_db
+
+from .session_backend import RefreshThrottleMixin
+
+
+class SessionStore(RefreshThrottleMixin, cached_db.SessionStore):
+    pass
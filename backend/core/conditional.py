@@ -0,0 +1,66 @@
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
+
+
+def conditional(validators):
+    """
+    Adds ETag / Last-Modified handling to a view.
+
+    ``validators(request, *args, **kwargs)`` must return ``(state, last_modified)``
+    from one cheap query, or ``None`` when the resource does not exist (the view
+    then runs and reports the 404 itself). ``state`` is anything with a stable
+    ``repr``; it is hashed into the ETag together with the query string and
+    ``Accept``, which pick the representation (``?fields=``, JSON or NDJSON),
+    and responses vary on ``Accept``. The result is kept on the request so
+    both validators cost a single lookup. For async views the lookup runs in a
+    thread before the checks.
+    """
+    def resolve(request, *args, **kwargs):
+        if not hasattr(request, '_conditional_state'):
+            request._conditional_state = validators(request, *args, **kwargs)
+        return request._conditional_state
+
+    def etag_func(request, *args, **kwargs):
+        state = resolve(request, *args, **kwargs)
+        if state is None:
+            return None
+        representation = (sorted(request.GET.lists()), request.META.get('HTTP_ACCEPT', ''))
+        return hashlib.md5(repr((state[0], representation)).encode()).hexdigest()
+
+    def last_modified_func(request, *args, **kwargs):
+        state = resolve(request, *args, **kwargs)
+        if state is None:
+            return None
+        return state[1]
+
+    decorator = condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+    def wrap(view):
+        inner = vary_on_headers('Accept')(decorator(view))
+        if not iscoroutinefunction(view):
+            return inner
+
+        @wraps(view)
+        async def prefetch(request, *args, **kwargs):
+            if not hasattr(request, '_conditional_state'):
+                request._conditional_state = await sync_to_async(validators)(
+                    request, *args, **kwargs
+                )
+            return await inner(request, *args, **kwargs)
+        return prefetch
+
+    return wrap
+
+
+def untracked_expansions(serializer_class, tracked=()):
+    """
+    The expansions ``serializer_class`` adds, whether named in ``?expand=``
+    or ``?fields=``, that the validators' state does not cover. Views skip
+    the ETag when there are any.
+    """
+    return set(serializer_class.expand) - set(tracked)
@@ -0,0 +1,27 @@
+from django.db import connections, router
+
+
+def insert_rows(model, fields, rows):
+    """
+    INSERTs ``rows`` (tuples of ``fields`` values, attnames for foreign keys)
+    with one ``executemany``. For append-only logs written on every save:
+    unlike ``bulk_create`` it opens no transaction of its own (BEGIN and
+    COMMIT around a single row outside one) and does not split a batch at
+    SQLite's parameter limit. No instances are built and no ids come back.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    connection = connections[router.db_for_write(model)]
+    columns = [model._meta.get_field(name) for name in fields]
+    quote = connection.ops.quote_name
+    sql = (
+        f'INSERT INTO {quote(model._meta.db_table)} '
+        f'({", ".join(quote(column.column) for column in columns)}) '
+        f'VALUES ({", ".join(["%s"] * len(columns))})'
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            [column.get_db_prep_save(value, connection) for column, value in zip(columns, row)]
+            for row in rows
+        ])
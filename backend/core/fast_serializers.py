@@ -0,0 +1,259 @@
+"""
+Read-only serializers over ``.values()`` rows for the list endpoints.
+
+A ``ModelSerializer`` builds a model instance per row and walks its field
+objects for every attribute; these map the columns of a ``values()`` row
+straight to the output keys with getters built once per serializer. The
+output has the same keys, order and formats as the ``ModelSerializer`` they
+stand in for (see the parity tests). They take ``(rows, many=True,
+context=...)`` and expose ``.data``, so ``core.streaming`` and
+``KeysetPagination`` accept them as they are.
+
+``for_request`` narrows a serializer to the ``?fields=`` the client asked
+for and adds the ``?expand=`` expansions: only the columns those need are
+selected, and each expansion costs one query per page, whatever its size.
+"""
+from operator import itemgetter
+
+from asgiref.sync import sync_to_async
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+
+
+def datetime_repr(value, tz=None):
+    """``DateTimeField.to_representation`` with the default ISO 8601 format."""
+    if not value:
+        return None
+    if timezone.is_aware(value):
+        value = value.astimezone(tz or timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def query_list(request, name):
+    """Comma separated names from ``?name=``, or ``None`` if the parameter is absent."""
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+class Expansion:
+    """
+    Related rows embedded under one key. They are fetched for all rows at
+    once: ``queryset`` filtered on ``to`` being one of the rows' ``link``
+    values, serialized by ``serializer``; ``many`` embeds a list per row.
+    """
+
+    def __init__(self, serializer, queryset, link, to, many=True):
+        self.serializer = serializer
+        self.queryset = queryset
+        self.link = link
+        self.to = to
+        self.many = many
+
+    def related_queryset(self, keys, context):
+        return self.queryset.filter(**{f'{self.to}__in': keys})
+
+    def fetch(self, rows, context):
+        keys = {row[self.link] for row in rows} - {None}
+        related = {}
+        if not keys:
+            return related
+        serializer = self.serializer(context=context)
+        queryset = self.serializer.values(self.related_queryset(keys, context), self.to)
+        for row in queryset:
+            data = serializer.to_representation(row)
+            if self.many:
+                related.setdefault(row[self.to], []).append(data)
+            else:
+                related[row[self.to]] = data
+        return related
+
+    def getter(self, rows, context):
+        related = self.fetch(rows, context)
+        link = itemgetter(self.link)
+        if self.many:
+            return lambda row: related.get(link(row), [])
+        return lambda row: related.get(link(row))
+
+
+class LatestExpansion(Expansion):
+    """
+    The first ``limit`` related rows per row in ``ordering``, e.g. the newest
+    comments of each project. One query ranks them with ``ROW_NUMBER() OVER
+    (PARTITION BY to ORDER BY ordering)``, so a page costs the same whether
+    the related tables hold ten rows or millions. ``?<limit_param>=N``
+    overrides the limit, up to ``max_limit``.
+    """
+
+    def __init__(self, serializer, queryset, link, to, ordering, limit, limit_param=None, max_limit=50):
+        super().__init__(serializer, queryset, link, to)
+        self.ordering = tuple(ordering)
+        self.limit = limit
+        self.limit_param = limit_param
+        self.max_limit = max_limit
+
+    def get_limit(self, context):
+        request = context.get('request')
+        if request is None or not self.limit_param:
+            return self.limit
+        try:
+            limit = int(request.query_params[self.limit_param])
+        except (KeyError, ValueError):
+            return self.limit
+        return min(max(limit, 0), self.max_limit)
+
+    def ranked(self, keys, context):
+        """Primary keys of the kept rows, ranked on the ``(to, ordering)`` index alone."""
+        order_by = [
+            F(name[1:]).desc() if name.startswith('-') else F(name).asc()
+            for name in self.ordering
+        ]
+        return (
+            super().related_queryset(keys, context)
+            .annotate(position=Window(RowNumber(), partition_by=F(self.to), order_by=order_by))
+            .filter(position__lte=self.get_limit(context))
+            .values('pk')
+        )
+
+    def related_queryset(self, keys, context):
+        # Joins for the serializer only see the rows that were kept.
+        return self.queryset.filter(pk__in=self.ranked(keys, context)).order_by(*self.ordering)
+
+
+class ValuesSerializer:
+    """
+    ``fields`` lists ``(key, source)`` or ``(key, source, convert)``.
+    ``source`` is a ``values()`` lookup, a tuple of them, or another
+    ``ValuesSerializer`` for a nested object read from the same row.
+    ``convert`` is a callable or the name of a method, called with the
+    source values; ``'datetime'`` formats like DRF's ``DateTimeField``.
+
+    ``expansions`` maps keys to ``Expansion``s, added after the fields;
+    ``expand`` names the ones included by default.
+    """
+    fields = ()
+    expansions = {}
+    expand = ()
+
+    def __init__(self, instance=None, many=False, context=None):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+        # Looked up once: get_current_timezone() per value costs more than the formatting
+        self.timezone = timezone.get_current_timezone()
+        self.getters = [(key, self._getter(source, convert)) for key, source, convert in self._entries()]
+
+    @classmethod
+    def _entries(cls):
+        for entry in cls.fields:
+            key, source = entry[:2]
+            yield key, source, entry[2] if len(entry) > 2 else None
+
+    @classmethod
+    def sources(cls):
+        """The ``values()`` lookups the serializer reads."""
+        lookups = []
+        sources = [source for _, source, _ in cls._entries()]
+        sources += [cls.expansions[name].link for name in cls.expand]
+        for source in sources:
+            if isinstance(source, type) and issubclass(source, ValuesSerializer):
+                source = tuple(source.sources())
+            for lookup in source if isinstance(source, tuple) else (source,):
+                if lookup not in lookups:
+                    lookups.append(lookup)
+        return lookups
+
+    @classmethod
+    def values(cls, queryset, *extra):
+        """``queryset.values()`` with the serializer's sources and ``extra`` lookups."""
+        lookups = cls.sources()
+        return queryset.values(*lookups, *(lookup for lookup in extra if lookup not in lookups))
+
+    @classmethod
+    def select(cls, fields=None, expand=None):
+        """
+        The serializer limited to ``fields`` (all of them when ``None``) plus
+        the ``expand`` expansions. Expansions can be named in either list.
+        """
+        names = [entry[0] for entry in cls.fields]
+        unknown = [name for name in (fields or []) + (expand or []) if name not in names and name not in cls.expansions]
+        if unknown:
+            raise ParseError(f'Unknown field: {", ".join(unknown)}')
+        if fields is None:
+            wanted = set(names) | set(cls.expand)
+        else:
+            wanted = set(fields)
+        wanted |= set(expand or ())
+        return type(cls.__name__, (cls,), {
+            'fields': tuple(entry for entry in cls.fields if entry[0] in wanted),
+            'expand': tuple(name for name in cls.expansions if name in wanted),
+        })
+
+    @classmethod
+    def for_request(cls, request):
+        """``select`` with the request's ``?fields=`` and ``?expand=``."""
+        fields, expand = query_list(request, 'fields'), query_list(request, 'expand')
+        if fields is None and expand is None:
+            return cls
+        return cls.select(fields, expand)
+
+    @classmethod
+    def prefixed(cls, prefix):
+        """The serializer reading its sources through a relation, e.g. ``'user__'``."""
+        def shift(source):
+            if isinstance(source, tuple):
+                return tuple(prefix + lookup for lookup in source)
+            if isinstance(source, type):
+                return source.prefixed(prefix)
+            return prefix + source
+        fields = tuple((entry[0], shift(entry[1])) + tuple(entry[2:]) for entry in cls.fields)
+        return type(cls.__name__, (cls,), {'fields': fields, 'expansions': {}, 'expand': ()})
+
+    def _getter(self, source, convert):
+        if isinstance(source, type) and issubclass(source, ValuesSerializer):
+            return source(context=self.context).to_representation
+        if isinstance(convert, str):
+            convert = getattr(self, convert)
+        if isinstance(source, tuple) and len(source) == 1:
+            source = source[0]
+        if isinstance(source, tuple):
+            get = itemgetter(*source)
+            return lambda row: convert(*get(row))
+        get = itemgetter(source)
+        if convert is None:
+            return get
+        return lambda row: convert(get(row))
+
+    def datetime(self, value):
+        return datetime_repr(value, self.timezone)
+
+    def to_representation(self, row):
+        return {key: get(row) for key, get in self.getters}
+
+    @property
+    def data(self):
+        rows = self.instance if self.many else [self.instance]
+        if self.expand:
+            rows = list(rows)
+            expanded = [(name, self.expansions[name].getter(rows, self.context)) for name in self.expand]
+            data = []
+            for row in rows:
+                item = self.to_representation(row)
+                for name, get in expanded:
+                    item[name] = get(row)
+                data.append(item)
+        else:
+            data = [self.to_representation(row) for row in rows]
+        return data if self.many else data[0]
+
+    async def adata(self):
+        """``data`` for async views; expansions query, so they run in a thread."""
+        if not self.expand:
+            return self.data
+        return await sync_to_async(lambda: self.data)()
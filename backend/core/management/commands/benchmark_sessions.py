@@ -0,0 +1,47 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.models import User
+
+ENGINES = ('django.contrib.sessions.backends.db', 'core.session_backend', 'core.cached_session_backend')
+
+
+class Command(BaseCommand):
+    help = (
+        'Sends authenticated requests with each session engine and reports '
+        'django_session writes per request. Everything is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--path', default='/api/user/me/')
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        table = Session._meta.db_table
+        with transaction.atomic():
+            user = User.objects.create_user(username=f'session-benchmark-{time.time_ns()}')
+            for engine in ENGINES:
+                with override_settings(SESSION_ENGINE=engine, ALLOWED_HOSTS=['testserver']):
+                    client = Client()
+                    client.force_login(user)
+                    started = time.perf_counter()
+                    with CaptureQueriesContext(connection) as queries:
+                        for _ in range(count):
+                            client.get(options['path'], secure=True)
+                    elapsed = time.perf_counter() - started
+                writes = sum(
+                    1 for query in queries.captured_queries
+                    if table in query['sql']
+                    and query['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))
+                )
+                self.stdout.write(
+                    f'{engine}: {writes} session writes / {count} requests '
+                    f'({writes / count:.2f} per request), {elapsed / count * 1000:.2f} ms per request'
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import UploadSession
+from core.uploads import discard
+
+
+class Command(BaseCommand):
+    help = 'Removes chunked uploads (and their temp files) idle for longer than --hours.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        removed = 0
+        for session in UploadSession.objects.filter(updated_at__lt=cutoff).iterator():
+            discard(session)
+            removed += 1
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} stale uploads.'))
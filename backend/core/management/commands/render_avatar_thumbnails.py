@@ -0,0 +1,22 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from core.avatars import file_digest, process_avatar
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = 'Renders thumbnails for avatars uploaded before they existed.'
+
+    def handle(self, *args, **options):
+        done = 0
+        users = User.objects.exclude(avatar='').exclude(avatar=None).filter(avatar_thumbs='')
+        for user_id, name in users.values_list('id', 'avatar').iterator():
+            if not default_storage.exists(name):
+                self.stderr.write(f'user {user_id}: {name} is missing')
+                continue
+            with default_storage.open(name) as file:
+                digest = file_digest(file)
+            process_avatar(user_id, digest, name)
+            done += 1
+        self.stdout.write(self.style.SUCCESS(f'Processed {done} avatars.'))
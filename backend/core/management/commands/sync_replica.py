@@ -0,0 +1,31 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.routers import replica_alias
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies the primary SQLite database into the replica file, to try '
+        'replica routing locally. Run it again to let the replica catch up.'
+    )
+
+    def handle(self, *args, **options):
+        alias = replica_alias()
+        if not alias:
+            raise CommandError('No replica configured; set DATABASE_REPLICA_URL.')
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[alias]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('Only SQLite files can be copied; use database replication instead.')
+
+        primary.ensure_connection()
+        replica.close()
+        target = sqlite3.connect(replica.settings_dict['NAME'])
+        try:
+            # Online backup: a consistent copy while the primary is in use
+            primary.connection.backup(target)
+        finally:
+            target.close()
+        self.stdout.write(self.style.SUCCESS(f'Copied {primary.settings_dict["NAME"]} to {replica.settings_dict["NAME"]}.'))
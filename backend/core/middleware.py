@@ -0,0 +1,170 @@
+"""
+Per-request profiling: SQL count and time, view and render time, total
+latency. Adds a ``Server-Timing`` header and logs slow or query-heavy
+requests to ``core.profiling`` with their slowest and repeated statements.
+
+Off unless ``REQUEST_PROFILING`` is set; then the middleware removes itself
+from the stack at startup (``MiddlewareNotUsed``) and costs nothing.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('core.profiling')
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+@contextmanager
+def recording(recorder):
+    """Installs ``recorder`` on every configured connection for the request."""
+    wrapped = list(connections.all())
+    for connection in wrapped:
+        connection.execute_wrappers.append(recorder)
+    try:
+        yield
+    finally:
+        for connection in wrapped:
+            connection.execute_wrappers.remove(recorder)
+
+
+@asynccontextmanager
+async def arecording(recorder):
+    """
+    ``recording`` for async requests. Connections are per thread and the
+    queries run in the request's sync thread, so the recorder goes there.
+    """
+    manager = recording(recorder)
+    await sync_to_async(manager.__enter__)()
+    try:
+        yield
+    finally:
+        await sync_to_async(manager.__exit__)(None, None, None)
+
+
+class QueryRecorder:
+    """``execute_wrapper`` that times every statement."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started))
+
+    @property
+    def duration(self):
+        return sum(duration for _, duration in self.queries)
+
+    def slowest(self, count=3):
+        return sorted(self.queries, key=lambda query: query[1], reverse=True)[:count]
+
+    def duplicates(self, threshold):
+        """Statements run ``threshold`` times or more with different parameters: likely N+1."""
+        counts = Counter(_IN_LIST.sub('IN (...)', sql) for sql, _ in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count >= threshold]
+
+
+class RequestProfile:
+    def __init__(self):
+        self.recorder = QueryRecorder()
+        self.started = time.perf_counter()
+        self.view_name = None
+        self.view_started = None
+        self.view_finished = None
+        self.db_before_view = 0.0
+
+    def timings(self, finished):
+        total = finished - self.started
+        db = self.recorder.duration
+        timings = {'db': db, 'total': total}
+        if self.view_started is not None:
+            view_end = self.view_finished or finished
+            view_db = db - self.db_before_view
+            # Inside the view but outside SQL: mostly serializers.
+            timings['serialize'] = max(view_end - self.view_started - view_db, 0.0)
+            if self.view_finished is not None:
+                timings['render'] = finished - self.view_finished
+        return timings
+
+
+class RequestProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not _setting('REQUEST_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = self.start(request)
+        with recording(profile.recorder):
+            response = self.get_response(request)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = self.start(request)
+        async with arecording(profile.recorder):
+            response = await self.get_response(request)
+        return self.finish(request, response, profile)
+
+    def start(self, request):
+        profile = RequestProfile()
+        request._profile = profile
+        return profile
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = request._profile
+        match = request.resolver_match
+        profile.view_name = (match.view_name if match else None) or view_func.__qualname__
+        profile.view_started = time.perf_counter()
+        profile.db_before_view = profile.recorder.duration
+
+    def process_template_response(self, request, response):
+        # Called after the view, before the response (DRF's too) is rendered.
+        request._profile.view_finished = time.perf_counter()
+        return response
+
+    def finish(self, request, response, profile):
+        timings = profile.timings(time.perf_counter())
+        count = len(profile.recorder.queries)
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration * 1000:.1f}' + (f';desc="{count} queries"' if name == 'db' else '')
+            for name, duration in timings.items()
+        )
+        self.log(request, response, profile, timings)
+        return response
+
+    def log(self, request, response, profile, timings):
+        slow = timings['total'] * 1000 >= _setting('REQUEST_PROFILING_SLOW_MS', 500)
+        many = len(profile.recorder.queries) >= _setting('REQUEST_PROFILING_MAX_QUERIES', 50)
+        duplicates = profile.recorder.duplicates(_setting('REQUEST_PROFILING_DUPLICATES', 5))
+        if not (slow or many or duplicates):
+            return
+        lines = [
+            f'{request.method} {request.path} view={profile.view_name} status={response.status_code} '
+            f'queries={len(profile.recorder.queries)} '
+            + ' '.join(f'{name}={duration * 1000:.1f}ms' for name, duration in timings.items())
+        ]
+        lines += [f'  slow  {duration * 1000:.1f}ms  {sql}' for sql, duration in profile.recorder.slowest()]
+        lines += [f'  dup   x{count}  {sql}' for sql, count in duplicates]
+        logger.warning('\n'.join(lines))
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from core.user_search import create_index, drop_index
+
+
+def forwards(apps, schema_editor):
+    create_index(schema_editor, apps.get_model('core', 'User')._meta.db_table)
+
+
+def backwards(apps, schema_editor):
+    drop_index(schema_editor, apps.get_model('core', 'User')._meta.db_table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:20
+
+from django.db import migrations, models
+
+from core.user_search import create_index, drop_index
+
+
+def create_search_index(apps, schema_editor):
+    create_index(schema_editor, apps.get_model('core', 'User')._meta.db_table)
+
+
+def drop_search_index(apps, schema_editor):
+    drop_index(schema_editor, apps.get_model('core', 'User')._meta.db_table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_user_search'),
+    ]
+
+    # SQLite rebuilds core_user to add a column, which drops the search
+    # triggers, so the user search index is recreated around the change.
+    operations = [
+        migrations.RunPython(drop_search_index, create_search_index),
+        migrations.AddField(
+            model_name='user',
+            name='avatar_thumbs',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,22 +1,33 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 
 class User(AbstractUser):
     avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
+    # SHA-256 of the avatar once its thumbnails are rendered (core.avatars)
+    avatar_thumbs = models.CharField(max_length=64, blank=True, default='')
     bio = models.TextField(blank=True)
     
     class Meta:
         app_label = 'core'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['-date_joined', '-id'], name='user_date_joined_idx'),
+        ]
 
 class MediaFile(models.Model):
     FILE_TYPES = [
         ('IMAGE', 'Image'),
+        ('FILE', 'File'),
     ]
 
     file = models.FileField(upload_to='task_media/%Y/%m/%d/')
     file_type = models.CharField(max_length=10, choices=FILE_TYPES)
+    # Content hash; uploads with the same content share one stored file
+    sha256 = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    size = models.BigIntegerField(default=0)
     task = models.ForeignKey(
         'task.Task',
         on_delete=models.CASCADE,
@@ -35,4 +46,24 @@ class MediaFile(models.Model):
         app_label = 'core'
     
     def __str__(self):
-        return f"{self.file_type} - {self.file.name}"
\ No newline at end of file
+        return f"{self.file_type} - {self.file.name}"
+
+
+class UploadSession(models.Model):
+    """A chunked upload in progress; chunks are appended to a temp file (core.uploads)."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.ForeignKey('task.Task', on_delete=models.CASCADE, related_name='upload_sessions')
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    # Expected SHA-256 sent by the client, checked on completion
+    sha256 = models.CharField(max_length=64, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'core'
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
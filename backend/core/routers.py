@@ -0,0 +1,167 @@
+"""
+Primary/replica routing. Configured when ``DATABASE_REPLICA`` names an
+alias (``DATABASE_REPLICA_URL``); otherwise everything uses ``default``.
+
+Reads go to the replica only inside a safe (GET/HEAD/OPTIONS) request routed
+by ``ReplicaRoutingMiddleware``. Writes, reads after a write or inside a
+transaction, and everything outside a request (commands, signals on
+background threads) use the primary. Streamed response bodies are produced
+after the middleware returns, so they read from the primary too.
+
+A client whose request wrote is pinned to the primary with a cookie for
+``DATABASE_REPLICA_LAG`` seconds, so it reads its own writes. The same
+setting is the lag tolerance: while the replica reports more lag than that,
+reads stay on the primary.
+"""
+import math
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+PRIMARY = DEFAULT_DB_ALIAS
+PIN_COOKIE = 'db_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_state = ContextVar('db_routing', default=None)
+# (monotonic time of the check, lag in seconds), shared by the process
+_lag = [-math.inf, 0.0]
+
+
+def replica_alias():
+    return getattr(settings, 'DATABASE_REPLICA', None)
+
+
+def lag_tolerance():
+    return getattr(settings, 'DATABASE_REPLICA_LAG', 5)
+
+
+class RoutingState:
+    """Routing for one request; a mutable object so DB threads share it."""
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+def measure_lag(alias):
+    """
+    Seconds the replica is behind. SQLite files copied with ``sync_replica``
+    report 0; an unreachable replica counts as infinitely behind.
+    """
+    connection = connections[alias]
+    try:
+        if connection.vendor != 'postgresql':
+            return 0.0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT CASE WHEN NOT pg_is_in_recovery() '
+                'OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+                'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+            )
+            return float(cursor.fetchone()[0] or 0)
+    except DatabaseError:
+        return math.inf
+
+
+def lag_check_due():
+    interval = getattr(settings, 'DATABASE_REPLICA_LAG_CHECK', 5)
+    return time.monotonic() - _lag[0] >= interval
+
+
+def refresh_lag():
+    _lag[:] = [time.monotonic(), measure_lag(replica_alias())]
+
+
+def replica_lag():
+    return _lag[1]
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica or state.wrote:
+            return PRIMARY
+        # Related objects of something loaded from the primary stay there.
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication (or sync_replica).
+        return db != replica_alias()
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_alias():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if lag_check_due():
+            refresh_lag()
+        state = self.start(request)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        if lag_check_due():
+            await sync_to_async(refresh_lag)()
+        state = self.start(request)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.finish(request, response, state)
+
+    def start(self, request):
+        return RoutingState(
+            request.method in SAFE_METHODS
+            and not self.pinned(request)
+            and replica_lag() <= lag_tolerance()
+        )
+
+    def pinned(self, request):
+        try:
+            return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def finish(self, request, response, state):
+        if state.wrote:
+            lag = lag_tolerance()
+            response.set_cookie(
+                PIN_COOKIE, str(math.ceil(time.time() + lag)),
+                max_age=lag, httponly=True, samesite='Lax',
+                secure=request.is_secure(),
+            )
+        return response
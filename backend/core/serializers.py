@@ -2,25 +2,91 @@
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
 from django.utils.translation import gettext_lazy as _
+from .avatars import avatar_urls, stored_avatar_urls
+from .fast_serializers import ValuesSerializer
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class AvatarMixin:
+    """
+    ``avatars`` holds ``{size: {'webp': url, 'png': url}}``; the single URL
+    fields keep pointing at the original image.
+    """
+
+    def _avatar_urls(self, obj):
+        if not getattr(obj, 'avatar', None):
+            return None
+        request = self.context.get('request')
+        return avatar_urls(obj, request.build_absolute_uri if request is not None else None)
+
+    def _avatar_url(self, obj):
+        if not getattr(obj, 'avatar', None):
+            return None
+        request = self.context.get('request')
+        return request.build_absolute_uri(obj.avatar.url) if request is not None else obj.avatar.url
+
+    def get_avatars(self, obj):
+        return self._avatar_urls(obj)
+
+
+class AvatarValuesMixin:
+    """``AvatarMixin`` for ``ValuesSerializer``: methods take ``avatar`` and ``avatar_thumbs``."""
+
+    def get_avatars(self, name, thumbs):
+        request = self.context.get('request')
+        return stored_avatar_urls(name, thumbs, request.build_absolute_uri if request is not None else None)
+
+    def get_avatar_url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+
+class UserSerializer(AvatarMixin, serializers.ModelSerializer):
     avatar = serializers.SerializerMethodField()
+    avatars = serializers.SerializerMethodField()
 
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'avatar']
+        fields = ['id', 'username', 'email', 'avatar', 'avatars']
         read_only_fields = fields
 
     def get_avatar(self, obj):
-        if hasattr(obj, 'avatar') and obj.avatar:
-            request = self.context.get('request')
-            if request is not None:
-                return request.build_absolute_uri(obj.avatar.url)
-            return obj.avatar.url
-        return None
+        return self._avatar_url(obj)
+
+class UserValuesSerializer(AvatarValuesMixin, ValuesSerializer):
+    """``UserSerializer`` over ``values()`` rows."""
+    fields = (
+        ('id', 'id'),
+        ('username', 'username'),
+        ('email', 'email'),
+        ('avatar', 'avatar', 'get_avatar_url'),
+        ('avatars', ('avatar', 'avatar_thumbs'), 'get_avatars'),
+    )
+
+class MediaFileValuesSerializer(ValuesSerializer):
+    """Task attachments, in the shape ``upload_complete`` returns them."""
+    fields = (
+        ('id', 'id'),
+        ('task', 'task_id'),
+        ('file', 'file', 'get_file_url'),
+        ('file_type', 'file_type'),
+        ('sha256', 'sha256'),
+        ('size', 'size'),
+        ('uploaded_by', 'uploaded_by_id'),
+        ('uploaded_at', 'uploaded_at', 'datetime'),
+    )
+
+    def get_file_url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
@@ -83,19 +149,30 @@ class LoginSerializer(serializers.Serializer):
 
         return data
 
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(AvatarMixin, serializers.ModelSerializer):
     avatar_url = serializers.SerializerMethodField()
+    avatars = serializers.SerializerMethodField()
 
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 
-                 'avatar_url', 'bio', 'is_active', 'date_joined']
+                 'avatar_url', 'avatars', 'bio', 'is_active', 'date_joined']
         read_only_fields = fields
 
     def get_avatar_url(self, obj):
-        if obj.avatar and hasattr(obj.avatar, 'url'):
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.avatar.url)
-            return obj.avatar.url
-        return None
\ No newline at end of file
+        return self._avatar_url(obj)
+
+class UserListValuesSerializer(AvatarValuesMixin, ValuesSerializer):
+    """``UserListSerializer`` over ``values()`` rows."""
+    fields = (
+        ('id', 'id'),
+        ('username', 'username'),
+        ('email', 'email'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+        ('avatar_url', 'avatar', 'get_avatar_url'),
+        ('avatars', ('avatar', 'avatar_thumbs'), 'get_avatars'),
+        ('bio', 'bio'),
+        ('is_active', 'is_active'),
+        ('date_joined', 'date_joined', 'datetime'),
+    )
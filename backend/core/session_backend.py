@@ -0,0 +1,51 @@
+"""
+Session engine that keeps ``SESSION_SAVE_EVERY_REQUEST`` cheap.
+
+An unmodified session is written back only when its last write is older
+than ``SESSION_REFRESH_INTERVAL`` seconds, so the sliding expiry moves in
+steps instead of costing an UPDATE on ``django_session`` per request. The
+row may expire up to one interval before the cookie does.
+
+Sessions are read from the database here. ``core.cached_session_backend``
+reads them from the cache instead; it is only safe with a cache shared by
+every worker, or a logout in one worker leaves the session alive in the
+others' copies.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends import db
+from django.utils import timezone
+
+REFRESHED_KEY = '_refreshed_at'
+
+
+class RefreshThrottleMixin:
+    def _refresh_due(self):
+        refreshed = self._session.get(REFRESHED_KEY)
+        interval = getattr(settings, 'SESSION_REFRESH_INTERVAL', 300)
+        return refreshed is None or time.time() - refreshed >= interval
+
+    def save(self, must_create=False):
+        if not must_create and not self.modified and self.session_key and not self._refresh_due():
+            return
+        # Straight into the dict: the stamp alone must not mark the session modified.
+        self._session[REFRESHED_KEY] = int(time.time())
+        super().save(must_create=must_create)
+
+    @classmethod
+    def clear_expired(cls, batch_size=1000):
+        """Deletes expired rows ``batch_size`` at a time to keep write locks short."""
+        model = cls.get_model_class()
+        while True:
+            keys = list(
+                model.objects.filter(expire_date__lt=timezone.now())
+                .values_list('session_key', flat=True)[:batch_size]
+            )
+            if not keys:
+                break
+            model.objects.filter(session_key__in=keys).delete()
+
+
+class SessionStore(RefreshThrottleMixin, db.SessionStore):
+    pass
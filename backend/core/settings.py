@@ -1,6 +1,8 @@
 from pathlib import Path
 import os
 
+import dj_database_url
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -23,6 +25,7 @@ CORS_ALLOWED_ORIGINS = [
     "https://stuck-k2od.onrender.com",
 ]
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ["Link", "Server-Timing"]
 #CORS_ALLOW_ALL_ORIGINS = False
 
 # CSRF settings
@@ -36,8 +39,15 @@ CSRF_TRUSTED_ORIGINS = [
     "https://stuck-k2od.onrender.com",
 ]
 
+# Cache shared by every worker (see CACHES below).
+SHARED_CACHE = bool(os.environ.get("DJANGO_CACHE_DIR"))
+
 # Session settings
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# The row is rewritten at most once per SESSION_REFRESH_INTERVAL seconds
+# unless the session changes. Reads come from the cache only when it is
+# shared: a per-process copy would outlive a logout in another worker.
+SESSION_ENGINE = "core.cached_session_backend" if SHARED_CACHE else "core.session_backend"
+SESSION_REFRESH_INTERVAL = 300
 SESSION_COOKIE_SAMESITE = "Lax"
 SESSION_COOKIE_SECURE = True
 SESSION_COOKIE_HTTPONLY = True
@@ -56,6 +66,9 @@ INSTALLED_APPS = [
     "project.apps.ProjectConfig",
     "task.apps.TaskConfig",
     "comment.apps.CommentConfig",
+    "search.apps.SearchConfig",
+    "events.apps.EventsConfig",
+    "sync.apps.SyncConfig",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -68,8 +81,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestProfilingMiddleware",
+    "core.routers.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.staticfiles.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -108,18 +123,96 @@ TEMPLATES = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Avatar thumbnails (core.avatars), rendered in a thread pool after upload
+AVATAR_SIZES = (32, 64, 256)
+AVATAR_PROCESSING_ASYNC = True
+AVATAR_WORKERS = 2
+
+# Chunked uploads (core.uploads). The temp dir must be shared by all workers.
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_TEMP_DIR = os.environ.get("UPLOAD_TEMP_DIR")
+
+# Project event stream (events app). Needs the ASGI server (core.asgi).
+# LocalBroker only reaches clients of the same process; DatabaseBroker
+# relays events through the ProjectEvent table to every worker.
+EVENTS_BROKER = os.environ.get("EVENTS_BROKER", "events.broker.LocalBroker")
+EVENTS_BUFFER_SIZE = 200
+EVENTS_HEARTBEAT = 15
+EVENTS_POLL_INTERVAL = 1.0
+EVENTS_RETENTION = 3600
+
+# Delta sync (sync app). Tokens only advance past changes older than the
+# settle time; tokens older than the tombstone retention get 410 Gone.
+SYNC_PAGE_SIZE = 500
+SYNC_SETTLE_SECONDS = 2
+SYNC_TOMBSTONE_DAYS = 30
+
+# Route project/task/user read endpoints to their async versions (views_async).
+# Only under core.asgi, and off by default: with SQLite the queries still run
+# in the sync thread, and benchmarks.concurrency shows no gain over the sync
+# views served by the same ASGI stack.
+ASYNC_READ_VIEWS = os.environ.get("ASYNC_READ_VIEWS", "0") == "1"
+
+# Request profiling (core.middleware): Server-Timing header plus a warning in
+# the core.profiling log for slow, query-heavy or N+1 requests.
+REQUEST_PROFILING = os.environ.get("REQUEST_PROFILING", "0") == "1"
+REQUEST_PROFILING_SLOW_MS = 500
+REQUEST_PROFILING_MAX_QUERIES = 50
+REQUEST_PROFILING_DUPLICATES = 5
+
 WSGI_APPLICATION = "core.wsgi.application"
 
-# Database
+# Database. DATABASE_URL overrides the local SQLite file.
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db_tm.sqlite3",
-    }
+    "default": dj_database_url.config(default=f"sqlite:///{BASE_DIR / 'db_tm.sqlite3'}"),
 }
 
+# Read replica (core.routers). Safe requests read from it unless the client
+# wrote within DATABASE_REPLICA_LAG seconds or the replica lags more than
+# that. Locally: DATABASE_REPLICA_URL=sqlite:///db_replica.sqlite3 and
+# `manage.py sync_replica` to copy the primary into it.
+DATABASE_REPLICA = None
+DATABASE_REPLICA_LAG = int(os.environ.get("DATABASE_REPLICA_LAG", 5))
+DATABASE_REPLICA_LAG_CHECK = 5
+if os.environ.get("DATABASE_REPLICA_URL"):
+    DATABASE_REPLICA = "replica"
+    DATABASES[DATABASE_REPLICA] = dj_database_url.parse(os.environ["DATABASE_REPLICA_URL"])
+    DATABASES[DATABASE_REPLICA]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+
 AUTH_USER_MODEL = "core.User"
 
+# Cache (project access / roles). LocMemCache is per process; set
+# DJANGO_CACHE_DIR to share entries and invalidations between workers.
+if SHARED_CACHE:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ["DJANGO_CACHE_DIR"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "stuck",
+        }
+    }
+
+# Invalidations only reach the worker that made the change unless the cache
+# is shared; with several gunicorn workers the others must not serve stale
+# roles for long.
+CACHE_WORKERS = int(os.environ.get("WEB_CONCURRENCY") or 1)
+STALE_CACHE_TIMEOUT = 5 if CACHE_WORKERS > 1 and not SHARED_CACHE else None
+
+PROJECT_ACCESS_CACHE_TIMEOUT = STALE_CACHE_TIMEOUT or 300
+
+# /api/me/dashboard/ (task.dashboard). Entries are dropped on task changes;
+# the timeout bounds how late a task shows up as overdue or due soon.
+DASHBOARD_CACHE_TIMEOUT = STALE_CACHE_TIMEOUT or 60
+DASHBOARD_DUE_SOON_DAYS = 3
+DASHBOARD_TASKS_PER_STATUS = 20
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
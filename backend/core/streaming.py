@@ -0,0 +1,150 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+JSON_CONTENT_TYPE = 'application/json'
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Lets views accept ``Accept: application/x-ndjson``; non-streamed
+    responses (errors) are written as a single line per object.
+    """
+    media_type = NDJSON_CONTENT_TYPE
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer = JSONRenderer()
+        items = data if isinstance(data, list) else [data]
+        return b''.join(renderer.render(item) + b'\n' for item in items)
+
+
+def stream_format(request):
+    """
+    Returns ``'ndjson'`` or ``'json'`` when the client asked for a streamed
+    response (``?stream=1``, ``?stream=ndjson`` or ``Accept: application/x-ndjson``),
+    otherwise ``None``.
+    """
+    stream = request.query_params.get('stream', '').lower()
+    if stream == 'ndjson' or NDJSON_CONTENT_TYPE in request.META.get('HTTP_ACCEPT', ''):
+        return 'ndjson'
+    if stream in ('1', 'true', 'json'):
+        return 'json'
+    return None
+
+
+def _serialized_batches(queryset, serializer_class, context, chunk_size):
+    batch = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) == chunk_size:
+            yield serializer_class(batch, many=True, context=context).data
+            batch = []
+    if batch:
+        yield serializer_class(batch, many=True, context=context).data
+
+
+async def _adata(serializer):
+    # ValuesSerializer.adata runs expansion queries in a thread.
+    adata = getattr(serializer, 'adata', None)
+    return await adata() if adata is not None else serializer.data
+
+
+async def _aserialized_batches(queryset, serializer_class, context, chunk_size):
+    batch = []
+    async for obj in queryset.aiterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) == chunk_size:
+            yield await _adata(serializer_class(batch, many=True, context=context))
+            batch = []
+    if batch:
+        yield await _adata(serializer_class(batch, many=True, context=context))
+
+
+def _json_chunk(renderer, data, first):
+    # Render the batch as a list and drop its brackets so batches can be
+    # joined into one array.
+    rendered = renderer.render(data)[1:-1]
+    return rendered if first else b',' + rendered
+
+
+def _json_body(batches):
+    renderer = JSONRenderer()
+    yield b'['
+    first = True
+    for data in batches:
+        if not data:
+            continue
+        yield _json_chunk(renderer, data, first)
+        first = False
+    yield b']'
+
+
+async def _ajson_body(batches):
+    renderer = JSONRenderer()
+    yield b'['
+    first = True
+    async for data in batches:
+        if not data:
+            continue
+        yield _json_chunk(renderer, data, first)
+        first = False
+    yield b']'
+
+
+def _ndjson_body(batches):
+    renderer = JSONRenderer()
+    for data in batches:
+        yield b''.join(renderer.render(item) + b'\n' for item in data)
+
+
+async def _andjson_body(batches):
+    renderer = JSONRenderer()
+    async for data in batches:
+        yield b''.join(renderer.render(item) + b'\n' for item in data)
+
+
+def stream_queryset(queryset, serializer_class, fmt='json', context=None, chunk_size=1000):
+    """
+    Serializes ``queryset`` in chunks of ``chunk_size`` rows while the response
+    is being sent, so memory use does not grow with the number of rows.
+    """
+    batches = _serialized_batches(queryset, serializer_class, context or {}, chunk_size)
+    if fmt == 'ndjson':
+        return StreamingHttpResponse(_ndjson_body(batches), content_type=NDJSON_CONTENT_TYPE)
+    return StreamingHttpResponse(_json_body(batches), content_type=JSON_CONTENT_TYPE)
+
+
+def astream_queryset(queryset, serializer_class, fmt='json', context=None, chunk_size=1000):
+    """
+    Async ``stream_queryset``: under ASGI a sync iterator would be read into
+    memory before sending, an async one is sent as it is produced.
+    """
+    batches = _aserialized_batches(queryset, serializer_class, context or {}, chunk_size)
+    if fmt == 'ndjson':
+        return StreamingHttpResponse(_andjson_body(batches), content_type=NDJSON_CONTENT_TYPE)
+    return StreamingHttpResponse(_ajson_body(batches), content_type=JSON_CONTENT_TYPE)
+
+
+async def _in_thread(chunks):
+    chunks = iter(chunks)
+    done = object()
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(chunks, done)) is not done:
+        yield chunk
+
+
+def stream_chunks(request, chunks, content_type):
+    """
+    Streams a sync iterator of bytes. Under ASGI a sync iterator would be
+    read into memory before sending, so each chunk is produced in the sync
+    thread instead.
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        chunks = _in_thread(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type)
@@ -0,0 +1,20 @@
+from django.db import connection
+
+
+class QueryPlanMixin:
+    """
+    ``assertUsesIndex`` checks the database's plan for a queryset. On
+    PostgreSQL sequential scans are disabled first, since tiny test tables
+    would otherwise never be read through an index.
+    """
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.explain(queryset)
+        self.assertIn(index_name, plan, msg=f'Expected {index_name} in plan:\n{plan}')
+        self.assertNotIn('TEMP B-TREE', plan, msg=f'Unexpected sort in plan:\n{plan}')
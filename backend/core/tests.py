@@ -0,0 +1,593 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+from asgiref.sync import async_to_sync
+from django.contrib.sessions.models import Session
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from project.models import Project, ProjectMember
+from task.models import Task
+
+from .avatars import thumbnail_name
+from .models import MediaFile, UploadSession, User
+from .serializers import UserListSerializer
+from .session_backend import SessionStore
+from .user_search import search_users
+
+
+class UserListPaginationTests(APITestCase):
+    def test_newest_users_first_across_pages(self):
+        now = timezone.now()
+        for i in range(5):
+            User.objects.create_user(username=f'user{i}', date_joined=now - timedelta(days=i))
+
+        first = self.client.get(reverse('users'), {'page_size': 3})
+        self.assertEqual([u['username'] for u in first.data], ['user0', 'user1', 'user2'])
+
+        next_url = first.headers['Link'][1:first.headers['Link'].index('>')]
+        second = self.client.get(next_url)
+        self.assertEqual([u['username'] for u in second.data], ['user3', 'user4'])
+        self.assertNotIn('Link', second.headers)
+
+
+class UserSearchTests(APITestCase):
+    def setUp(self):
+        self.ivan = User.objects.create_user(
+            username='ivan_pidpryiemets', first_name='Іван', last_name='Підприємець',
+            email='ivan@example.com'
+        )
+        self.olena = User.objects.create_user(
+            username='olena_kovalenko', first_name='Олена', last_name='Коваленко',
+            email='olena@example.com'
+        )
+        self.sofia = User.objects.create_user(
+            username='sofia', first_name='Sofia', last_name='Ivanenko', email='sm@example.com'
+        )
+
+    def usernames(self, query, **params):
+        return [user.username for user in search_users(query, **params)]
+
+    def test_prefix_matches_any_column_ranked_by_username(self):
+        self.assertEqual(self.usernames('iva'), ['ivan_pidpryiemets', 'sofia'])
+        self.assertEqual(self.usernames('Кова'), ['olena_kovalenko'])
+        self.assertEqual(self.usernames('olena@exa'), ['olena_kovalenko'])
+
+    def test_all_tokens_must_match(self):
+        self.assertEqual(self.usernames('sofia ivan'), ['sofia'])
+        self.assertEqual(self.usernames('zzz'), [])
+        self.assertEqual(self.usernames('  "* '), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.usernames('example', limit=2)), 2)
+
+    def test_index_follows_user_changes(self):
+        self.olena.username = 'olena_shevchenko'
+        self.olena.save()
+        self.assertEqual(self.usernames('kovalenko'), [])
+        self.assertEqual(self.usernames('Коваленко'), ['olena_shevchenko'])
+        self.assertEqual(self.usernames('shevch'), ['olena_shevchenko'])
+
+        self.olena.delete()
+        self.assertEqual(self.usernames('olena'), [])
+
+        User.objects.bulk_create([User(username='bulk_user', email='bulk@example.com')])
+        self.assertEqual(self.usernames('bulk'), ['bulk_user'])
+
+    def test_user_list_endpoint_searches(self):
+        response = self.client.get(reverse('users'), {'q': 'ivan'})
+        self.assertEqual([user['username'] for user in response.data],
+                         ['ivan_pidpryiemets', 'sofia'])
+        response = self.client.get(reverse('users'), {'username': 'olena', 'limit': 'x'})
+        self.assertEqual([user['username'] for user in response.data], ['olena_kovalenko'])
+
+
+@override_settings(SESSION_ENGINE='core.session_backend', SESSION_SAVE_EVERY_REQUEST=True)
+class SessionBackendTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.client.force_login(self.user)
+
+    def session_writes(self, requests=5):
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(requests):
+                response = self.client.get(reverse('current_user'), secure=True)
+                self.assertEqual(response.status_code, 200)
+        return [
+            query for query in queries.captured_queries
+            if Session._meta.db_table in query['sql'] and not query['sql'].startswith('SELECT')
+        ]
+
+    def test_unmodified_session_is_not_rewritten(self):
+        self.assertEqual(self.session_writes(), [])
+
+    @override_settings(SESSION_REFRESH_INTERVAL=0)
+    def test_expiry_slides_once_interval_passed(self):
+        self.assertEqual(len(self.session_writes(requests=2)), 2)
+
+    def test_modified_session_is_saved(self):
+        session = SessionStore(self.client.session.session_key)
+        session['theme'] = 'dark'
+        session.save()
+        self.assertEqual(SessionStore(session.session_key)['theme'], 'dark')
+
+    def test_deleted_row_ends_the_session(self):
+        # Вихід в іншому воркері видаляє рядок; локальної копії немає
+        key = self.client.session.session_key
+        self.assertEqual(self.session_writes(requests=1), [])
+        Session.objects.filter(session_key=key).delete()
+        response = self.client.get(reverse('current_user'), secure=True)
+        self.assertIn(response.status_code, (401, 403))
+
+    @override_settings(SESSION_ENGINE='core.cached_session_backend')
+    def test_cached_engine_throttles_writes_too(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.session_writes(), [])
+
+    def test_clear_expired_in_batches(self):
+        past = timezone.now() - timedelta(days=1)
+        Session.objects.bulk_create(
+            Session(session_key=f'expired{i:032}', session_data='', expire_date=past)
+            for i in range(5)
+        )
+        SessionStore.clear_expired(batch_size=2)
+        self.assertEqual(Session.objects.filter(expire_date__lt=timezone.now()).count(), 0)
+        self.assertEqual(Session.objects.count(), 1)
+
+
+def image_upload(color='red', size=(600, 400)):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return SimpleUploadedFile('face.png', buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(AVATAR_PROCESSING_ASYNC=False)
+class AvatarTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username='owner')
+        self.client.force_login(self.user)
+
+    def upload(self, user=None, color='red'):
+        if user is not None:
+            self.client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('avatar-upload'), {'avatar': image_upload(color)})
+        self.assertEqual(response.status_code, 200)
+
+    def test_upload_renders_every_size(self):
+        self.upload()
+        self.user.refresh_from_db()
+        digest = self.user.avatar_thumbs
+        self.assertEqual(self.user.avatar.name, f'avatars/{digest[:2]}/{digest}.png')
+        for size in (32, 64, 256):
+            for ext in ('webp', 'png'):
+                with default_storage.open(thumbnail_name(digest, size, ext)) as file:
+                    self.assertEqual(Image.open(file).size, (size, size))
+
+    def test_identical_uploads_share_files(self):
+        other = User.objects.create_user(username='other')
+        self.upload()
+        self.upload(other)
+        self.user.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.user.avatar.name, other.avatar.name)
+        self.assertEqual(len(default_storage.listdir(f'avatars/{other.avatar_thumbs[:2]}')[1]), 1)
+
+    def test_serializer_exposes_sizes(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.client.post(reverse('avatar-upload'), {'avatar': image_upload()})
+        self.user.refresh_from_db()
+        data = UserListSerializer(self.user).data
+        # Thumbnails pending: every size falls back to the original.
+        self.assertEqual(data['avatar_url'], self.user.avatar.url)
+
+        for callback in callbacks:
+            callback()
+        self.user.refresh_from_db()
+        data = UserListSerializer(self.user).data
+        self.assertEqual(set(data['avatars']), {'32', '64', '256'})
+        self.assertTrue(data['avatars']['256']['webp'].endswith('/256.webp'))
+        # The single URL stays the original; only the map points at thumbnails.
+        self.assertEqual(data['avatar_url'], self.user.avatar.url)
+
+    def test_rejects_non_images(self):
+        response = self.client.post(
+            reverse('avatar-upload'),
+            {'avatar': SimpleUploadedFile('face.png', b'not an image', content_type='image/png')},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(UPLOAD_CHUNK_SIZE=4)
+class ChunkedUploadTests(APITestCase):
+    content = b'0123456789'
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media, UPLOAD_TEMP_DIR=os.path.join(self.media, 'tmp'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username='owner')
+        project = Project.objects.create(title='Board', description='', created_by=self.user)
+        self.task = Task.objects.create(description='Attach', project=project, created_by=self.user)
+        self.client.force_authenticate(self.user)
+
+    def start(self, content=None, **extra):
+        content = self.content if content is None else content
+        response = self.client.post(reverse('upload-start'), {
+            'task': self.task.pk, 'filename': 'notes.txt', 'size': len(content), **extra,
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def put(self, upload_id, start, chunk, size=None):
+        size = len(self.content) if size is None else size
+        return self.client.put(
+            reverse('upload-detail', args=[upload_id]),
+            chunk,
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{start + len(chunk) - 1}/{size}',
+        )
+
+    def upload(self, content=None, **extra):
+        content = self.content if content is None else content
+        upload_id = self.start(content, **extra)
+        for start in range(0, len(content), 4):
+            self.assertEqual(self.put(upload_id, start, content[start:start + 4], len(content)).status_code, 200)
+        return upload_id, self.client.post(reverse('upload-complete', args=[upload_id]))
+
+    def test_chunks_are_assembled_and_verified(self):
+        digest = hashlib.sha256(self.content).hexdigest()
+        _, response = self.upload(sha256=digest)
+        self.assertEqual(response.status_code, 201)
+        media = MediaFile.objects.get(pk=response.data['id'])
+        self.assertEqual((media.sha256, media.size, media.file_type), (digest, 10, 'FILE'))
+        with media.file.open('rb') as file:
+            self.assertEqual(file.read(), self.content)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(os.path.join(self.media, 'tmp')), [])
+
+    def test_resume_after_lost_hash_state(self):
+        from . import uploads
+
+        upload_id = self.start()
+        self.put(upload_id, 0, self.content[:4])
+        # Another worker: no running hash in memory.
+        uploads._hashes.clear()
+        self.assertEqual(self.client.get(reverse('upload-detail', args=[upload_id])).data['offset'], 4)
+        response = self.put(upload_id, 0, self.content[:4])
+        self.assertEqual((response.status_code, response.data['offset']), (409, 4))
+        self.put(upload_id, 4, self.content[4:8])
+        self.put(upload_id, 8, self.content[8:])
+        response = self.client.post(reverse('upload-complete', args=[upload_id]))
+        self.assertEqual(response.data['sha256'], hashlib.sha256(self.content).hexdigest())
+
+    def test_identical_content_is_stored_once(self):
+        _, first = self.upload()
+        _, second = self.upload()
+        self.assertNotEqual(first.data['id'], second.data['id'])
+        names = set(MediaFile.objects.values_list('file', flat=True))
+        self.assertEqual(len(names), 1)
+
+    def test_checksum_mismatch_discards_upload(self):
+        upload_id, response = self.upload(sha256='0' * 64)
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(UploadSession.objects.filter(pk=upload_id).exists())
+        self.assertFalse(MediaFile.objects.exists())
+
+    def test_completion_is_claimed_once(self):
+        from . import uploads
+
+        upload_id = self.start()
+        self.put(upload_id, 0, self.content[:4])
+        self.put(upload_id, 4, self.content[4:8])
+        self.put(upload_id, 8, self.content[8:])
+        # Два запити з однією сесією, прочитаною до завершення
+        session = UploadSession.objects.get(pk=upload_id)
+        uploads.complete(UploadSession.objects.get(pk=upload_id))
+        with self.assertRaises(uploads.UploadError) as caught:
+            uploads.complete(session)
+        self.assertEqual(caught.exception.status, 409)
+        self.assertEqual(MediaFile.objects.count(), 1)
+        response = self.client.post(reverse('upload-complete', args=[upload_id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_missing_part_file_of_known_content(self):
+        _, first = self.upload()
+        upload_id = self.start()
+        for start in range(0, len(self.content), 4):
+            self.put(upload_id, start, self.content[start:start + 4])
+        os.remove(os.path.join(self.media, 'tmp', f'{upload_id}.part'))
+        response = self.client.post(reverse('upload-complete', args=[upload_id]))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(MediaFile.objects.get(pk=response.data['id']).file, MediaFile.objects.get(pk=first.data['id']).file)
+
+    def test_chunks_keep_the_upload_fresh(self):
+        upload_id = self.start()
+        UploadSession.objects.filter(pk=upload_id).update(updated_at=timezone.now() - timedelta(days=2))
+        self.put(upload_id, 0, self.content[:4])
+        call_command('clear_stale_uploads', stdout=StringIO())
+        self.assertTrue(UploadSession.objects.filter(pk=upload_id).exists())
+
+    def test_rejects_oversized_chunk_and_incomplete_upload(self):
+        upload_id = self.start()
+        self.assertEqual(self.put(upload_id, 0, self.content[:5]).status_code, 413)
+        response = self.client.post(reverse('upload-complete', args=[upload_id]))
+        self.assertEqual(response.status_code, 409)
+
+    def test_requires_project_membership(self):
+        stranger = User.objects.create_user(username='stranger')
+        self.client.force_authenticate(stranger)
+        response = self.client.post(reverse('upload-start'), {'task': self.task.pk, 'filename': 'a', 'size': 1})
+        self.assertEqual(response.status_code, 403)
+        ProjectMember.objects.create(project=self.task.project, user=stranger)
+        self.start()
+
+
+class AsyncReadViewParityTests(TestCase):
+    """The async read views return what the sync ones do."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        member = User.objects.create_user(username='member')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        ProjectMember.objects.create(project=self.project, user=member)
+        self.task = Task.objects.create(description='Write', project=self.project, created_by=self.user)
+        Task.objects.create(description='Review', project=self.project, created_by=member)
+
+    def assertSameResponse(self, name, path, *args, authenticate=True, **headers):
+        from project import views as project_views, views_async as project_async
+        from task import views as task_views, views_async as task_async
+        from . import views as core_views, views_async as core_async
+
+        modules = [(project_views, project_async), (task_views, task_async), (core_views, core_async)]
+        sync_view, async_view = next(
+            (getattr(sync, name), getattr(aio, name))
+            for sync, aio in modules if hasattr(aio, name)
+        )
+        responses = []
+        for view in (sync_view, async_to_sync(async_view)):
+            request = APIRequestFactory().get(path, {'page_size': 1}, **headers)
+            if authenticate:
+                force_authenticate(request, self.user)
+            response = view(request, *args)
+            response.render()
+            responses.append(response)
+        sync_response, async_response = responses
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+        self.assertEqual(async_response.get('Link'), sync_response.get('Link'))
+        for header in ('ETag', 'Vary', 'Content-Type', 'WWW-Authenticate'):
+            self.assertEqual(async_response.get(header), sync_response.get(header))
+
+    def test_views_match(self):
+        self.assertSameResponse('project_list', '/api/projects/')
+        self.assertSameResponse('project', '/api/projects/1/', self.project.pk)
+        self.assertSameResponse('project', '/api/projects/0/', 0)
+        self.assertSameResponse('members_list', '/api/projects/1/members/', self.project.pk)
+        self.assertSameResponse('task_list', '/api/tasks/')
+        self.assertSameResponse('task_list', '/api/tasks/', self.project.pk)
+        self.assertSameResponse('task_detail', '/api/tasks/1', self.task.pk)
+        self.assertSameResponse('user_list', '/api/users/')
+
+    def test_errors_and_negotiation_match(self):
+        self.assertSameResponse('project_list', '/api/projects/', authenticate=False)
+        self.assertSameResponse('task_detail', '/api/tasks/1', self.task.pk, HTTP_ACCEPT='application/xml')
+
+
+@override_settings(REQUEST_PROFILING=True, REQUEST_PROFILING_SLOW_MS=10_000)
+class RequestProfilingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.client.force_authenticate(self.user)
+
+    def timings(self, response):
+        return {
+            part.split(';')[0].strip(): part
+            for part in response['Server-Timing'].split(',')
+        }
+
+    def test_server_timing_header(self):
+        Project.objects.create(title='Board', description='', created_by=self.user)
+        response = self.client.get(reverse('project-list'))
+        timings = self.timings(response)
+        self.assertEqual(set(timings), {'db', 'serialize', 'render', 'total'})
+        self.assertRegex(timings['db'], r'desc="[1-9]\d* queries"')
+
+    async def test_async_stack(self):
+        response = await self.async_client.get(reverse('users'))
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    def test_asgi_chain_needs_no_thread(self):
+        from django.core.handlers.asgi import ASGIHandler
+
+        # A sync-only middleware would be logged as adapted and put every request in a thread.
+        with self.assertNoLogs('django.request', 'DEBUG'):
+            ASGIHandler()
+
+    @override_settings(REQUEST_PROFILING_MAX_QUERIES=1)
+    def test_query_heavy_request_is_logged(self):
+        Project.objects.create(title='Board', description='', created_by=self.user)
+        with self.assertLogs('core.profiling', 'WARNING') as logs:
+            self.client.get(reverse('project-list'))
+        self.assertIn('GET /api/projects/ view=project-list status=200', logs.output[0])
+        self.assertIn('  slow  ', logs.output[0])
+
+    def test_repeated_statements_are_flagged(self):
+        from .middleware import QueryRecorder
+
+        recorder = QueryRecorder()
+        for sql in ['SELECT 1 WHERE id = %s'] * 3 + ['SELECT 2 WHERE id IN (%s)', 'SELECT 2 WHERE id IN (%s, %s)']:
+            recorder(lambda *args: None, sql, (), False, {})
+        self.assertEqual(recorder.duplicates(2), [
+            ('SELECT 1 WHERE id = %s', 3),
+            ('SELECT 2 WHERE id IN (...)', 2),
+        ])
+
+    @override_settings(REQUEST_PROFILING=False)
+    def test_disabled_middleware_is_skipped(self):
+        from django.core.exceptions import MiddlewareNotUsed
+        from .middleware import RequestProfilingMiddleware
+
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestProfilingMiddleware(lambda request: None)
+        response = self.client.get(reverse('users'))
+        self.assertNotIn('Server-Timing', response)
+
+
+class BenchmarkCoverageTests(TestCase):
+    def test_every_url_has_a_benchmark(self):
+        from benchmarks.endpoints import ENDPOINTS, SKIPPED
+        from benchmarks.run import url_names
+
+        covered = {endpoint.name for endpoint in ENDPOINTS} | set(SKIPPED)
+        self.assertEqual(url_names() - covered, set())
+
+    def test_budgets_cover_every_endpoint(self):
+        import json
+        from benchmarks.endpoints import ENDPOINTS
+        from benchmarks.run import BUDGETS_PATH
+
+        with open(BUDGETS_PATH) as f:
+            budgets = json.load(f)
+        self.assertEqual({endpoint.label for endpoint in ENDPOINTS} - set(budgets), set())
+
+
+@override_settings(DATABASE_REPLICA='replica', DATABASE_REPLICA_LAG=5, DATABASE_REPLICA_LAG_CHECK=3600)
+class ReplicaRoutingTests(SimpleTestCase):
+    # No test transaction here: reads inside one always go to the primary.
+    def setUp(self):
+        import time
+        from django.test import RequestFactory
+        from . import routers
+
+        self.routers = routers
+        self.router = routers.PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+        routers._lag[:] = [time.monotonic(), 0.0]
+        self.addCleanup(routers._lag.__setitem__, slice(None), [float('-inf'), 0.0])
+
+    def handle(self, request, write=False):
+        """Runs ``request`` through the middleware; returns the read alias before and after the view, and the response."""
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(Project))
+            if write:
+                self.router.db_for_write(Project)
+            seen.append(self.router.db_for_read(Project))
+            from django.http import HttpResponse
+            return HttpResponse()
+
+        response = self.routers.ReplicaRoutingMiddleware(view)(request)
+        return seen[0], seen[1], response
+
+    def test_safe_requests_read_from_the_replica(self):
+        before, after, response = self.handle(self.factory.get('/api/projects/'))
+        self.assertEqual((before, after), ('replica', 'replica'))
+        self.assertNotIn(self.routers.PIN_COOKIE, response.cookies)
+        self.assertEqual(self.router.db_for_write(Project), 'default')
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        before, after, response = self.handle(self.factory.post('/api/projects/add/'), write=True)
+        self.assertEqual((before, after), ('default', 'default'))
+        cookie = response.cookies[self.routers.PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], 5)
+
+        request = self.factory.get('/api/projects/')
+        request.COOKIES[self.routers.PIN_COOKIE] = cookie.value
+        self.assertEqual(self.handle(request)[0], 'default')
+
+        request.COOKIES[self.routers.PIN_COOKIE] = '1000'
+        self.assertEqual(self.handle(request)[0], 'replica')
+
+    def test_reads_after_a_write_in_the_same_request_use_the_primary(self):
+        before, after, response = self.handle(self.factory.get('/api/projects/'), write=True)
+        self.assertEqual((before, after), ('replica', 'default'))
+        self.assertIn(self.routers.PIN_COOKIE, response.cookies)
+
+    def test_lagging_replica_is_skipped(self):
+        self.routers._lag[1] = 30.0
+        self.assertEqual(self.handle(self.factory.get('/api/projects/'))[0], 'default')
+
+    def test_outside_requests_everything_uses_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Project), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'core'))
+        self.assertTrue(self.router.allow_migrate('default', 'core'))
+
+    @override_settings(DATABASE_REPLICA=None)
+    def test_middleware_is_skipped_without_a_replica(self):
+        from django.core.exceptions import MiddlewareNotUsed
+
+        with self.assertRaises(MiddlewareNotUsed):
+            self.routers.ReplicaRoutingMiddleware(lambda request: None)
+
+
+class ValuesSerializerParityTests(TestCase):
+    def test_user_list_matches_model_serializer(self):
+        from rest_framework.renderers import JSONRenderer
+        from .serializers import UserListValuesSerializer
+
+        User.objects.create_user(username='plain', first_name='Олена', bio='Про себе')
+        User.objects.create_user(username='pending', avatar='avatars/ab/abc.png', is_active=False)
+        User.objects.create_user(username='ready', avatar='avatars/cd/cde.png', avatar_thumbs='cde' * 16)
+        request = APIRequestFactory().get('/api/users/')
+        context = {'request': request}
+        queryset = User.objects.order_by('id')
+
+        for ctx in (context, {}):
+            expected = UserListSerializer(queryset, many=True, context=ctx).data
+            actual = UserListValuesSerializer(UserListValuesSerializer.values(queryset), many=True, context=ctx).data
+            self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_datetime_format_matches_drf(self):
+        from datetime import datetime, timezone as dt_timezone
+        from rest_framework.fields import DateTimeField
+        from .fast_serializers import datetime_repr
+
+        for value in (
+            datetime(2024, 5, 1, 12, 30, tzinfo=dt_timezone.utc),
+            datetime(2024, 5, 1, 12, 30, 0, 123456, tzinfo=dt_timezone.utc),
+            None,
+        ):
+            self.assertEqual(datetime_repr(value), DateTimeField().to_representation(value))
+
+
+class UserSparseFieldsTests(APITestCase):
+    def setUp(self):
+        for name in ('alice', 'alina', 'bob'):
+            User.objects.create_user(username=name, email=f'{name}@example.com', bio='Long bio')
+
+    def test_list_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('users'), {'fields': 'username'})
+        self.assertEqual(response.data, [{'username': 'bob'}, {'username': 'alina'}, {'username': 'alice'}])
+        self.assertNotIn('bio', context.captured_queries[-1]['sql'])
+
+    def test_search_fields(self):
+        response = self.client.get(reverse('users'), {'q': 'ali', 'fields': 'id,username'})
+        self.assertEqual(sorted(item['username'] for item in response.data), ['alice', 'alina'])
+        self.assertEqual(set(response.data[0]), {'id', 'username'})
+
+    def test_unknown_field(self):
+        self.assertEqual(self.client.get(reverse('users'), {'fields': 'password'}).status_code, 400)
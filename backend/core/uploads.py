@@ -0,0 +1,189 @@
+"""
+Chunked, resumable uploads for task media.
+
+Each ``UploadSession`` appends its chunks to ``<UPLOAD_TEMP_DIR>/<id>.part``.
+The SHA-256 is updated as chunks are written and kept in process memory;
+a worker that did not see the earlier chunks re-hashes the temp file once.
+On completion the temp file is moved (not copied) into media storage under
+its hash, or dropped if a ``MediaFile`` with the same content already exists.
+Memory per upload is bounded by ``READ_SIZE``.
+"""
+import hashlib
+import mimetypes
+import os
+import tempfile
+import threading
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import MediaFile, UploadSession
+
+READ_SIZE = 64 * 1024
+
+_hashes = {}
+_hashes_lock = threading.Lock()
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+def max_chunk_size():
+    return getattr(settings, 'UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024)
+
+
+def temp_dir():
+    path = getattr(settings, 'UPLOAD_TEMP_DIR', None) or os.path.join(
+        tempfile.gettempdir(), 'stuck-uploads'
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def temp_path(session):
+    return os.path.join(temp_dir(), f'{session.pk}.part')
+
+
+def _running_hash(session):
+    """The hash of the first ``session.offset`` bytes, from memory or the temp file."""
+    with _hashes_lock:
+        offset, digest = _hashes.pop(session.pk, (None, None))
+    if offset == session.offset:
+        return digest
+    digest = hashlib.sha256()
+    if session.offset:
+        with open(temp_path(session), 'rb') as file:
+            remaining = session.offset
+            while remaining:
+                block = file.read(min(READ_SIZE, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+    return digest
+
+
+def write_chunk(session, start, stream, length):
+    """
+    Appends ``length`` bytes from ``stream`` at ``start``, which must be the
+    current offset. Returns the new offset.
+    """
+    if start != session.offset:
+        raise UploadError('Chunk does not start at the current offset', 409, offset=session.offset)
+    if length <= 0 or length > max_chunk_size():
+        raise UploadError(f'Chunks must be 1 to {max_chunk_size()} bytes', 413)
+    if start + length > session.size:
+        raise UploadError('Chunk runs past the declared size', 400, offset=session.offset)
+
+    digest = _running_hash(session)
+    path = temp_path(session)
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as file:
+        file.seek(start)
+        file.truncate()
+        remaining = length
+        while remaining:
+            block = stream.read(min(READ_SIZE, remaining))
+            if not block:
+                break
+            file.write(block)
+            digest.update(block)
+            remaining -= len(block)
+    if remaining:
+        raise UploadError('Request body shorter than Content-Range', 400, offset=session.offset)
+
+    new_offset = start + length
+    # Optimistic: a concurrent chunk for the same offset loses here.
+    # updated_at is set by hand: update() skips auto_now, and clear_stale_uploads goes by it.
+    updated = UploadSession.objects.filter(pk=session.pk, offset=start).update(
+        offset=new_offset, updated_at=timezone.now()
+    )
+    if not updated:
+        raise UploadError('Upload changed concurrently', 409)
+    session.offset = new_offset
+    with _hashes_lock:
+        _hashes[session.pk] = (new_offset, digest)
+    return new_offset
+
+
+def media_name(digest, filename):
+    ext = os.path.splitext(filename)[1].lower()
+    return f'task_media/{digest[:2]}/{digest}{ext}'
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _store(path, name):
+    """Moves the temp file into storage; a rename when storage is on the same disk."""
+    try:
+        target = default_storage.path(name)
+    except NotImplementedError:
+        with open(path, 'rb') as file:
+            name = default_storage.save(name, File(file))
+        _remove(path)
+        return name
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    file_move_safe(path, target, allow_overwrite=True)
+    return name
+
+
+def complete(session):
+    """
+    Verifies the upload, stores it once per content and returns its ``MediaFile``.
+
+    The session row is claimed by deleting it, so of several concurrent or
+    repeated completions only one stores the file; the others get a 409.
+    """
+    if session.offset != session.size:
+        raise UploadError('Upload is incomplete', 409, offset=session.offset)
+    with transaction.atomic():
+        if not UploadSession.objects.filter(pk=session.pk, offset=session.size).delete()[0]:
+            raise UploadError('Upload is already completed', 409)
+        digest = _running_hash(session).hexdigest()
+        if session.sha256 and session.sha256.lower() != digest:
+            media = None
+        else:
+            media = _create_media(session, digest)
+    if media is None:
+        discard(session)
+        raise UploadError('Checksum mismatch, upload discarded', 422)
+    return media
+
+
+def _create_media(session, digest):
+    path = temp_path(session)
+    existing = MediaFile.objects.filter(sha256=digest).values_list('file', flat=True).first()
+    if existing and default_storage.exists(existing):
+        _remove(path)
+        name = existing
+    else:
+        name = _store(path, media_name(digest, session.filename))
+
+    mime, _ = mimetypes.guess_type(session.filename)
+    return MediaFile.objects.create(
+        file=name,
+        file_type='IMAGE' if mime and mime.startswith('image/') else 'FILE',
+        task_id=session.task_id,
+        uploaded_by_id=session.uploaded_by_id,
+        sha256=digest,
+        size=session.size,
+    )
+
+
+def discard(session):
+    with _hashes_lock:
+        _hashes.pop(session.pk, None)
+    _remove(temp_path(session))
+    session.delete()
@@ -4,7 +4,9 @@ from django.views.generic import TemplateView
 from django.conf import settings
 from django.conf.urls.static import static
 from .views import upload_avatar, current_user, user_list
-from . import views_auth
+from . import views_async, views_auth, views_uploads
+from .async_api import read_view
+from task import views as task_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -18,9 +20,16 @@ urlpatterns = [
     path('', TemplateView.as_view(template_name='index.html')),
     path('api/tasks/', include('task.urls')),
     path('api/projects/', include('project.urls')),
+    path('api/comments/', include('comment.urls')),
+    path('api/search/', include('search.urls')),
+    path('api/sync/', include('sync.urls')),
     path('api/user/avatar/', upload_avatar, name='avatar-upload'),
     path('api/user/me/', current_user, name='current_user'),
-    path('api/users/', user_list, name='users'),
+    path('api/me/dashboard/', task_views.dashboard, name='dashboard'),
+    path('api/users/', read_view(user_list, views_async.user_list), name='users'),
+    path('api/uploads/', views_uploads.upload_start, name='upload-start'),
+    path('api/uploads/<uuid:pk>/', views_uploads.upload_detail, name='upload-detail'),
+    path('api/uploads/<uuid:pk>/complete/', views_uploads.upload_complete, name='upload-complete'),
     re_path(r'^(?!api/|media/|assets/|static/).*$', TemplateView.as_view(template_name='index.html'), name='react_app')
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT) + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 if settings.DEBUG:
@@ -0,0 +1,136 @@
+"""
+Typeahead search over username, first/last name and email.
+
+SQLite keeps an external-content FTS5 table (``core_user_search``) in sync
+with ``core_user`` through triggers; PostgreSQL uses a ``pg_trgm`` GIN index
+on the concatenated, lower-cased columns. Both are created by migration
+``core.0004_user_search``.
+"""
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'core_user_search'
+SEARCH_COLUMNS = ('username', 'first_name', 'last_name', 'email')
+# bm25 weights per column: a username hit ranks above a name, a name above email.
+FTS_WEIGHTS = (10.0, 5.0, 5.0, 1.0)
+TRIGRAM_INDEX = 'core_user_search_trgm'
+TRIGRAM_EXPRESSION = (
+    "lower(username || ' ' || first_name || ' ' || last_name || ' ' || email)"
+)
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def _sqlite_forwards(cursor, user_table):
+    columns = ', '.join(SEARCH_COLUMNS)
+    new_values = ', '.join(f'new.{name}' for name in SEARCH_COLUMNS)
+    old_values = ', '.join(f'old.{name}' for name in SEARCH_COLUMNS)
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({columns}, "
+        f"content='{user_table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {user_table} BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {user_table} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {columns} ON {user_table} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _sqlite_backwards(cursor, user_table):
+    for suffix in ('ai', 'ad', 'au'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+    cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def create_index(schema_editor, user_table='core_user'):
+    with schema_editor.connection.cursor() as cursor:
+        if schema_editor.connection.vendor == 'sqlite':
+            _sqlite_forwards(cursor, user_table)
+        elif schema_editor.connection.vendor == 'postgresql':
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON {user_table} '
+                f'USING gin (({TRIGRAM_EXPRESSION}) gin_trgm_ops)'
+            )
+
+
+def drop_index(schema_editor, user_table='core_user'):
+    with schema_editor.connection.cursor() as cursor:
+        if schema_editor.connection.vendor == 'sqlite':
+            _sqlite_backwards(cursor, user_table)
+        elif schema_editor.connection.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+
+
+def _sqlite_ids(tokens, limit):
+    # Every token must match the start of a word in one of the columns.
+    match = ' '.join('"{}"*'.format(token.replace('"', '""')) for token in tokens)
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            f'ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s',
+            [match, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _postgresql_ids(query, limit, user_table):
+    term = query.lower()
+    pattern = '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    prefix = pattern[1:]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT id FROM {user_table} WHERE {TRIGRAM_EXPRESSION} LIKE %s '
+            f'ORDER BY lower(username) LIKE %s DESC, '
+            f'similarity(lower(username), %s) DESC, '
+            f'similarity({TRIGRAM_EXPRESSION}, %s) DESC, id '
+            f'LIMIT %s',
+            [pattern, prefix, term, term, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_users(query, limit=20, queryset=None):
+    """
+    Returns up to ``limit`` users matching ``query``, best match first.
+    ``queryset`` may be a ``values()`` queryset; the rows are then dicts.
+    """
+    User = get_user_model()
+    queryset = User.objects.all() if queryset is None else queryset
+    query = (query or '').strip()
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return []
+
+    if connection.vendor == 'sqlite':
+        ids = _sqlite_ids(tokens, limit)
+    elif connection.vendor == 'postgresql':
+        ids = _postgresql_ids(query, limit, User._meta.db_table)
+    else:
+        condition = Q()
+        for name in SEARCH_COLUMNS:
+            condition |= Q(**{f'{name}__istartswith': query})
+        return list(queryset.filter(condition).order_by('username')[:limit])
+
+    # Not in_bulk(): it refuses values() querysets.
+    users = {
+        user['id'] if isinstance(user, dict) else user.pk: user
+        for user in queryset.filter(pk__in=ids)
+    }
+    return [users[pk] for pk in ids if pk in users]
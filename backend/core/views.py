@@ -6,8 +6,11 @@ from django.views.decorators.http import require_http_methods
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from .avatars import store_avatar
 from .forms import UserAvatarForm
-from .serializers import UserSerializer, UserListSerializer
+from .serializers import UserSerializer, UserListValuesSerializer
+from .pagination import KeysetPagination
+from .user_search import search_users
 
 User = get_user_model()
 
@@ -18,7 +21,8 @@ def upload_avatar(request):
     user = request.user
     form = UserAvatarForm(request.POST, request.FILES, instance=user)
     if form.is_valid():
-        form.save()
+        # Мініатюри генеруються у фоні; поки їх немає, віддається оригінал
+        store_avatar(user, form.cleaned_data['avatar'])
         return JsonResponse({'success': True, 'avatar_url': user.avatar.url})
     else:
         return JsonResponse({'success': False, 'errors': form.errors}, status=400)
@@ -32,21 +36,38 @@ def current_user(request):
     )
     return Response(serializer.data)
 
+def search_params(request):
+    """``(query, limit)`` of a user search request; query is empty for plain listing."""
+    query = request.query_params.get('q') or request.query_params.get('username')
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+    except ValueError:
+        limit = 20
+    return query, limit
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def user_list(request):
-    queryset = User.objects.all().order_by('-date_joined')
+    queryset = User.objects.all()
+    serializer_class = UserListValuesSerializer.for_request(request)
     
-    # Фильтрация по username если есть параметр
-    username = request.query_params.get('username')
-    if username:
-        queryset = queryset.filter(username__icontains=username)
+    # Пошук по username, імені та email (ранжований, з лімітом)
+    query, limit = search_params(request)
+    if query:
+        serializer = serializer_class(
+            search_users(query, limit=limit, queryset=serializer_class.values(queryset, 'id')),
+            many=True,
+            context={'request': request}
+        )
+        return Response(serializer.data)
     
-    serializer = UserListSerializer(
-        queryset,
+    paginator = KeysetPagination(ordering=('-date_joined', '-id'))
+    page = paginator.paginate_queryset(serializer_class.values(queryset, *paginator.fields), request)
+    serializer = serializer_class(
+        page,
         many=True,
         context={'request': request}
     )
-    return Response(serializer.data)
+    return paginator.get_paginated_response(serializer.data)
 
 
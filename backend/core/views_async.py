@@ -0,0 +1,32 @@
+# core/views_async.py — async read views, routed when ASYNC_READ_VIEWS is on
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from .async_api import async_api_view
+from .pagination import KeysetPagination
+from .serializers import UserListValuesSerializer
+from .user_search import search_users
+from .views import search_params
+
+User = get_user_model()
+
+
+@async_api_view(permission_classes=[AllowAny])
+async def user_list(request):
+    queryset = User.objects.all()
+    serializer_class = UserListValuesSerializer.for_request(request)
+
+    query, limit = search_params(request)
+    if query:
+        users = await sync_to_async(search_users)(
+            query, limit=limit, queryset=serializer_class.values(queryset, 'id')
+        )
+        serializer = serializer_class(users, many=True, context={'request': request})
+        return Response(serializer.data)
+
+    paginator = KeysetPagination(ordering=('-date_joined', '-id'))
+    page = await paginator.apaginate_queryset(serializer_class.values(queryset, *paginator.fields), request)
+    serializer = serializer_class(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,116 @@
+# core/views_uploads.py
+
+import re
+from io import BytesIO
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from project.access import get_project_access
+from task.models import Task
+from .models import UploadSession
+from .uploads import UploadError, complete, discard, max_chunk_size, write_chunk
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+def _session_data(session):
+    return {
+        'id': str(session.pk),
+        'task': session.task_id,
+        'filename': session.filename,
+        'size': session.size,
+        'offset': session.offset,
+        'chunk_size': max_chunk_size(),
+    }
+
+
+def _error(exc):
+    return Response({'error': str(exc), **exc.extra}, status=exc.status)
+
+
+def _can_upload(user, task):
+    access = get_project_access(task.project_id)
+    return access is not None and (access.is_creator(user) or access.role_of(user) is not None)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_start(request):
+    data = request.data
+    try:
+        task = Task.objects.get(pk=data.get('task'))
+    except (Task.DoesNotExist, ValueError, TypeError):
+        return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
+    if not _can_upload(request.user, task):
+        return Response({'error': 'Not a member of this project'}, status=status.HTTP_403_FORBIDDEN)
+
+    filename = str(data.get('filename') or '').strip()
+    try:
+        size = int(data.get('size'))
+    except (TypeError, ValueError):
+        size = 0
+    if not filename or size <= 0:
+        return Response({'error': 'filename and a positive size are required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    session = UploadSession.objects.create(
+        task=task,
+        uploaded_by=request.user,
+        filename=filename[:255],
+        size=size,
+        sha256=str(data.get('sha256') or '').lower()[:64],
+    )
+    return Response(_session_data(session), status=status.HTTP_201_CREATED)
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def upload_detail(request, pk):
+    try:
+        session = UploadSession.objects.get(pk=pk, uploaded_by=request.user)
+    except UploadSession.DoesNotExist:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'GET':
+        # Клієнт продовжує завантаження з цього offset
+        return Response(_session_data(session))
+
+    if request.method == 'DELETE':
+        discard(session)
+        return Response({'success': True})
+
+    match = CONTENT_RANGE.match(request.headers.get('Content-Range', ''))
+    if not match:
+        return Response(
+            {'error': 'Content-Range: bytes <start>-<end>/<size> is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    start, end, total = (int(value) for value in match.groups())
+    if total != session.size or end < start:
+        return Response({'error': 'Invalid Content-Range'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        # Тіло читається потоком, не через request.data
+        write_chunk(session, start, request.stream or BytesIO(), end - start + 1)
+    except UploadError as exc:
+        return _error(exc)
+    return Response(_session_data(session))
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_complete(request, pk):
+    try:
+        session = UploadSession.objects.get(pk=pk, uploaded_by=request.user)
+    except UploadSession.DoesNotExist:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        media = complete(session)
+    except UploadError as exc:
+        return _error(exc)
+    return Response({
+        'id': media.pk,
+        'task': media.task_id,
+        'file': request.build_absolute_uri(media.file.url),
+        'file_type': media.file_type,
+        'sha256': media.sha256,
+        'size': media.size,
+    }, status=status.HTTP_201_CREATED)
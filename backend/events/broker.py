@@ -0,0 +1,214 @@
+"""
+In-process pub/sub for project change events.
+
+``LocalBroker`` fans events out to the subscribers of the current process and
+keeps the last ``EVENTS_BUFFER_SIZE`` events per project for ``Last-Event-ID``
+replay. ``DatabaseBroker`` writes events to ``ProjectEvent`` and has one
+polling thread per process feed the same local fan-out, so every worker sees
+every event. ``EVENTS_BROKER`` selects the class.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Event(NamedTuple):
+    id: int
+    project_id: int
+    type: str
+    data: dict
+
+    def encode(self):
+        data = json.dumps(self.data, cls=DjangoJSONEncoder)
+        return f'id: {self.id}\nevent: {self.type}\ndata: {data}\n\n'
+
+
+class Subscription:
+    """Queue of one SSE connection; ``None`` is queued when it fell behind."""
+
+    def __init__(self, project_id, maxsize):
+        self.project_id = project_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def push(self, event):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self.overflowed:
+            return
+        if self.queue.full():
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return
+        self.queue.put_nowait(event)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def buffer_size():
+    return _setting('EVENTS_BUFFER_SIZE', 200)
+
+
+class LocalBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffers = {}
+        self._subscribers = {}
+        # Microseconds since the epoch: ids stay increasing across restarts.
+        self._last_id = time.time_ns() // 1000
+
+    def publish(self, project_id, type, data):
+        with self._lock:
+            self._last_id += 1
+            event = Event(self._last_id, project_id, type, data)
+        self._deliver(event)
+        return event
+
+    def _deliver(self, event):
+        with self._lock:
+            buffer = self._buffers.get(event.project_id)
+            if buffer is None:
+                buffer = self._buffers[event.project_id] = deque(maxlen=buffer_size())
+            buffer.append(event)
+            subscribers = list(self._subscribers.get(event.project_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.push(event)
+            except RuntimeError:
+                # Its event loop is gone.
+                self.unsubscribe(subscription)
+
+    def subscribe(self, project_id):
+        """Must be called from the event loop that will read the subscription."""
+        subscription = Subscription(project_id, _setting('EVENTS_QUEUE_SIZE', 1000))
+        with self._lock:
+            self._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+
+    def replay(self, project_id, last_id):
+        """
+        Events of ``project_id`` after ``last_id``, or ``None`` when some of
+        them may already have been dropped and the client must refetch.
+        """
+        with self._lock:
+            buffer = list(self._buffers.get(project_id, ()))
+        if len(buffer) >= buffer_size() and buffer[0].id > last_id + 1:
+            return None
+        return [event for event in buffer if event.id > last_id]
+
+
+class DatabaseBroker(LocalBroker):
+    def __init__(self):
+        super().__init__()
+        self._poller = None
+        self._seen = None
+        self._last_prune = 0.0
+
+    def publish(self, project_id, type, data):
+        from .models import ProjectEvent
+
+        row = ProjectEvent.objects.create(project_id=project_id, type=type, data=data)
+        return Event(row.pk, project_id, row.type, row.data)
+
+    def subscribe(self, project_id):
+        subscription = super().subscribe(project_id)
+        with self._lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._run, name='events-poller', daemon=True)
+                self._poller.start()
+        return subscription
+
+    def replay(self, project_id, last_id):
+        from .models import ProjectEvent
+
+        oldest = ProjectEvent.objects.order_by('id').values_list('id', flat=True).first()
+        if oldest is not None and oldest > last_id + 1:
+            return None
+        rows = (
+            ProjectEvent.objects
+            .filter(project_id=project_id, id__gt=last_id)
+            .order_by('id')
+            .values_list('id', 'type', 'data')[:buffer_size() + 1]
+        )
+        events = [Event(pk, project_id, type, data) for pk, type, data in rows]
+        if len(events) > buffer_size():
+            return None
+        return events
+
+    def poll(self):
+        """Delivers new rows to local subscribers; returns how many were read."""
+        from .models import ProjectEvent
+
+        if self._seen is None:
+            self._seen = ProjectEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        rows = list(
+            ProjectEvent.objects.filter(id__gt=self._seen).order_by('id')
+            .values_list('id', 'project_id', 'type', 'data')[:500]
+        )
+        for row in rows:
+            self._deliver(Event(*row))
+            self._seen = row[0]
+
+        if time.monotonic() - self._last_prune > 60:
+            self._last_prune = time.monotonic()
+            retention = timedelta(seconds=_setting('EVENTS_RETENTION', 3600))
+            ProjectEvent.objects.filter(created_at__lt=timezone.now() - retention).delete()
+        return len(rows)
+
+    def _run(self):
+        while True:
+            try:
+                if self.poll() < 500:
+                    time.sleep(_setting('EVENTS_POLL_INTERVAL', 1.0))
+            except Exception:
+                logger.exception('Polling project events failed')
+                time.sleep(_setting('EVENTS_POLL_INTERVAL', 1.0))
+            finally:
+                close_old_connections()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(_setting('EVENTS_BROKER', 'events.broker.LocalBroker'))()
+        return _broker
+
+
+def reset_broker():
+    global _broker
+    with _broker_lock:
+        _broker = None
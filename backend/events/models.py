@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class ProjectEvent(models.Model):
+    """Outbox for ``events.broker.DatabaseBroker``; rows are pruned after a while."""
+    project_id = models.BigIntegerField()
+    type = models.CharField(max_length=50)
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project_id', 'id'], name='event_project_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.type} #{self.pk} (project {self.project_id})"
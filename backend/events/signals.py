@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from comment.models import Comment
+from project.models import Project, ProjectMember
+from task.models import Task
+from task.signals import tasks_bulk_saved
+
+from .broker import get_broker
+
+
+def publish(project_id, type, data):
+    """Publishes once the surrounding transaction commits."""
+    transaction.on_commit(lambda: get_broker().publish(project_id, type, data))
+
+
+def _task_data(task):
+    return {
+        'id': task.pk,
+        'status': task.status,
+        'assigned_to': task.assigned_to_id,
+        'due_date': task.due_date,
+    }
+
+
+def _task_saved(task, created):
+    previous = None if created else task.loaded_values
+    if previous and previous['project_id'] != task.project_id:
+        # Moved to another board: gone from the old one, new on this one.
+        publish(previous['project_id'], 'task.deleted', {'id': task.pk})
+        created = True
+    publish(task.project_id, 'task.created' if created else 'task.updated', _task_data(task))
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    _task_saved(instance, created)
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def tasks_bulk_changed(sender, created=(), updated=(), **kwargs):
+    for task in created:
+        _task_saved(task, True)
+    for task in updated:
+        _task_saved(task, False)
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    publish(instance.project_id, 'task.deleted', {'id': instance.pk})
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    publish(
+        instance.project_id,
+        'comment.created' if created else 'comment.updated',
+        {'id': instance.pk, 'author': instance.author_id},
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    publish(instance.project_id, 'comment.deleted', {'id': instance.pk})
+
+
+@receiver(post_save, sender=ProjectMember)
+def member_saved(sender, instance, created, **kwargs):
+    publish(
+        instance.project_id,
+        'member.added' if created else 'member.updated',
+        {'id': instance.pk, 'user': instance.user_id, 'role': instance.role},
+    )
+
+
+@receiver(post_delete, sender=ProjectMember)
+def member_removed(sender, instance, **kwargs):
+    publish(instance.project_id, 'member.removed', {'id': instance.pk, 'user': instance.user_id})
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, **kwargs):
+    if not created:
+        publish(instance.pk, 'project.updated', {'id': instance.pk, 'title': instance.title})
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    publish(instance.pk, 'project.deleted', {'id': instance.pk})
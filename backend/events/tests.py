@@ -0,0 +1,126 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import User
+from project.models import Project, ProjectMember
+from task.bulk import apply_operations
+from task.models import Task
+from .broker import DatabaseBroker, LocalBroker, get_broker, reset_broker
+
+
+async def next_chunk(stream, timeout=2):
+    chunk = await asyncio.wait_for(anext(stream), timeout)
+    return chunk.decode()
+
+
+class EventStreamTests(TestCase):
+    def setUp(self):
+        reset_broker()
+        self.addCleanup(reset_broker)
+        self.user = User.objects.create_user(username='owner')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        self.url = reverse('project-events', args=[self.project.pk])
+
+    def create_task(self, description='Write docs'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Task.objects.create(
+                description=description, project=self.project, created_by=self.user
+            )
+
+    async def open_stream(self, **headers):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await next_chunk(stream)).startswith('retry:'))
+        return stream
+
+    async def test_pushes_task_changes(self):
+        stream = await self.open_stream()
+        task = await sync_to_async(self.create_task)()
+        chunk = await next_chunk(stream)
+        self.assertIn('event: task.created', chunk)
+        self.assertIn(f'"id": {task.pk}', chunk)
+        await stream.aclose()
+
+    async def test_replays_after_last_event_id(self):
+        first = await sync_to_async(self.create_task)('First')
+        await sync_to_async(self.create_task)('Second')
+        events = get_broker().replay(self.project.pk, 0)
+        self.assertEqual(len(events), 2)
+
+        stream = await self.open_stream(last_event_id=str(events[0].id))
+        chunk = await next_chunk(stream)
+        self.assertIn(f'id: {events[1].id}', chunk)
+        self.assertNotIn(f'"id": {first.pk},', chunk)
+        await stream.aclose()
+
+    @override_settings(EVENTS_BUFFER_SIZE=2)
+    async def test_reset_when_history_is_gone(self):
+        for description in ('One', 'Two', 'Three'):
+            await sync_to_async(self.create_task)(description)
+        stream = await self.open_stream(last_event_id='1')
+        self.assertIn('event: reset', await next_chunk(stream))
+        await stream.aclose()
+
+    async def test_requires_membership(self):
+        stranger = await User.objects.acreate(username='stranger')
+        await self.async_client.aforce_login(stranger)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+        await self.async_client.alogout()
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_bulk_and_member_changes_are_published(self):
+        task = self.create_task()
+        member = User.objects.create_user(username='member')
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_operations([{'op': 'move', 'id': task.pk, 'status': 'DONE'}], self.user)
+            ProjectMember.objects.create(project=self.project, user=member)
+        types = [event.type for event in get_broker().replay(self.project.pk, 0)]
+        self.assertEqual(types, ['task.created', 'task.updated', 'member.added'])
+
+    def test_moved_task_leaves_old_board(self):
+        task = self.create_task()
+        other = Project.objects.create(title='Other', description='', created_by=self.user)
+        task.project = other
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+        self.assertEqual(get_broker().replay(self.project.pk, 0)[-1].type, 'task.deleted')
+        self.assertEqual(get_broker().replay(other.pk, 0)[-1].type, 'task.created')
+
+
+class BrokerTests(TestCase):
+    async def test_local_fan_out(self):
+        broker = LocalBroker()
+        first, second = broker.subscribe(1), broker.subscribe(1)
+        other = broker.subscribe(2)
+        event = broker.publish(1, 'task.updated', {'id': 5})
+        self.assertEqual(await asyncio.wait_for(first.get(), 1), event)
+        self.assertEqual(await asyncio.wait_for(second.get(), 1), event)
+        self.assertTrue(other.queue.empty())
+
+    @override_settings(EVENTS_QUEUE_SIZE=1)
+    async def test_slow_subscriber_gets_reset_marker(self):
+        broker = LocalBroker()
+        subscription = broker.subscribe(1)
+        broker.publish(1, 'a', {})
+        broker.publish(1, 'b', {})
+        await asyncio.sleep(0)
+        self.assertIsNone(await asyncio.wait_for(subscription.get(), 1))
+
+    async def test_database_broker_relays_between_processes(self):
+        publisher, receiver = DatabaseBroker(), DatabaseBroker()
+        # No poller thread in tests: poll by hand.
+        receiver._poller = object()
+        subscription = receiver.subscribe(7)
+        await sync_to_async(receiver.poll)()
+        event = await sync_to_async(publisher.publish)(7, 'comment.created', {'id': 1})
+        self.assertEqual(await sync_to_async(receiver.poll)(), 1)
+        self.assertEqual(await asyncio.wait_for(subscription.get(), 1), event)
+        self.assertEqual(await sync_to_async(receiver.replay)(7, event.id - 1), [event])
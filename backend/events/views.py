@@ -0,0 +1,70 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+
+from project.access import get_project_access
+from .broker import get_broker
+
+RESET = 'event: reset\ndata: {}\n\n'
+
+
+def _last_event_id(request):
+    # EventSource надсилає Last-Event-ID сам; параметр — для першого підключення
+    value = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def _stream(broker, subscription, backlog, last_id):
+    heartbeat = getattr(settings, 'EVENTS_HEARTBEAT', 15)
+    try:
+        yield f"retry: {getattr(settings, 'EVENTS_RETRY_MS', 3000)}\n\n"
+        if backlog is None:
+            yield RESET
+        else:
+            for event in backlog:
+                yield event.encode()
+                last_id = event.id
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            if event is None:
+                # Too slow to keep up; the client refetches and reconnects.
+                yield RESET
+                return
+            if event.id > last_id:
+                last_id = event.id
+                yield event.encode()
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def project_events(request, pk):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    access = await sync_to_async(get_project_access)(pk)
+    if access is None:
+        return JsonResponse({'error': 'Project not found'}, status=404)
+    if not access.is_creator(user) and access.role_of(user) is None:
+        return JsonResponse({'error': 'Not a member of this project'}, status=403)
+
+    broker = get_broker()
+    # Subscribe before replaying so nothing published in between is lost.
+    subscription = broker.subscribe(pk)
+    last_id = _last_event_id(request)
+    backlog = [] if last_id is None else await sync_to_async(broker.replay)(pk, last_id)
+
+    response = StreamingHttpResponse(
+        _stream(broker, subscription, backlog, last_id or 0), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
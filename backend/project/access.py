@@ -0,0 +1,69 @@
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.routers import PRIMARY
+
+from .models import Project, ProjectMember
+
+CACHE_KEY = 'project-access:{}'
+_MISSING = 'missing'
+
+
+class ProjectAccess(NamedTuple):
+    created_by_id: int
+    roles: dict
+
+    def role_of(self, user):
+        return self.roles.get(user.pk)
+
+    def is_creator(self, user):
+        return self.created_by_id == user.pk
+
+
+def get_project_access(project_id):
+    """
+    Returns the creator and ``{user_id: role}`` map of a project, or ``None``
+    if it does not exist. Served from the cache and invalidated by the
+    signals in ``project.signals``.
+    """
+    key = CACHE_KEY.format(project_id)
+    cached = cache.get(key)
+    if cached == _MISSING:
+        return None
+    if cached is not None:
+        return ProjectAccess(*cached)
+
+    # From the primary: a lagging replica would put stale roles in the cache
+    # right after project.signals invalidated it.
+    created_by_id = (
+        Project.objects.using(PRIMARY).filter(pk=project_id).values_list('created_by_id', flat=True).first()
+    )
+    timeout = getattr(settings, 'PROJECT_ACCESS_CACHE_TIMEOUT', 300)
+    if created_by_id is None:
+        cache.set(key, _MISSING, timeout)
+        return None
+
+    roles = dict(ProjectMember.objects.using(PRIMARY).filter(project_id=project_id).values_list('user_id', 'role'))
+    cache.set(key, (created_by_id, roles), timeout)
+    return ProjectAccess(created_by_id, roles)
+
+
+def get_role(user, project_id):
+    access = get_project_access(project_id)
+    if access is None or not user.is_authenticated:
+        return None
+    return access.role_of(user)
+
+
+def invalidate_project_access(project_id):
+    """
+    Drops the entry now, for the rest of this request, and again once the
+    change is committed: another request may have refilled it from the
+    rows as they were before the commit.
+    """
+    key = CACHE_KEY.format(project_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,34 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from project.models import Project
+from project.transfer import export_project, gzipped
+
+
+class Command(BaseCommand):
+    help = 'Writes a project with its members, tasks, comments and media references as NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('project', type=int)
+        parser.add_argument('--output', '-o', default='-', help='File to write, "-" for stdout.')
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip.')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not Project.objects.filter(pk=options['project']).exists():
+            raise CommandError(f'Project {options["project"]} does not exist.')
+        chunks = export_project(options['project'], options['chunk_size'])
+        if options['gzip']:
+            chunks = gzipped(chunks)
+
+        output = options['output']
+        target = sys.stdout.buffer if output == '-' else open(output, 'wb')
+        try:
+            for chunk in chunks:
+                target.write(chunk)
+        finally:
+            if output != '-':
+                target.close()
+        if output != '-':
+            self.stderr.write(self.style.SUCCESS(f'Project {options["project"]} exported to {output}.'))
@@ -0,0 +1,34 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from project.transfer import TransferError, import_project
+
+
+class Command(BaseCommand):
+    help = 'Creates a project from an NDJSON export (plain or gzipped).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Export file, "-" for stdin.')
+        parser.add_argument('--owner', help='Username of the new creator; defaults to the original one.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        owner = None
+        if options['owner']:
+            try:
+                owner = get_user_model().objects.get(username=options['owner'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'User {options["owner"]} does not exist.')
+
+        path = options['path']
+        source = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            project = import_project(source, owner=owner, batch_size=options['batch_size'])
+        except TransferError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if path != '-':
+                source.close()
+        self.stdout.write(self.style.SUCCESS(f'Imported as project {project.pk}.'))
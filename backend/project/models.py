@@ -1,6 +1,50 @@
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
 from core.models import User
 
+class ProjectQuerySet(models.QuerySet):
+    def with_member_counts(self, user=None):
+        """
+        Annotates ``members_total`` and ``current_user_role``, the role of
+        ``user`` (``None`` for anonymous users).
+        """
+        members_total = (
+            ProjectMember.objects
+            .filter(project=OuterRef('pk'))
+            .order_by()
+            .values('project')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        queryset = self.annotate(
+            members_total=Coalesce(
+                Subquery(members_total, output_field=IntegerField()),
+                Value(0),
+            )
+        )
+        if user is not None and user.is_authenticated:
+            return queryset.annotate(
+                current_user_role=Subquery(
+                    ProjectMember.objects
+                    .filter(project=OuterRef('pk'), user=user)
+                    .values('role')[:1]
+                )
+            )
+        return queryset.annotate(current_user_role=Value(None, output_field=models.CharField()))
+
+    def with_member_info(self, user=None):
+        """
+        ``with_member_counts`` plus memberships prefetched with their users,
+        so ``ProjectSerializer`` does not query per row.
+        """
+        return self.with_member_counts(user).select_related('created_by').prefetch_related(
+            Prefetch(
+                'projectmember_set',
+                queryset=ProjectMember.objects.select_related('user'),
+            )
+        )
+
 class Project(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -17,6 +61,13 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProjectQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_by', 'created_at'], name='project_creator_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -1,11 +1,21 @@
 from rest_framework import serializers
+from .access import get_role
 from .models import Project, ProjectMember, User
 from comment.models import Comment
+from comment.serializers import CommentValuesSerializer
+from core.fast_serializers import Expansion, LatestExpansion, ValuesSerializer
+from core.serializers import AvatarMixin, AvatarValuesMixin
+
+class UserSerializer(AvatarMixin, serializers.ModelSerializer):
+    avatar = serializers.SerializerMethodField()
+    avatars = serializers.SerializerMethodField()
 
-class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ['id', 'first_name', 'last_name', 'username', 'avatar']
+        fields = ['id', 'first_name', 'last_name', 'username', 'avatar', 'avatars']
+
+    def get_avatar(self, obj):
+        return self._avatar_url(obj)
 
 class ProjectMemberSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
@@ -15,6 +25,55 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
         model = ProjectMember
         fields = ['id', 'user', 'role']
 
+class UserValuesSerializer(AvatarValuesMixin, ValuesSerializer):
+    """``UserSerializer`` over ``values()`` rows."""
+    fields = (
+        ('id', 'id'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+        ('username', 'username'),
+        ('avatar', 'avatar', 'get_avatar_url'),
+        ('avatars', ('avatar', 'avatar_thumbs'), 'get_avatars'),
+    )
+
+MemberUserValuesSerializer = UserValuesSerializer.prefixed('user__')
+
+ROLE_LABELS = dict(ProjectMember.ROLE_CHOICES)
+
+class ProjectMemberValuesSerializer(ValuesSerializer):
+    """``ProjectMemberSerializer`` over ``values()`` rows."""
+    fields = (
+        ('id', 'id'),
+        ('user', MemberUserValuesSerializer),
+        ('role', 'role', lambda role: ROLE_LABELS.get(role, role)),
+    )
+
+class ProjectValuesSerializer(ValuesSerializer):
+    """
+    ``ProjectSerializer`` over rows of ``Project.objects.with_member_counts()``.
+    Members are an expansion, included unless the client picks ``fields``;
+    ``?expand=comments`` adds the newest ``?comments=N`` (3) comments.
+    """
+    fields = (
+        ('id', 'id'),
+        ('title', 'title'),
+        ('description', 'description'),
+        ('created_by', ('created_by__id', 'created_by__username'),
+         lambda pk, username: {'id': pk, 'username': username} if pk is not None else None),
+        ('created_at', 'created_at', 'datetime'),
+        ('updated_at', 'updated_at', 'datetime'),
+        ('user_role', 'current_user_role'),
+        ('members_count', 'members_total'),
+    )
+    expansions = {
+        'members': Expansion(ProjectMemberValuesSerializer, ProjectMember.objects.order_by('id'), 'id', 'project_id'),
+        'comments': LatestExpansion(
+            CommentValuesSerializer, Comment.objects.all(), 'id', 'project_id',
+            ordering=('-created_at', '-id'), limit=3, limit_param='comments',
+        ),
+    }
+    expand = ('members',)
+
 class ProjectSerializer(serializers.ModelSerializer):
     created_by = serializers.SerializerMethodField()
     user_role = serializers.SerializerMethodField()
@@ -46,14 +105,14 @@ class ProjectSerializer(serializers.ModelSerializer):
     def get_user_role(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            member = ProjectMember.objects.filter(
-                project=obj,
-                user=request.user
-            ).first()
-            return member.role if member else None
+            if hasattr(obj, 'current_user_role'):
+                return obj.current_user_role
+            return get_role(request.user, obj.pk)
         return None
 
     def get_members_count(self, obj):
+        if hasattr(obj, 'members_total'):
+            return obj.members_total
         return obj.members.count()
 
 class CommentSerializer(serializers.ModelSerializer):
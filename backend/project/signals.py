@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .access import invalidate_project_access
+from .models import Project, ProjectMember
+
+# Sent by ``project.transfer`` once a project has been imported with
+# bulk_create, which does not send post_save for its members, tasks and
+# comments.
+project_imported = Signal()
+
+
+@receiver([post_save, post_delete], sender=Project)
+def project_changed(sender, instance, **kwargs):
+    invalidate_project_access(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ProjectMember)
+def member_changed(sender, instance, **kwargs):
+    invalidate_project_access(instance.project_id)
+
+
+@receiver(project_imported, sender=Project)
+def imported(sender, project, **kwargs):
+    invalidate_project_access(project.pk)
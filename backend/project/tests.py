@@ -1,3 +1,580 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from core.models import User
+from .access import get_project_access, get_role
+from .models import Project, ProjectMember
+
+
+class ProjectListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.others = [
+            User.objects.create_user(username=f'member{i}')
+            for i in range(3)
+        ]
+        self.client.force_authenticate(self.user)
+
+    def create_projects(self, count):
+        for i in range(count):
+            project = Project.objects.create(
+                title=f'Project {i}',
+                description='',
+                created_by=self.user,
+            )
+            ProjectMember.objects.create(project=project, user=self.user, role='OWNER')
+            for other in self.others:
+                ProjectMember.objects.create(project=project, user=other, role='MEMBER')
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_project_list_query_count_is_constant(self):
+        url = reverse('project-list')
+        self.create_projects(2)
+        small, _ = self.count_queries(url)
+        self.create_projects(20)
+        large, response = self.count_queries(url)
+
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 3)
+        self.assertEqual(len(response.data), 22)
+
+    def test_project_list_payload(self):
+        self.create_projects(1)
+        response = self.client.get(reverse('project-list'))
+
+        item = response.data[0]
+        self.assertEqual(item['user_role'], 'OWNER')
+        self.assertEqual(item['members_count'], 4)
+        self.assertEqual(len(item['members']), 4)
+        self.assertEqual(item['created_by'], {'id': self.user.id, 'username': 'owner'})
+
+    def test_project_list_includes_projects_user_is_member_of(self):
+        project = Project.objects.create(
+            title='Foreign', description='', created_by=self.others[0]
+        )
+        ProjectMember.objects.create(project=project, user=self.user, role='ADMIN')
+        ProjectMember.objects.create(project=project, user=self.others[1], role='MEMBER')
+
+        response = self.client.get(reverse('project-list'))
+
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['user_role'], 'ADMIN')
+        self.assertEqual(response.data[0]['members_count'], 2)
+
+    def test_project_detail_query_count(self):
+        self.create_projects(1)
+        project = Project.objects.get()
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('project', args=[project.pk]))
+        self.assertEqual(response.data['user_role'], 'OWNER')
+        self.assertEqual(response.data['members_count'], 4)
+
+    def test_members_list_query_count(self):
+        self.create_projects(1)
+        project = Project.objects.get()
+        url = reverse('members-list', args=[project.pk])
+        self.client.get(url)
+        # Validator aggregate + members; the project lookup is cached.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data), 4)
+
+
+class ProjectConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.other = User.objects.create_user(username='other')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        ProjectMember.objects.create(project=self.project, user=self.user, role='OWNER')
+        self.client.force_authenticate(self.user)
+
+    def test_unchanged_project_is_not_modified(self):
+        url = reverse('project', args=[self.project.pk])
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_project_etag_changes_on_edit_and_membership(self):
+        url = reverse('project', args=[self.project.pk])
+        first = self.client.get(url)['ETag']
+
+        member = ProjectMember.objects.create(project=self.project, user=self.other)
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first)
+        self.assertEqual(second.status_code, 200)
+
+        member.delete()
+        third = self.client.get(url, HTTP_IF_NONE_MATCH=second['ETag'])
+        self.assertEqual(third.status_code, 200)
+
+        self.project.title = 'Renamed'
+        self.project.save()
+        fourth = self.client.get(url, HTTP_IF_NONE_MATCH=third['ETag'])
+        self.assertEqual(fourth.status_code, 200)
+        self.assertEqual(fourth.data['title'], 'Renamed')
+
+    def test_project_etag_follows_the_creator_username(self):
+        url = reverse('project', args=[self.project.pk])
+        etag = self.client.get(url)['ETag']
+        User.objects.filter(pk=self.user.pk).update(username='renamed')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created_by']['username'], 'renamed')
+
+    def test_project_etag_depends_on_user(self):
+        url = reverse('project', args=[self.project.pk])
+        etag = self.client.get(url)['ETag']
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_expansions_named_in_fields_skip_the_etag(self):
+        url = reverse('project', args=[self.project.pk])
+        self.assertIn('ETag', self.client.get(url, {'fields': 'id,members'}))
+        self.assertNotIn('ETag', self.client.get(url, {'fields': 'title,comments'}))
+        self.assertNotIn('ETag', self.client.get(url, {'expand': 'comments'}))
+
+    def test_members_list_not_modified_until_membership_changes(self):
+        url = reverse('members-list', args=[self.project.pk])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        ProjectMember.objects.create(project=self.project, user=self.other)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_members_etag_follows_roles_and_profiles(self):
+        url = reverse('members-list', args=[self.project.pk])
+        member = ProjectMember.objects.create(project=self.project, user=self.other, role='MEMBER')
+        etag = self.client.get(url)['ETag']
+
+        member.role = 'ADMIN'
+        member.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[1]['role'], 'Admin')
+
+        self.other.first_name = 'Olena'
+        self.other.save()
+        project_etag = self.client.get(reverse('project', args=[self.project.pk]))['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+        User.objects.filter(pk=self.other.pk).update(avatar='avatars/ab/abc.png')
+        response = self.client.get(reverse('project', args=[self.project.pk]), HTTP_IF_NONE_MATCH=project_etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_project_is_404(self):
+        response = self.client.get(reverse('project', args=[0]), HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, 404)
+
+
+class ProjectAccessCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner')
+        self.member = User.objects.create_user(username='member')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.owner)
+        self.membership = ProjectMember.objects.create(
+            project=self.project, user=self.member, role='ADMIN'
+        )
+
+    def test_role_is_served_from_cache_after_warm_up(self):
+        self.assertEqual(get_role(self.member, self.project.pk), 'ADMIN')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_role(self.member, self.project.pk), 'ADMIN')
+            self.assertIsNone(get_role(self.owner, self.project.pk))
+            self.assertTrue(get_project_access(self.project.pk).is_creator(self.owner))
+
+    def test_membership_changes_invalidate(self):
+        get_role(self.member, self.project.pk)
+        self.membership.role = 'MEMBER'
+        self.membership.save()
+        self.assertEqual(get_role(self.member, self.project.pk), 'MEMBER')
+
+        self.membership.delete()
+        self.assertIsNone(get_role(self.member, self.project.pk))
+
+    def test_entry_refilled_before_commit_is_dropped_on_commit(self):
+        from .access import CACHE_KEY
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.membership.role = 'MEMBER'
+            self.membership.save()
+            # Як інший запит, що ще бачить рядки до коміту
+            cache.set(CACHE_KEY.format(self.project.pk), (self.owner.pk, {self.member.pk: 'ADMIN'}))
+        self.assertEqual(get_role(self.member, self.project.pk), 'MEMBER')
+
+    def test_project_changes_invalidate(self):
+        get_project_access(self.project.pk)
+        self.project.created_by = self.member
+        self.project.save()
+        self.assertTrue(get_project_access(self.project.pk).is_creator(self.member))
+
+        pk = self.project.pk
+        self.project.delete()
+        self.assertIsNone(get_project_access(pk))
+
+    def test_forbidden_edit_costs_no_queries_when_warm(self):
+        self.client.force_authenticate(self.member)
+        url = reverse('project-edit', args=[self.project.pk])
+        self.client.put(url, {'title': 'x'})
+        with self.assertNumQueries(0):
+            response = self.client.put(url, {'title': 'x'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_owner_can_edit_and_delete(self):
+        self.client.force_authenticate(self.owner)
+        response = self.client.put(reverse('project-edit', args=[self.project.pk]), {'title': 'New'})
+        self.assertEqual(response.status_code, 200)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.title, 'New')
+
+        response = self.client.delete(reverse('project-delete', args=[self.project.pk]))
+        self.assertEqual(response.status_code, 200)
+        response = self.client.delete(reverse('project-delete', args=[self.project.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_members_add_rejects_existing_member(self):
+        self.client.force_authenticate(self.owner)
+        url = reverse('members-add', args=[self.project.pk])
+        response = self.client.post(url, {'user': self.member.pk, 'role': 'MEMBER'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(url, {'user': self.owner.pk, 'role': 'OWNER'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 2)
+
+
+class ProjectTransferTests(APITestCase):
+    def setUp(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from comment.models import Comment
+        from core.models import MediaFile
+        from task.models import Task
+
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.member = User.objects.create_user(username='member', email='member@example.com')
+        self.importer = User.objects.create_user(username='importer', email='importer@example.com')
+        self.project = Project.objects.create(title='Roadmap', description='Q3', created_by=self.owner)
+        ProjectMember.objects.create(project=self.project, user=self.owner, role='OWNER')
+        ProjectMember.objects.create(project=self.project, user=self.member, role='MEMBER')
+        self.tasks = [
+            Task.objects.create(
+                project=self.project, description=f'Task {i}', created_by=self.owner,
+                assigned_to=self.member if i % 2 else None, status='DONE' if i == 4 else 'TODO',
+                due_date=timezone.now() + timedelta(days=i),
+            )
+            for i in range(5)
+        ]
+        for task in self.tasks[1::2]:
+            MediaFile.objects.create(
+                task=task, uploaded_by=self.member, file=f'task_media/{task.pk}.txt',
+                file_type='FILE', sha256=f'{task.pk:064d}', size=3,
+            )
+        for i in range(3):
+            Comment.objects.create(project=self.project, author=self.member, text=f'Comment {i}')
+        self.long_ago = timezone.now() - timedelta(days=400)
+        Task.objects.filter(pk=self.tasks[0].pk).update(created_at=self.long_ago)
+
+    def export(self, **params):
+        self.client.force_authenticate(self.owner)
+        response = self.client.get(reverse('project-export', args=[self.project.pk]), params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def import_(self, body, content_type='application/x-ndjson'):
+        self.client.force_authenticate(self.importer)
+        return self.client.generic('POST', reverse('project-import'), body, content_type=content_type)
+
+    def assert_copied(self, project_id, matched=True):
+        from task.counters import board_summary
+
+        copy = Project.objects.get(pk=project_id)
+        self.assertEqual((copy.title, copy.created_by), ('Roadmap', self.importer))
+        member = self.member if matched else self.importer
+        self.assertEqual(
+            list(copy.tasks.order_by('id').values_list('description', 'assigned_to', 'status', 'due_date')),
+            [(t.description, t.assigned_to_id and member.pk, t.status, t.due_date) for t in self.tasks],
+        )
+        self.assertEqual(copy.tasks.order_by('id').first().created_at, self.long_ago)
+        self.assertEqual(
+            sorted(copy.tasks.filter(media_files__isnull=False).values_list('description', 'media_files__file')),
+            [(t.description, f'task_media/{t.pk}.txt') for t in self.tasks[1::2]] if matched else [],
+        )
+        self.assertEqual(copy.comments.filter(author=member).count(), 3)
+        self.assertEqual(
+            dict(copy.projectmember_set.values_list('user', 'role')),
+            {self.owner.pk: 'OWNER', self.member.pk: 'MEMBER'} if matched else {self.importer.pk: 'OWNER'},
+        )
+        self.assertEqual(board_summary(copy.pk)['statuses']['DONE'], 1)
+        return copy
+
+    def test_export_import_round_trip(self):
+        body = self.export()
+        lines = body.decode().splitlines()
+        self.assertIn('"type": "header"', lines[0])
+        self.assertIn('"type": "end"', lines[-1])
+
+        response = self.import_(body)
+        self.assertEqual(response.status_code, 201)
+        copy = self.assert_copied(response.data['id'], matched=False)
+
+        from search.index import search
+        self.assertEqual(
+            {hit['project'] for hit in search('Roadmap', self.importer)}, {copy.pk}
+        )
+
+    def test_gzip_export_import(self):
+        body = self.export(compress='gzip')
+        self.assertEqual(body[:2], b'\x1f\x8b')
+        response = self.import_(body, content_type='application/gzip')
+        self.assertEqual(response.status_code, 201)
+        self.assert_copied(response.data['id'], matched=False)
+
+    def test_small_chunks_keep_media_with_their_tasks(self):
+        from io import BytesIO
+        from .transfer import export_project, import_project
+
+        body = b''.join(export_project(self.project.pk, chunk_size=2))
+        copy = import_project(BytesIO(body), owner=self.importer, batch_size=2)
+        self.assert_copied(copy.pk)
+
+    def test_import_does_not_act_for_other_users(self):
+        users = User.objects.count()
+        response = self.import_(self.export())
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(User.objects.count(), users)
+        self.assertFalse(ProjectMember.objects.filter(project_id=response.data['id'], user=self.owner).exists())
+        self.assertIsNone(get_role(self.member, response.data['id']))
+
+    def test_import_does_not_reference_files_it_did_not_ship(self):
+        from core.models import MediaFile
+        from task.models import Task
+
+        secret = Project.objects.create(title='Private', description='', created_by=self.owner)
+        private = MediaFile.objects.create(
+            task=Task.objects.create(project=secret, description='Payroll', created_by=self.owner),
+            uploaded_by=self.owner, file='task_media/payroll.pdf', file_type='FILE', sha256='f' * 64, size=3,
+        )
+        body = self.export().replace(f'task_media/{self.tasks[3].pk}.txt'.encode(), b'task_media/payroll.pdf')
+        body = body.replace(f'"sha256": "{self.tasks[1].pk:064d}"'.encode(), f'"sha256": "{private.sha256}"'.encode())
+        response = self.import_(body)
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(MediaFile.objects.filter(task__project_id=response.data['id']).exists())
+        self.assertEqual(MediaFile.objects.filter(file=private.file).count(), 1)
+
+    def test_staff_import_matches_users(self):
+        self.importer.is_staff = True
+        self.importer.save()
+        response = self.import_(self.export())
+        self.assertEqual(response.status_code, 201)
+        self.assert_copied(response.data['id'])
+
+    def test_missing_users_are_created_without_password(self):
+        self.importer.is_staff = True
+        self.importer.save()
+        body = self.export().replace(b'member@example.com', b'newcomer@example.com')
+        body = body.replace(b'"username": "member"', b'"username": "newcomer"')
+        response = self.import_(body)
+        self.assertEqual(response.status_code, 201)
+        newcomer = User.objects.get(username='newcomer')
+        self.assertFalse(newcomer.has_usable_password())
+        self.assertEqual(Project.objects.get(pk=response.data['id']).comments.filter(author=newcomer).count(), 3)
+
+    def test_truncated_export_leaves_nothing_behind(self):
+        body = self.export()
+        projects = Project.objects.count()
+        response = self.import_(body[:len(body) // 2].rsplit(b'\n', 1)[0] + b'\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('incomplete', response.data['error'])
+        self.assertEqual(Project.objects.count(), projects)
+
+        response = self.import_(b'{"type": "header", "version": 1}\n{"type": "task", "id": 1}\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data['error'].startswith('Line 2:'))
+
+    def test_records_the_database_rejects_are_bad_requests(self):
+        import json
+
+        self.importer.is_staff = True
+        self.importer.save()
+        lines = self.export().decode().splitlines()
+        projects = Project.objects.count()
+
+        def without(**changes):
+            out = []
+            for line in lines:
+                record = json.loads(line)
+                out.append(json.dumps({**record, **changes.get(record['type'], {})}))
+            return ('\n'.join(out) + '\n').encode()
+
+        newcomer = {'username': 'newcomer', 'email': ''}
+        members = [json.loads(line) for line in lines if '"type": "member"' in line]
+        cases = [
+            without(user=newcomer),
+            without(task={'description': None}),
+            without(comment={'text': None}),
+            without(member={'user': members[0]['user']}),
+        ]
+        for body in cases:
+            response = self.import_(body)
+            self.assertEqual(response.status_code, 400, response.data)
+            self.assertTrue(response.data['error'].startswith('Line '))
+        self.assertEqual(Project.objects.count(), projects)
+        self.assertFalse(User.objects.filter(username='newcomer').exists())
+
+    def test_only_owners_and_admins_can_export(self):
+        self.client.force_authenticate(self.member)
+        response = self.client.get(reverse('project-export', args=[self.project.pk]))
+        self.assertEqual(response.status_code, 403)
+
+
+class MemberValuesSerializerParityTests(APITestCase):
+    def test_matches_model_serializer(self):
+        from rest_framework.renderers import JSONRenderer
+        from .serializers import ProjectMemberSerializer, ProjectMemberValuesSerializer
+
+        owner = User.objects.create_user(username='owner', avatar='avatars/ab/abc.png', avatar_thumbs='abc' * 16)
+        other = User.objects.create_user(username='other', first_name='Іван', avatar='avatars/cd/cde.png')
+        project = Project.objects.create(title='P', description='', created_by=owner)
+        ProjectMember.objects.create(project=project, user=owner, role='OWNER')
+        ProjectMember.objects.create(project=project, user=other, role='MEMBER')
+        members = ProjectMember.objects.filter(project=project).order_by('id')
+
+        expected = ProjectMemberSerializer(members.select_related('user'), many=True).data
+        actual = ProjectMemberValuesSerializer(ProjectMemberValuesSerializer.values(members), many=True).data
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+
+class ProjectSparseFieldsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.other = User.objects.create_user(username='other')
+        self.client.force_authenticate(self.user)
+        self.projects = []
+        for i in range(3):
+            project = Project.objects.create(title=f'Project {i}', description='Long text', created_by=self.user)
+            ProjectMember.objects.create(project=project, user=self.user, role='OWNER')
+            ProjectMember.objects.create(project=project, user=self.other, role='MEMBER')
+            self.projects.append(project)
+
+    def test_default_output_matches_model_serializer(self):
+        from comment.models import Comment
+        from rest_framework.renderers import JSONRenderer
+        from rest_framework.test import APIRequestFactory
+        from .serializers import ProjectSerializer
+
+        Comment.objects.create(project=self.projects[0], author=self.other, text='Hi')
+        request = APIRequestFactory().get('/')
+        request.user = self.user
+        context = {'request': request}
+        expected = ProjectSerializer(
+            Project.objects.with_member_info(self.user).order_by('id'), many=True, context=context
+        ).data
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(JSONRenderer().render(response.data), JSONRenderer().render(expected))
+
+    def test_fields_limit_output_and_columns(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('project-list'), {'fields': 'id,title'})
+        self.assertEqual(response.data[0], {'id': self.projects[0].id, 'title': 'Project 0'})
+        # No members query and no member subqueries or descriptions in the page query.
+        self.assertEqual(len(context.captured_queries), 1)
+        sql = context.captured_queries[0]['sql']
+        self.assertNotIn('description', sql)
+        self.assertNotIn('members_total', sql)
+        self.assertNotIn('current_user_role', sql)
+
+    def test_expand_comments_costs_one_query(self):
+        from comment.models import Comment
+
+        for project in self.projects:
+            Comment.objects.create(project=project, author=self.other, text=f'On {project.title}')
+        url = reverse('project-list')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'fields': 'id', 'expand': 'comments'})
+        self.assertEqual(len(context.captured_queries), 2)
+        self.assertEqual(response.data[1]['comments'][0]['text'], 'On Project 1')
+        self.assertEqual(response.data[1]['comments'][0]['author']['username'], 'other')
+        self.assertEqual(set(response.data[1]), {'id', 'comments'})
+
+        for project in self.projects:
+            Comment.objects.create(project=project, author=self.user, text='More')
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url, {'fields': 'id', 'expand': 'comments'})
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def test_detail_fields_and_expand(self):
+        response = self.client.get(
+            reverse('project', args=[self.projects[0].pk]), {'fields': 'title,members_count'}
+        )
+        self.assertEqual(response.data, {'title': 'Project 0', 'members_count': 2})
+
+        response = self.client.get(reverse('project', args=[self.projects[0].pk]), {'expand': 'comments'})
+        self.assertEqual(len(response.data['members']), 2)
+        self.assertEqual(response.data['comments'], [])
+        self.assertNotIn('ETag', response)
+
+    def test_members_fields(self):
+        response = self.client.get(reverse('members-list', args=[self.projects[0].pk]), {'fields': 'role'})
+        self.assertEqual(response.data, [{'role': 'Owner'}, {'role': 'Member'}])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse('project-list'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+
+
+class LatestCommentsTests(APITestCase):
+    def setUp(self):
+        from comment.models import Comment
+
+        self.user = User.objects.create_user(username='owner')
+        self.client.force_authenticate(self.user)
+        self.projects = [
+            Project.objects.create(title=f'Project {i}', description='', created_by=self.user)
+            for i in range(3)
+        ]
+        for project in self.projects:
+            for i in range(5):
+                Comment.objects.create(project=project, author=self.user, text=f'{project.title} #{i}')
+
+    def test_newest_comments_per_project_in_one_query(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('project-list'), {'fields': 'id', 'expand': 'comments'})
+        self.assertEqual(len(context.captured_queries), 2)
+        self.assertIn('ROW_NUMBER()', context.captured_queries[1]['sql'])
+        for item, project in zip(response.data, self.projects):
+            self.assertEqual(
+                [comment['text'] for comment in item['comments']],
+                [f'{project.title} #{i}' for i in (4, 3, 2)],
+            )
+
+    def test_comment_count_parameter(self):
+        params = {'fields': 'id', 'expand': 'comments'}
+        response = self.client.get(reverse('project-list'), {**params, 'comments': '1'})
+        self.assertEqual([len(item['comments']) for item in response.data], [1, 1, 1])
+        response = self.client.get(reverse('project-list'), {**params, 'comments': '1000'})
+        self.assertEqual([len(item['comments']) for item in response.data], [5, 5, 5])
+
+    def test_comment_history_is_keyset_paginated(self):
+        url = reverse('comments-list', args=[self.projects[0].pk])
+        texts = []
+        response = self.client.get(url, {'page_size': 2})
+        while True:
+            texts += [comment['text'] for comment in response.data]
+            link = response.get('Link')
+            if not link:
+                break
+            response = self.client.get(link[1:link.index('>')])
+        self.assertEqual(texts, [f'Project 0 #{i}' for i in range(4, -1, -1)])
+
+    def test_comment_history_of_missing_project(self):
+        self.assertEqual(self.client.get(reverse('comments-list', args=[999])).status_code, 404)
@@ -0,0 +1,438 @@
+"""
+Project export/import as NDJSON, one record per line:
+
+    {"type": "header", "version": 1, "project": 12, "exported_at": "..."}
+    {"type": "user", "id": 3, "username": "...", "email": "...", ...}
+    {"type": "project", "id": 12, "title": "...", "created_by": 3, ...}
+    {"type": "member", "user": 3, "role": "OWNER", ...}
+    {"type": "task", "id": 40, "created_by": 3, "assigned_to": null, ...}
+    {"type": "media", "task": 40, "file": "task_media/...", ...}
+    {"type": "comment", "author": 3, "text": "...", ...}
+    {"type": "end", "counts": {"user": 1, "task": 1, ...}}
+
+Both sides work in chunks, so memory does not grow with the project. Media
+records follow the chunk of tasks they belong to; the importer only keeps
+the id map of the current chunk of tasks, plus the map of users. Media
+records carry the stored file name, the files themselves are not copied.
+"""
+import gzip
+import io
+import json
+import zlib
+from datetime import date, datetime
+
+from django.contrib.auth import get_user_model
+from django.db import DataError, IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from comment.models import Comment
+from core.models import MediaFile
+from task.models import Task
+from .models import Project, ProjectMember
+from .signals import project_imported
+
+VERSION = 1
+GZIP_MAGIC = b'\x1f\x8b'
+
+USER_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name')
+PROJECT_FIELDS = ('id', 'title', 'description', 'created_by_id', 'created_at', 'updated_at')
+MEMBER_FIELDS = ('user_id', 'role', 'joined_at')
+TASK_FIELDS = (
+    'id', 'description', 'created_by_id', 'assigned_to_id', 'status', 'due_date',
+    'created_at', 'updated_at',
+)
+MEDIA_FIELDS = ('task_id', 'file', 'file_type', 'sha256', 'size', 'uploaded_by_id', 'uploaded_at')
+COMMENT_FIELDS = ('author_id', 'text', 'created_at', 'updated_at')
+
+
+class TransferError(ValueError):
+    pass
+
+
+def _default(value):
+    # Повний isoformat: DjangoJSONEncoder обрізає мікросекунди
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _record(type, values):
+    data = {'type': type}
+    for name, value in values.items():
+        data[name[:-3] if name.endswith('_id') else name] = value
+    return json.dumps(data, default=_default, ensure_ascii=False).encode() + b'\n'
+
+
+def _chunks(queryset, fields, chunk_size):
+    """Rows of ``queryset`` as dicts, read ``chunk_size`` at a time by primary key."""
+    last = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last).order_by('pk').values('pk', *fields)[:chunk_size])
+        if not rows:
+            return
+        last = rows[-1]['pk']
+        for row in rows:
+            del row['pk']
+        yield rows
+
+
+def export_project(project_id, chunk_size=1000):
+    """
+    Yields the export of a project as NDJSON bytes, one chunk of records at
+    a time. Raises ``Project.DoesNotExist`` for an unknown project.
+    """
+    project = Project.objects.values(*PROJECT_FIELDS).get(pk=project_id)
+    counts = dict.fromkeys(('user', 'member', 'task', 'media', 'comment'), 0)
+    yield _record('header', {
+        'version': VERSION, 'project': project_id, 'exported_at': timezone.now(),
+    })
+
+    tasks = Task.objects.filter(project_id=project_id)
+    users = get_user_model().objects.filter(
+        Q(pk=project['created_by_id'])
+        | Q(pk__in=ProjectMember.objects.filter(project_id=project_id).values('user_id'))
+        | Q(pk__in=tasks.values('created_by_id'))
+        | Q(pk__in=tasks.filter(assigned_to__isnull=False).values('assigned_to_id'))
+        | Q(pk__in=Comment.objects.filter(project_id=project_id).values('author_id'))
+        | Q(pk__in=MediaFile.objects.filter(task__project_id=project_id).values('uploaded_by_id'))
+    )
+    for rows in _chunks(users, USER_FIELDS, chunk_size):
+        counts['user'] += len(rows)
+        yield b''.join(_record('user', row) for row in rows)
+
+    yield _record('project', project)
+
+    members = ProjectMember.objects.filter(project_id=project_id)
+    for rows in _chunks(members, MEMBER_FIELDS, chunk_size):
+        counts['member'] += len(rows)
+        yield b''.join(_record('member', row) for row in rows)
+
+    for rows in _chunks(tasks, TASK_FIELDS, chunk_size):
+        counts['task'] += len(rows)
+        media = list(
+            MediaFile.objects
+            .filter(task_id__in=[row['id'] for row in rows])
+            .order_by('pk')
+            .values(*MEDIA_FIELDS)
+        )
+        counts['media'] += len(media)
+        yield b''.join(
+            [_record('task', row) for row in rows] + [_record('media', row) for row in media]
+        )
+
+    comments = Comment.objects.filter(project_id=project_id)
+    for rows in _chunks(comments, COMMENT_FIELDS, chunk_size):
+        counts['comment'] += len(rows)
+        yield b''.join(_record('comment', row) for row in rows)
+
+    yield _record('end', {'counts': counts})
+
+
+def gzipped(chunks, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _Rewound(io.RawIOBase):
+    """Puts bytes already read from ``stream`` back in front of it."""
+
+    def __init__(self, head, stream):
+        self.head = head
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.head:
+            size = min(len(buffer), len(self.head))
+            buffer[:size], self.head = self.head[:size], self.head[size:]
+            return size
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_export(stream):
+    """Wraps a binary stream, plain or gzipped, so it can be read line by line."""
+    head = stream.read(2)
+    reader = io.BufferedReader(_Rewound(head, stream))
+    if head == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=reader)
+    return reader
+
+
+def _datetime(value):
+    return parse_datetime(value) if value else None
+
+
+def _text(record, name):
+    value = record.get(name)
+    if not isinstance(value, str):
+        raise TransferError(f'{record["type"]} record without {name}')
+    return value
+
+
+class ProjectImporter:
+    """
+    Reads an export and creates a new project from it with ``bulk_create``,
+    one transaction per batch. Users are matched by email, then username, and
+    created without a usable password when missing. With ``owner`` the
+    project is created by that user instead of the original creator.
+
+    Without ``match_users`` no existing user is touched: every user reference
+    in the export goes to ``owner``, who becomes the only member, as OWNER.
+    Media records are then skipped too: the export names stored files without
+    shipping them, and the owner may not be allowed to read those files.
+    """
+
+    def __init__(self, owner=None, batch_size=1000, match_users=True):
+        if not match_users and owner is None:
+            raise ValueError('Importing without matching users needs an owner')
+        self.owner = owner
+        self.batch_size = batch_size
+        self.match_users = match_users
+        self.project = None
+        self.users = {}
+        self.tasks = {}
+        self.pending = {name: [] for name in ('user', 'member', 'task', 'media', 'comment')}
+        self.counts = dict.fromkeys(self.pending, 0)
+        self.finished = False
+        # Медіа йдуть після своїх задач; наступна задача відкриває новий chunk
+        self._media_seen = False
+
+    def run(self, stream):
+        try:
+            self.read(stream)
+        except BaseException:
+            # Half an import is worse than none
+            if self.project is not None:
+                self.project.delete()
+            raise
+        project_imported.send(sender=Project, project=self.project)
+        return self.project
+
+    def read(self, stream):
+        try:
+            for number, line in enumerate(open_export(stream), 1):
+                if not line.strip():
+                    continue
+                try:
+                    self.add(json.loads(line))
+                except TransferError as exc:
+                    raise TransferError(f'Line {number}: {exc}') from None
+                except (KeyError, TypeError, ValueError, AttributeError) as exc:
+                    raise TransferError(f'Line {number}: invalid record ({exc!r})') from exc
+                except (IntegrityError, DataError) as exc:
+                    # Записи до цього рядка ще в пачці: помилка може бути в будь-якому з них
+                    raise TransferError(f'Line {number}: records rejected by the database ({exc})') from exc
+        except (EOFError, OSError) as exc:
+            raise TransferError(f'Unreadable export: {exc}') from exc
+        if not self.finished:
+            raise TransferError('The export is incomplete: no end record')
+
+    def add(self, record):
+        kind = record['type']
+        if self.finished:
+            raise TransferError('Records after the end record')
+        if kind == 'header':
+            if record.get('version') != VERSION:
+                raise TransferError(f'Unsupported export version {record.get("version")!r}')
+        elif kind == 'project':
+            self.flush('user')
+            self.create_project(record)
+        elif kind == 'end':
+            self.finish(record.get('counts') or {})
+        elif kind in self.pending:
+            if kind != 'user' and self.project is None:
+                raise TransferError(f'{kind} record before the project record')
+            if kind == 'task' and self._media_seen:
+                self.flush('media')
+                self.tasks = {}
+                self._media_seen = False
+            elif kind == 'media' and not self._media_seen:
+                self.flush('task')
+                self._media_seen = True
+            self.pending[kind].append(record)
+            if len(self.pending[kind]) >= self.batch_size:
+                self.flush(kind)
+        else:
+            raise TransferError(f'Unknown record type {kind!r}')
+
+    def finish(self, expected):
+        for kind in self.pending:
+            self.flush(kind)
+        self.finished = True
+        for kind, count in expected.items():
+            if self.counts.get(kind) != count:
+                raise TransferError(f'Expected {count} {kind} records, got {self.counts.get(kind)}')
+
+    def flush(self, kind):
+        records = self.pending[kind]
+        if not records:
+            return
+        create = {
+            'user': self.create_users, 'member': self.create_members, 'task': self.create_tasks,
+            'media': self.create_media, 'comment': self.create_comments,
+        }[kind]
+        with transaction.atomic():
+            create(records)
+        self.counts[kind] += len(records)
+        self.pending[kind] = []
+
+    def user(self, old_id):
+        if old_id is None:
+            return None
+        try:
+            return self.users[old_id]
+        except KeyError:
+            raise TransferError(f'Unknown user {old_id}') from None
+
+    def create_users(self, records):
+        if not self.match_users:
+            for record in records:
+                self.users[record['id']] = self.owner.pk
+            return
+        User = get_user_model()
+        emails = {r['email'].lower() for r in records if r.get('email')}
+        names = {r['username'] for r in records}
+        by_email, by_name = {}, {}
+        for pk, username, email in User.objects.filter(
+            Q(email__in=emails) | Q(username__in=names)
+        ).values_list('pk', 'username', 'email'):
+            by_name[username] = pk
+            if email:
+                by_email.setdefault(email.lower(), pk)
+
+        missing = []
+        new_names = set()
+        for record in records:
+            pk = by_email.get((record.get('email') or '').lower()) or by_name.get(record['username'])
+            if pk is not None:
+                self.users[record['id']] = pk
+                continue
+            username = _text(record, 'username')
+            if not username or username in new_names:
+                raise TransferError(f'Invalid or duplicate username {username!r}')
+            new_names.add(username)
+            user = User(
+                username=username,
+                email=record.get('email') or '',
+                first_name=record.get('first_name') or '',
+                last_name=record.get('last_name') or '',
+            )
+            user.set_unusable_password()
+            missing.append((record['id'], user))
+        created = User.objects.bulk_create([user for _, user in missing])
+        for (old_id, _), user in zip(missing, created):
+            self.users[old_id] = user.pk
+
+    def create_project(self, record):
+        if self.project is not None:
+            raise TransferError('More than one project record')
+        with transaction.atomic():
+            self.project = Project.objects.create(
+                title=_text(record, 'title'),
+                description=record.get('description') or '',
+                created_by_id=self.owner.pk if self.owner else self.user(record['created_by']),
+            )
+            if not self.match_users:
+                ProjectMember.objects.create(project=self.project, user=self.owner, role='OWNER')
+            Project.objects.filter(pk=self.project.pk).update(
+                created_at=_datetime(record.get('created_at')) or self.project.created_at,
+                updated_at=_datetime(record.get('updated_at')) or self.project.updated_at,
+            )
+
+    def _restore_timestamps(self, objects, records, fields):
+        # bulk_create overwrites auto_now/auto_now_add fields.
+        for obj, record in zip(objects, records):
+            for name in fields:
+                value = _datetime(record.get(name))
+                if value is not None:
+                    setattr(obj, name, value)
+        type(objects[0]).objects.bulk_update(objects, fields)
+
+    def create_members(self, records):
+        roles = dict(ProjectMember.ROLE_CHOICES)
+        members = []
+        for record in records:
+            if record['role'] not in roles:
+                raise TransferError(f'Invalid role {record["role"]!r}')
+            if not self.match_users:
+                self.user(record['user'])
+                continue
+            members.append(ProjectMember(
+                project=self.project, user_id=self.user(record['user']), role=record['role'],
+            ))
+        if not members:
+            return
+        members = ProjectMember.objects.bulk_create(members)
+        self._restore_timestamps(members, records, ('joined_at',))
+
+    def create_tasks(self, records):
+        statuses = dict(Task.STATUS_CHOICES)
+        tasks = []
+        for record in records:
+            if record['status'] not in statuses:
+                raise TransferError(f'Invalid status {record["status"]!r}')
+            tasks.append(Task(
+                project=self.project,
+                description=_text(record, 'description'),
+                created_by_id=self.user(record['created_by']),
+                assigned_to_id=self.user(record.get('assigned_to')),
+                status=record['status'],
+                due_date=_datetime(record.get('due_date')),
+            ))
+        tasks = Task.objects.bulk_create(tasks)
+        self._restore_timestamps(tasks, records, ('created_at', 'updated_at'))
+        for record, task in zip(records, tasks):
+            self.tasks[record['id']] = task.pk
+
+    def create_media(self, records):
+        if not self.match_users:
+            for record in records:
+                self._media_task(record)
+                self.user(record['uploaded_by'])
+            return
+        # Файл з таким самим вмістом уже може лежати в цьому сховищі
+        local = dict(
+            MediaFile.objects
+            .filter(sha256__in={r['sha256'] for r in records if r.get('sha256')})
+            .values_list('sha256', 'file')
+        )
+        media = []
+        for record in records:
+            media.append(MediaFile(
+                task_id=self._media_task(record),
+                file=local.get(record.get('sha256')) or record['file'],
+                file_type=record['file_type'],
+                sha256=record.get('sha256') or '',
+                size=record.get('size') or 0,
+                uploaded_by_id=self.user(record['uploaded_by']),
+            ))
+        media = MediaFile.objects.bulk_create(media)
+        self._restore_timestamps(media, records, ('uploaded_at',))
+
+    def _media_task(self, record):
+        task_id = self.tasks.get(record['task'])
+        if task_id is None:
+            raise TransferError(f'Media for unknown task {record["task"]}')
+        return task_id
+
+    def create_comments(self, records):
+        comments = Comment.objects.bulk_create(
+            Comment(project=self.project, author_id=self.user(record['author']), text=_text(record, 'text'))
+            for record in records
+        )
+        self._restore_timestamps(comments, records, ('created_at', 'updated_at'))
+
+
+def import_project(stream, owner=None, batch_size=1000, match_users=True):
+    """Imports an export read from a binary ``stream``; returns the new project."""
+    return ProjectImporter(owner, batch_size, match_users).run(stream)
@@ -1,16 +1,27 @@
 from django.urls import path
-from . import views
+from events import views as event_views
+from task import views as task_views
+from core.async_api import read_view
+from . import views, views_async
 
 urlpatterns = [
-    path('', views.project_list, name='project-list'),
+    path('', read_view(views.project_list, views_async.project_list), name='project-list'),
     path('add/', views.project_add, name='project-add'),
-    path('<int:pk>/', views.project, name='project'),
+    path('<int:pk>/', read_view(views.project, views_async.project), name='project'),
     path('edit/<int:pk>/', views.project_edit, name='project-edit'),
     path('del/<int:pk>/', views.project_delete, name='project-delete'),
-    path('<int:pk>/members/', views.members_list, name='members-list'),
+    path('<int:pk>/members/', read_view(views.members_list, views_async.members_list), name='members-list'),
     path('<int:pk>/members/add/', views.members_add, name='members-add'),
     path('<int:pk>/members/remove/<int:member_pk>/', views.members_remove, name='members-remove'),
-    # path('<int:pk>/comments/', views.comments_list, name='comments-list'),
+    path('<int:pk>/board-summary/', task_views.board_summary, name='board-summary'),
+    path('<int:pk>/analytics/time-in-status/', task_views.time_in_status, name='analytics-time-in-status'),
+    path('<int:pk>/analytics/cycle-time/', task_views.cycle_time, name='analytics-cycle-time'),
+    path('<int:pk>/analytics/throughput/', task_views.throughput, name='analytics-throughput'),
+    path('<int:pk>/analytics/flow/', task_views.cumulative_flow, name='analytics-flow'),
+    path('<int:pk>/export/', views.project_export, name='project-export'),
+    path('import/', views.project_import, name='project-import'),
+    path('<int:pk>/events/', event_views.project_events, name='project-events'),
+    path('<int:pk>/comments/', views.comments_list, name='comments-list'),
     # path('<int:pk>/comments/add/', views.members_add, name='comments-add'),
     # path('<int:pk>/comments/remove/<int:comment_pk>/', views.comments_remove, name='comments-remove'),
 ]
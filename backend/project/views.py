@@ -1,16 +1,55 @@
+from io import BytesIO
+
 from django.db.models import Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from .access import get_project_access
 from .models import Project, ProjectMember
-from .serializers import ProjectSerializer, ProjectMemberSerializer
-# from comment.models import Comment
-from comment.serializers import CommentSerializer 
+from .serializers import ProjectMemberValuesSerializer, ProjectValuesSerializer
+from .transfer import TransferError, export_project, gzipped, import_project
+from core.conditional import conditional, untracked_expansions
+from core.pagination import KeysetPagination
+from core.streaming import NDJSON_CONTENT_TYPE, stream_chunks
+from comment.models import Comment
+from comment.serializers import CommentSerializer, CommentValuesSerializer
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def project_list(request):
+# Every column the members payload shows, nested user included.
+MEMBER_STATE = ['projectmember__' + lookup for lookup in ProjectMemberValuesSerializer.sources()]
+
+def _members_state(pk):
+    # One row per member: removals leave no timestamp behind and role or
+    # profile edits do not touch the project, so the rows themselves are
+    # the state. They are only exposed through the ETag. The creator's
+    # username is in the project payload and changes without the project.
+    rows = list(
+        Project.objects
+        .filter(pk=pk)
+        .order_by('projectmember__id')
+        .values_list('updated_at', 'created_by__username', *MEMBER_STATE)
+    )
+    if not rows:
+        return None
+    return rows[0][:2], tuple(row[2:] for row in rows)
+
+def project_validators(request, pk):
+    # Comments are not part of the state; responses with them are not cached.
+    if untracked_expansions(ProjectValuesSerializer.for_request(request), tracked={'members'}):
+        return None
+    state = _members_state(pk)
+    if state is None:
+        return None
+    # user_role in the payload depends on who is asking.
+    return (state, request.user.pk), None
+
+def members_validators(request, pk):
+    state = _members_state(pk)
+    if state is None:
+        return None
+    return state[1:], None
+
+def project_list_queryset(request):
     user_id = request.query_params.get('user')
     
     queryset = Project.objects.all()
@@ -19,33 +58,48 @@ def project_list(request):
 
         queryset = queryset.filter(
             Q(created_by_id=user_id) |
-            Q(projectmember__user_id=user_id)
-        ).distinct()
+            Q(pk__in=ProjectMember.objects.filter(user_id=user_id).values('project_id'))
+        )
     else:
         queryset = queryset.filter(
             Q(created_by=request.user) |
-            Q(projectmember__user=request.user)
-        ).distinct()
+            Q(pk__in=ProjectMember.objects.filter(user=request.user).values('project_id'))
+        )
     
-    queryset = queryset.select_related('created_by').prefetch_related('members')
+    return queryset.with_member_counts(request.user)
+
+def project_detail_queryset(request, pk, serializer_class):
+    return serializer_class.values(Project.objects.with_member_counts(request.user).filter(pk=pk))
+
+def members_queryset(pk, serializer_class=ProjectMemberValuesSerializer):
+    return serializer_class.values(ProjectMember.objects.filter(project_id=pk).order_by('id'))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def project_list(request):
+    serializer_class = ProjectValuesSerializer.for_request(request)
+    queryset = project_list_queryset(request)
     
-    serializer = ProjectSerializer(
-        queryset,
+    paginator = KeysetPagination(ordering=('created_at', 'id'))
+    page = paginator.paginate_queryset(serializer_class.values(queryset, *paginator.fields), request)
+    serializer = serializer_class(
+        page,
         many=True,
         context={'request': request}
     )
     
-    return Response(serializer.data)
+    return paginator.get_paginated_response(serializer.data)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(project_validators)
 def project(request, pk):
-    try:
-        project = Project.objects.get(pk=pk)
-        serializer = ProjectSerializer(project)
-        return Response(serializer.data)
-    except Project.DoesNotExist:
+    serializer_class = ProjectValuesSerializer.for_request(request)
+    project = project_detail_queryset(request, pk, serializer_class).first()
+    if project is None:
         return Response({"error": "Project not found"}, status=404)
+    serializer = serializer_class(project, context={'request': request})
+    return Response(serializer.data)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -64,10 +118,14 @@ def project_add(request):
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def project_edit(request, pk):
+    access = get_project_access(pk)
+    if access is None:
+        return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+    if not access.is_creator(request.user):
+        return Response({'error': 'You do not have permission to edit this project'}, status=status.HTTP_403_FORBIDDEN)
+
     try:
         project = Project.objects.get(pk=pk)
-        if project.created_by != request.user:
-            return Response({'error': 'You do not have permission to edit this project'}, status=status.HTTP_403_FORBIDDEN)
     except Project.DoesNotExist:
         return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -81,10 +139,14 @@ def project_edit(request, pk):
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def project_delete(request, pk):
+    access = get_project_access(pk)
+    if access is None:
+        return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+    if not access.is_creator(request.user):
+        return Response({'error': 'You do not have permission to delete this project'}, status=status.HTTP_403_FORBIDDEN)
+
     try:
         project = Project.objects.get(pk=pk)
-        if project.created_by != request.user:
-            return Response({'error': 'You do not have permission to delete this project'}, status=status.HTTP_403_FORBIDDEN)
         project.delete()
         return Response({'success': True})
     except Project.DoesNotExist:
@@ -92,56 +154,86 @@ def project_delete(request, pk):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def members_list(request, pk):
+def project_export(request, pk):
+    access = get_project_access(pk)
+    if access is None:
+        return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+    if not access.is_creator(request.user) and access.role_of(request.user) not in ('OWNER', 'ADMIN'):
+        return Response({'error': 'You do not have permission to export this project'}, status=status.HTTP_403_FORBIDDEN)
+
+    chunks = export_project(pk)
+    filename = f'project-{pk}.ndjson'
+    if request.query_params.get('compress') == 'gzip':
+        response = stream_chunks(request, gzipped(chunks), 'application/gzip')
+        filename += '.gz'
+    else:
+        response = stream_chunks(request, chunks, NDJSON_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def project_import(request):
     try:
-        project = Project.objects.get(pk=pk)
-        members = project.projectmember_set.all()
-        serializer = ProjectMemberSerializer(members, many=True)
-        return Response(serializer.data)
-    except Project.DoesNotExist:
+        # Тіло читається потоком (NDJSON або gzip), не через request.data.
+        # Лише staff може прив'язувати записи до наявних користувачів
+        project = import_project(
+            request.stream or BytesIO(), owner=request.user, match_users=request.user.is_staff,
+        )
+    except TransferError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'id': project.id}, status=status.HTTP_201_CREATED)
+
+def _members_response(pk, serializer_class=ProjectMemberValuesSerializer, **kwargs):
+    members = members_queryset(pk, serializer_class)
+    serializer = serializer_class(members, many=True)
+    return Response(serializer.data, **kwargs)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional(members_validators)
+def members_list(request, pk):
+    if get_project_access(pk) is None:
         return Response({"error": "Project not found"}, status=404)
+    return _members_response(pk, ProjectMemberValuesSerializer.for_request(request))
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def members_add(request, pk):
+    access = get_project_access(pk)
+    if access is None:
+        return Response({"error": "Project not found"}, status=404)
     try:
-        project = Project.objects.get(pk=pk)
         data = request.data
         if not data.get('user') or not data.get('role'):
             return Response({"error": "User ID and role are required"}, status=status.HTTP_400_BAD_REQUEST)
         
-        user_id = data.get('user')
+        user_id = int(data.get('user'))
         role = data.get('role')
         
-        if ProjectMember.objects.filter(project=project, user_id=user_id).exists():
+        if user_id in access.roles:
             return Response({"error": "User is already a member of this project"}, status=status.HTTP_400_BAD_REQUEST)
         
         if role not in dict(ProjectMember.ROLE_CHOICES).keys():
             return Response({"error": "Invalid role"}, status=status.HTTP_400_BAD_REQUEST)
         
-        ProjectMember.objects.create(project=project, user_id=user_id, role=role)
-        members = project.projectmember_set.all()
-        serializer = ProjectMemberSerializer(members, many=True)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-    except Project.DoesNotExist:
-        return Response({"error": "Project not found"}, status=404)
+        ProjectMember.objects.create(project_id=pk, user_id=user_id, role=role)
+        return _members_response(pk, status=status.HTTP_201_CREATED)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def members_remove(request, pk, member_pk):
+    access = get_project_access(pk)
+    if access is None:
+        return Response({"error": "Project not found"}, status=404)
     try:
-        project = Project.objects.get(pk=pk)
-        member = ProjectMember.objects.get(pk=member_pk, project=project)
-        if project.created_by != request.user and member.role != 'OWNER':
+        member = ProjectMember.objects.get(pk=member_pk, project_id=pk)
+        if not access.is_creator(request.user) and member.role != 'OWNER':
             return Response({"error": "You do not have permission to remove this member"}, status=status.HTTP_403_FORBIDDEN)
         member.delete()
-        members = project.projectmember_set.all()
-        serializer = ProjectMemberSerializer(members, many=True)
-        return Response(serializer.data)
-    except Project.DoesNotExist:
-        return Response({"error": "Project not found"}, status=404)
+        return _members_response(pk)
     except ProjectMember.DoesNotExist:
         return Response({"error": "Member not found"}, status=404)
 
@@ -164,10 +256,11 @@ def comments_add(request, pk):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def comments_list(request, pk):
-    try:
-        project = Project.objects.get(pk=pk)
-        comments = project.comments.all()[:3]
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
-    except Project.DoesNotExist:
-        return Response({"error": "Project not found"}, status=404)
\ No newline at end of file
+    # Історія коментарів, новіші першими; останні N для карток дає ?expand=comments
+    if get_project_access(pk) is None:
+        return Response({"error": "Project not found"}, status=404)
+    paginator = KeysetPagination(ordering=('-created_at', '-id'))
+    comments = CommentValuesSerializer.values(Comment.objects.filter(project_id=pk), *paginator.fields)
+    page = paginator.paginate_queryset(comments, request)
+    serializer = CommentValuesSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
\ No newline at end of file
@@ -0,0 +1,42 @@
+# project/views_async.py — async read views, routed when ASYNC_READ_VIEWS is on
+
+from asgiref.sync import sync_to_async
+from rest_framework.response import Response
+from .access import get_project_access
+from .serializers import ProjectMemberValuesSerializer, ProjectValuesSerializer
+from .views import (
+    members_queryset, members_validators, project_detail_queryset, project_list_queryset,
+    project_validators,
+)
+from core.async_api import async_api_view
+from core.conditional import conditional
+from core.pagination import KeysetPagination
+
+
+@async_api_view()
+async def project_list(request):
+    serializer_class = ProjectValuesSerializer.for_request(request)
+    paginator = KeysetPagination(ordering=('created_at', 'id'))
+    queryset = serializer_class.values(project_list_queryset(request), *paginator.fields)
+    page = await paginator.apaginate_queryset(queryset, request)
+    serializer = serializer_class(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(await serializer.adata())
+
+@async_api_view()
+@conditional(project_validators)
+async def project(request, pk):
+    serializer_class = ProjectValuesSerializer.for_request(request)
+    project = await project_detail_queryset(request, pk, serializer_class).afirst()
+    if project is None:
+        return Response({"error": "Project not found"}, status=404)
+    serializer = serializer_class(project, context={'request': request})
+    return Response(await serializer.adata())
+
+@async_api_view()
+@conditional(members_validators)
+async def members_list(request, pk):
+    if await sync_to_async(get_project_access)(pk) is None:
+        return Response({"error": "Project not found"}, status=404)
+    serializer_class = ProjectMemberValuesSerializer.for_request(request)
+    members = [member async for member in members_queryset(pk, serializer_class)]
+    return Response(serializer_class(members, many=True).data)
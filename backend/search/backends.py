@@ -0,0 +1,156 @@
+"""
+Storage for the full-text index, one implementation per database vendor.
+
+Rows are ``(kind, object_id, project_id, title, body)``; ``kind`` is one of
+``KINDS``. Highlights come back wrapped in ``MARK_START``/``MARK_END`` so the
+caller can escape the text before turning them into ``<mark>`` tags.
+"""
+import re
+
+from django.db import connection
+
+TABLE = 'search_entry'
+KINDS = {'project': 1, 'task': 2, 'comment': 3}
+KIND_NAMES = {code: name for name, code in KINDS.items()}
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def visible_projects_sql():
+    """Projects the user created or is a member of; takes the user id twice."""
+    from project.models import Project, ProjectMember
+
+    return (
+        f'SELECT id FROM {Project._meta.db_table} WHERE created_by_id = %s '
+        f'UNION SELECT project_id FROM {ProjectMember._meta.db_table} WHERE user_id = %s'
+    )
+
+
+def tokens(query):
+    return _TOKEN.findall(query or '')
+
+
+class SQLiteBackend:
+    """
+    FTS5 table. The rowid packs kind and object id together so updates and
+    deletes are rowid lookups instead of scans over UNINDEXED columns.
+    """
+
+    def rowid(self, kind, object_id):
+        return object_id * 4 + kind
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+            f"title, body, kind UNINDEXED, object_id UNINDEXED, project_id UNINDEXED, "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+    def clear(self, cursor):
+        cursor.execute(f'DELETE FROM {TABLE}')
+
+    def delete(self, cursor, keys):
+        cursor.executemany(
+            f'DELETE FROM {TABLE} WHERE rowid = %s',
+            [(self.rowid(kind, object_id),) for kind, object_id in keys],
+        )
+
+    def upsert(self, cursor, rows):
+        # Один rowid двічі дав би IntegrityError: лишається останній рядок
+        rows = list({(row[0], row[1]): row for row in rows}.values())
+        self.delete(cursor, [(row[0], row[1]) for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {TABLE} (rowid, kind, object_id, project_id, title, body) '
+            f'VALUES (%s, %s, %s, %s, %s, %s)',
+            [(self.rowid(row[0], row[1]),) + tuple(row) for row in rows],
+        )
+
+    def search(self, cursor, query, user_id, kinds, limit, offset):
+        match = ' '.join('"{}"*'.format(token.replace('"', '""')) for token in tokens(query))
+        kind_filter = ', '.join(str(KINDS[kind]) for kind in kinds)
+        cursor.execute(
+            f"SELECT kind, object_id, project_id, "
+            f"highlight({TABLE}, 0, %s, %s), "
+            f"snippet({TABLE}, 1, %s, %s, '…', 16), "
+            f"bm25({TABLE}, 5.0, 1.0) "
+            f"FROM {TABLE} WHERE {TABLE} MATCH %s "
+            f"AND kind IN ({kind_filter}) "
+            f"AND project_id IN ({visible_projects_sql()}) "
+            f"ORDER BY bm25({TABLE}, 5.0, 1.0) LIMIT %s OFFSET %s",
+            [MARK_START, MARK_END, MARK_START, MARK_END, match, user_id, user_id, limit, offset],
+        )
+        # bm25 is "lower is better"; flip it so every backend ranks high-first.
+        return [row[:5] + (-row[5],) for row in cursor.fetchall()]
+
+
+class PostgreSQLBackend:
+    """
+    Plain table with a generated, weighted ``tsvector`` column and a GIN index.
+    """
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE TABLE {TABLE} ("
+            f"kind smallint NOT NULL, object_id bigint NOT NULL, project_id bigint NOT NULL, "
+            f"title text NOT NULL DEFAULT '', body text NOT NULL DEFAULT '', "
+            f"document tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('simple', title), 'A') || "
+            f"setweight(to_tsvector('simple', body), 'B')) STORED, "
+            f"PRIMARY KEY (kind, object_id))"
+        )
+        cursor.execute(f'CREATE INDEX {TABLE}_document ON {TABLE} USING gin (document)')
+        cursor.execute(f'CREATE INDEX {TABLE}_project ON {TABLE} (project_id)')
+
+    def drop(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+    def clear(self, cursor):
+        cursor.execute(f'TRUNCATE {TABLE}')
+
+    def delete(self, cursor, keys):
+        cursor.executemany(
+            f'DELETE FROM {TABLE} WHERE kind = %s AND object_id = %s', list(keys)
+        )
+
+    def upsert(self, cursor, rows):
+        cursor.executemany(
+            f'INSERT INTO {TABLE} (kind, object_id, project_id, title, body) '
+            f'VALUES (%s, %s, %s, %s, %s) ON CONFLICT (kind, object_id) DO UPDATE SET '
+            f'project_id = EXCLUDED.project_id, title = EXCLUDED.title, body = EXCLUDED.body',
+            [tuple(row) for row in rows],
+        )
+
+    def search(self, cursor, query, user_id, kinds, limit, offset):
+        # Prefix match on every word, like the SQLite backend.
+        tsquery = ' & '.join(
+            "'{}':*".format(token.replace("'", "''").replace('\\', '\\\\'))
+            for token in tokens(query)
+        )
+        options = f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=32, MinWords=12'
+        cursor.execute(
+            f"SELECT kind, object_id, project_id, "
+            f"ts_headline('simple', title, q, %s), "
+            f"ts_headline('simple', body, q, %s), "
+            f"ts_rank(document, q) AS rank "
+            f"FROM {TABLE}, to_tsquery('simple', %s) q "
+            f"WHERE document @@ q AND kind = ANY(%s) "
+            f"AND project_id IN ({visible_projects_sql()}) "
+            f"ORDER BY rank DESC, kind, object_id LIMIT %s OFFSET %s",
+            [options + ', HighlightAll=true', options, tsquery,
+             [KINDS[kind] for kind in kinds], user_id, user_id, limit, offset],
+        )
+        return cursor.fetchall()
+
+
+def get_backend(vendor=None):
+    vendor = vendor or connection.vendor
+    if vendor == 'sqlite':
+        return SQLiteBackend()
+    if vendor == 'postgresql':
+        return PostgreSQLBackend()
+    return None
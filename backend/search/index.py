@@ -0,0 +1,136 @@
+import html
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+
+from comment.models import Comment
+from project.models import Project
+from task.models import Task
+from .backends import KIND_NAMES, KINDS, MARK_END, MARK_START, get_backend, tokens
+
+# kind -> (model, fields read for the entry: object id, project id, [title,] body)
+SOURCES = {
+    'project': (Project, ('id', 'id', 'title', 'description')),
+    'task': (Task, ('id', 'project_id', 'description')),
+    'comment': (Comment, ('id', 'project_id', 'text')),
+}
+
+
+def entry(kind, values):
+    """Builds an index row from ``values`` in the order of ``SOURCES[kind][1]``."""
+    if kind == 'project':
+        object_id, project_id, title, body = values
+    else:
+        (object_id, project_id, body), title = values, ''
+    return (KINDS[kind], object_id, project_id, title or '', body or '')
+
+
+def entry_for(instance):
+    kind = kind_of(instance)
+    fields = SOURCES[kind][1]
+    return entry(kind, [getattr(instance, name) for name in fields])
+
+
+def kind_of(instance):
+    for kind, (model, _) in SOURCES.items():
+        if isinstance(instance, model):
+            return kind
+    raise ValueError(f'{type(instance).__name__} is not indexed')
+
+
+def index_objects(instances):
+    backend = get_backend()
+    if backend is None or not instances:
+        return
+    with connection.cursor() as cursor:
+        backend.upsert(cursor, [entry_for(instance) for instance in instances])
+
+
+def index_project(project_id, chunk_size=2000):
+    """Indexes a project with its tasks and comments, ``chunk_size`` rows at a time."""
+    backend = get_backend()
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        for kind, (model, fields) in SOURCES.items():
+            rows = model._default_manager.filter(**{fields[1]: project_id}).order_by().values_list(*fields)
+            batch = []
+            for values in rows.iterator(chunk_size=chunk_size):
+                batch.append(entry(kind, values))
+                if len(batch) == chunk_size:
+                    backend.upsert(cursor, batch)
+                    batch = []
+            if batch:
+                backend.upsert(cursor, batch)
+
+
+def remove_objects(instances):
+    backend = get_backend()
+    if backend is None or not instances:
+        return
+    with connection.cursor() as cursor:
+        backend.delete(cursor, [(KINDS[kind_of(instance)], instance.pk) for instance in instances])
+
+
+def rebuild(chunk_size=2000, apps=None, using=None):
+    """
+    Clears the index and refills it by streaming each source table in
+    chunks of ``chunk_size`` rows. Returns ``{kind: rows indexed}``.
+    Migrations pass their historical ``apps`` and connection alias.
+    """
+    db = connections[using or DEFAULT_DB_ALIAS]
+    backend = get_backend(db.vendor)
+    if backend is None:
+        return {}
+    totals = {}
+    # One transaction: readers never see a half-empty index, and SQLite does
+    # not commit (and sync) after every statement.
+    with transaction.atomic(using=db.alias), db.cursor() as cursor:
+        backend.clear(cursor)
+        for kind, (model, fields) in SOURCES.items():
+            if apps is not None:
+                model = apps.get_model(model._meta.label)
+            rows = model._default_manager.using(db.alias).order_by().values_list(*fields).iterator(chunk_size=chunk_size)
+            batch, total = [], 0
+            for values in rows:
+                batch.append(entry(kind, values))
+                if len(batch) == chunk_size:
+                    backend.upsert(cursor, batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                backend.upsert(cursor, batch)
+                total += len(batch)
+            totals[kind] = total
+    return totals
+
+
+def _marked(text):
+    return (
+        html.escape(text or '')
+        .replace(MARK_START, '<mark>')
+        .replace(MARK_END, '</mark>')
+    )
+
+
+def search(query, user, kinds=tuple(KINDS), limit=20, offset=0):
+    """
+    Returns up to ``limit`` hits visible to ``user``, best first. Titles and
+    snippets are HTML-escaped with matches wrapped in ``<mark>``.
+    """
+    backend = get_backend()
+    # Без жодного слова FTS5 і to_tsquery відповідають синтаксичною помилкою
+    if backend is None or not tokens(query):
+        return []
+    with connection.cursor() as cursor:
+        rows = backend.search(cursor, query, user.pk, kinds, limit, offset)
+    return [
+        {
+            'type': KIND_NAMES[kind],
+            'id': object_id,
+            'project': project_id,
+            'title': _marked(title),
+            'snippet': _marked(snippet),
+            'rank': rank,
+        }
+        for kind, object_id, project_id, title, snippet, rank in rows
+    ]
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text index for projects, tasks and comments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        totals = rebuild(chunk_size=options['chunk_size'])
+        if not totals:
+            self.stdout.write(self.style.WARNING('No full-text backend for this database.'))
+            return
+        for kind, total in totals.items():
+            self.stdout.write(f'{kind}: {total}')
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
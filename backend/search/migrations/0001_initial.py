@@ -0,0 +1,32 @@
+from django.db import migrations
+
+from search.backends import get_backend
+from search.index import rebuild
+
+
+def create_index(apps, schema_editor):
+    backend = get_backend(schema_editor.connection.vendor)
+    if backend is not None:
+        with schema_editor.connection.cursor() as cursor:
+            backend.create(cursor)
+        rebuild(apps=apps, using=schema_editor.connection.alias)
+
+
+def drop_index(apps, schema_editor):
+    backend = get_backend(schema_editor.connection.vendor)
+    if backend is not None:
+        with schema_editor.connection.cursor() as cursor:
+            backend.drop(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comment', '0004_query_indexes'),
+        ('project', '0002_query_indexes'),
+        ('task', '0003_status_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
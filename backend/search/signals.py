@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from comment.models import Comment
+from project.models import Project
+from project.signals import project_imported
+from task.models import Task
+from task.signals import tasks_bulk_saved
+
+from .index import index_objects, index_project, remove_objects
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Comment)
+def object_saved(sender, instance, **kwargs):
+    index_objects([instance])
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Comment)
+def object_deleted(sender, instance, **kwargs):
+    remove_objects([instance])
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def tasks_bulk_changed(sender, created=(), updated=(), **kwargs):
+    index_objects(list(created) + list(updated))
+
+
+@receiver(project_imported)
+def project_imported_index(sender, project, **kwargs):
+    index_project(project.pk)
@@ -0,0 +1,126 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from comment.models import Comment
+from core.models import User
+from project.models import Project, ProjectMember
+from task.bulk import apply_operations
+from task.models import Task
+from .backends import TABLE
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.other = User.objects.create_user(username='stranger')
+        self.project = Project.objects.create(
+            title='Invoice rework', description='Billing <b>cleanup</b>', created_by=self.user
+        )
+        self.task = Task.objects.create(
+            description='Send the invoice reminder', project=self.project, created_by=self.user
+        )
+        self.comment = Comment.objects.create(
+            project=self.project, author=self.user, text='Invoices are late again'
+        )
+        self.hidden = Project.objects.create(
+            title='Invoice archive', description='', created_by=self.other
+        )
+        self.client.force_authenticate(self.user)
+
+    def search(self, **params):
+        response = self.client.get(reverse('search'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def found(self, **params):
+        return {(hit['type'], hit['id']) for hit in self.search(**params)['results']}
+
+    def test_finds_visible_objects_by_prefix(self):
+        self.assertEqual(self.found(q='invo'), {
+            ('project', self.project.pk),
+            ('task', self.task.pk),
+            ('comment', self.comment.pk),
+        })
+
+    def test_membership_grants_access(self):
+        ProjectMember.objects.create(project=self.hidden, user=self.user)
+        self.assertIn(('project', self.hidden.pk), self.found(q='archive'))
+        self.client.force_authenticate(self.other)
+        self.assertNotIn(('project', self.project.pk), self.found(q='invoice'))
+
+    def test_title_match_ranks_first(self):
+        results = self.search(q='invoice')['results']
+        self.assertEqual((results[0]['type'], results[0]['id']), ('project', self.project.pk))
+
+    def test_type_filter(self):
+        self.assertEqual(self.found(q='invoice', type='task'), {('task', self.task.pk)})
+        response = self.client.get(reverse('search'), {'q': 'invoice', 'type': 'user'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_highlight_is_escaped(self):
+        hit = self.search(q='cleanup', type='project')['results'][0]
+        self.assertEqual(hit['title'], 'Invoice rework')
+        self.assertIn('&lt;b&gt;<mark>cleanup</mark>&lt;/b&gt;', hit['snippet'])
+
+    def test_pages(self):
+        data = self.search(q='invoice', limit=2)
+        self.assertEqual(len(data['results']), 2)
+        self.assertEqual(data['next'], 2)
+        data = self.search(q='invoice', limit=2, page=2)
+        self.assertEqual(len(data['results']), 1)
+        self.assertIsNone(data['next'])
+
+    def test_index_follows_edits_and_deletes(self):
+        self.task.description = 'Call the supplier'
+        self.task.save()
+        self.assertEqual(self.found(q='supplier'), {('task', self.task.pk)})
+        self.assertNotIn(('task', self.task.pk), self.found(q='invoice'))
+
+        self.comment.delete()
+        self.assertNotIn(('comment', self.comment.pk), self.found(q='late'))
+
+        self.project.delete()
+        self.assertEqual(self.found(q='invoice'), set())
+
+    def test_bulk_api_updates_index(self):
+        ok, results = apply_operations([
+            {'op': 'create', 'data': {'description': 'Quarterly audit', 'project': self.project.pk}},
+            {'op': 'update', 'id': self.task.pk, 'data': {'description': 'Audit receipts'}},
+        ], self.user)
+        self.assertTrue(ok)
+        self.assertEqual(self.found(q='audit'), {
+            ('task', results[0]['id']),
+            ('task', self.task.pk),
+        })
+
+    def test_repeated_object_in_one_batch_keeps_the_last(self):
+        from .index import index_objects
+
+        first, second = Task.objects.get(pk=self.task.pk), Task.objects.get(pk=self.task.pk)
+        first.description, second.description = 'Draft budget', 'Final budget'
+        index_objects([first, second])
+        self.assertEqual(self.found(q='budget'), {('task', self.task.pk)})
+        self.assertEqual(self.found(q='final'), {('task', self.task.pk)})
+        self.assertEqual(self.found(q='draft'), set())
+
+    def test_requires_query(self):
+        response = self.client.get(reverse('search'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_without_words_finds_nothing(self):
+        for query in ('!!', '"', '* -'):
+            self.assertEqual(self.search(q=query)['results'], [])
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE}')
+        self.assertEqual(self.found(q='invoice'), set())
+
+        out = StringIO()
+        call_command('rebuild_search_index', chunk_size=1, stdout=out)
+        self.assertIn('project: 2', out.getvalue())
+        self.assertEqual(len(self.found(q='invoice')), 3)
@@ -0,0 +1,42 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from .backends import KINDS
+from .index import search as run_search
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+
+def _positive_int(value, default):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search(request):
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'Query parameter "q" is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind]
+    unknown = [kind for kind in kinds if kind not in KINDS]
+    if unknown:
+        return Response(
+            {'error': f'Unknown type: {", ".join(unknown)}'}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    page = _positive_int(request.query_params.get('page'), 1)
+    limit = min(_positive_int(request.query_params.get('limit'), PAGE_SIZE), MAX_PAGE_SIZE)
+    # Один зайвий рядок показує, чи є наступна сторінка.
+    hits = run_search(
+        query, request.user, kinds=kinds or tuple(KINDS), limit=limit + 1, offset=(page - 1) * limit
+    )
+    return Response({
+        'results': hits[:limit],
+        'next': page + 1 if len(hits) > limit else None,
+    })
@@ -0,0 +1,235 @@
+"""
+Change log behind ``/api/sync/``.
+
+Every write to a project, membership, task or comment appends a ``Change``
+row (a tombstone for deletes); the row id is a monotonic change sequence. A
+client keeps the token of its last sync and asks for rows with a larger id:
+the answer grows with the number of changes, not with the size of the
+projects. Only the latest row per object and project counts, so
+``prune_sync_changes`` can drop the ones it supersedes at any time.
+
+Rows get their id on insert but become visible on commit, so a slow
+transaction can commit a lower id after a higher one was read. Tokens
+therefore only advance past rows older than ``SYNC_SETTLE_SECONDS``; newer
+rows are sent again next time, which clients apply as idempotent upserts.
+"""
+import base64
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from comment.models import Comment
+from core.db import insert_rows
+from comment.serializers import CommentValuesSerializer
+from project.models import Project, ProjectMember
+from project.serializers import ProjectMemberValuesSerializer, ProjectValuesSerializer
+from task.models import Task
+from task.serializers import TaskValuesSerializer
+
+from .models import Change
+
+KIND_NAMES = {
+    Change.PROJECT: 'projects',
+    Change.MEMBER: 'members',
+    Change.TASK: 'tasks',
+    Change.COMMENT: 'comments',
+}
+
+
+class TokenError(ValueError):
+    pass
+
+
+class TokenExpired(TokenError):
+    pass
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _append(kind, rows):
+    """``rows`` are ``(object_id, project_id, user_id, deleted)``; one ``executemany``."""
+    now = timezone.now()
+    insert_rows(
+        Change,
+        ('kind', 'object_id', 'project_id', 'user_id', 'deleted', 'changed_at'),
+        ((kind, object_id, project_id, user_id, deleted, now) for object_id, project_id, user_id, deleted in rows),
+    )
+
+
+def record_projects(projects):
+    _append(Change.PROJECT, [(project.pk, project.pk, project.created_by_id, False) for project in projects])
+
+
+def record_members(members, deleted=False):
+    _append(Change.MEMBER, [(member.pk, member.project_id, member.user_id, deleted) for member in members])
+
+
+def record_tasks(tasks, deleted=False):
+    rows = []
+    for task in tasks:
+        previous = task.loaded_values
+        if not deleted and previous and previous['project_id'] not in (None, task.project_id):
+            # Moved: a tombstone for the old project, a change for the new one.
+            rows.append((task.pk, previous['project_id'], None, True))
+        rows.append((task.pk, task.project_id, None, deleted))
+    _append(Change.TASK, rows)
+
+
+def record_task_rows(rows):
+    """Changes for tasks updated without signals; ``rows`` are ``(task_id, project_id)``."""
+    _append(Change.TASK, [(task_id, project_id, None, False) for task_id, project_id in rows])
+
+
+def record_comments(comments, deleted=False):
+    _append(Change.COMMENT, [(comment.pk, comment.project_id, None, deleted) for comment in comments])
+
+
+def record_project_deleted(project):
+    """
+    Leaves a tombstone for the project and drops the rows of its tasks and
+    comments, which clients remove together with the project. Membership
+    tombstones stay: they tell former members the project is gone.
+    """
+    with transaction.atomic():
+        Change.objects.filter(project_id=project.pk).exclude(kind=Change.MEMBER, deleted=True).delete()
+        _append(Change.PROJECT, [(project.pk, project.pk, project.created_by_id, True)])
+
+
+def record_project(project):
+    """Rows for a whole project, e.g. after an import created it with bulk_create."""
+    project_id = project.pk
+    with transaction.atomic():
+        _append(Change.PROJECT, [(project_id, project_id, project.created_by_id, False)])
+        _append(Change.MEMBER, [
+            (pk, project_id, user_id, False)
+            for pk, user_id in ProjectMember.objects.filter(project_id=project_id).values_list('pk', 'user_id')
+        ])
+        for kind, model in ((Change.TASK, Task), (Change.COMMENT, Comment)):
+            _append(kind, [
+                (pk, project_id, None, False)
+                for pk in model.objects.filter(project_id=project_id).values_list('pk', flat=True)
+            ])
+
+
+def encode_token(seq):
+    raw = json.dumps([seq, int(time.time())], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_token(token):
+    """The sequence number in ``token``; ``0`` for an empty token (full sync)."""
+    if not token:
+        return 0
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        seq, issued_at = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        seq, issued_at = int(seq), int(issued_at)
+    except Exception:
+        raise TokenError('Invalid sync token')
+    # Older tombstones may be pruned already (prune_sync_changes).
+    if issued_at < time.time() - _setting('SYNC_TOMBSTONE_DAYS', 30) * 86400:
+        raise TokenExpired('Sync token expired, sync again without a token')
+    return seq
+
+
+def visible_project_ids(user):
+    return set(
+        Project.objects
+        .filter(Q(created_by=user) | Q(pk__in=ProjectMember.objects.filter(user=user).values('project_id')))
+        .values_list('pk', flat=True)
+    )
+
+
+class SyncMemberSerializer(ProjectMemberValuesSerializer):
+    fields = ProjectMemberValuesSerializer.fields + (('project', 'project_id'),)
+
+
+def _serializers(user):
+    # Members are synced as rows of their own.
+    project_fields = [entry[0] for entry in ProjectValuesSerializer.fields]
+    return {
+        Change.PROJECT: (ProjectValuesSerializer.select(project_fields), Project.objects.with_member_counts(user)),
+        Change.MEMBER: (SyncMemberSerializer, ProjectMember.objects.all()),
+        Change.TASK: (TaskValuesSerializer, Task.objects.all()),
+        Change.COMMENT: (CommentValuesSerializer, Comment.objects.all()),
+    }
+
+
+def _settled_seq(rows, since):
+    """The last sequence number before the first row that may still have uncommitted predecessors."""
+    horizon = timezone.now() - timedelta(seconds=_setting('SYNC_SETTLE_SECONDS', 2))
+    seq = since
+    for row in rows:
+        if row['changed_at'] > horizon:
+            break
+        seq = row['id']
+    return seq
+
+
+def changes_since(user, since, context=None, limit=None):
+    """
+    Everything ``user`` has to apply after the sync that returned the token
+    for ``since``. Projects the user joined since then are sent whole;
+    projects they left or that were deleted come back as tombstones.
+    """
+    limit = limit or _setting('SYNC_PAGE_SIZE', 500)
+    visible = visible_project_ids(user)
+    rows = list(
+        Change.objects
+        .filter(Q(project_id__in=visible) | Q(user_id=user.pk), id__gt=since)
+        .order_by('id')
+        .values('id', 'kind', 'object_id', 'project_id', 'user_id', 'deleted', 'changed_at')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    seq = _settled_seq(rows, since)
+    # Latest row per object and project.
+    latest = {(row['kind'], row['object_id'], row['project_id']): row for row in rows}
+
+    live = {kind: set() for kind in KIND_NAMES}
+    deleted = {kind: set() for kind in KIND_NAMES}
+    joined = set()
+    for row in latest.values():
+        if row['deleted'] and not since:
+            # A full sync has nothing to delete.
+            continue
+        if row['kind'] == Change.MEMBER and row['user_id'] == user.pk:
+            if row['deleted'] and row['project_id'] not in visible:
+                deleted[Change.PROJECT].add(row['project_id'])
+            elif not row['deleted'] and since:
+                joined.add(row['project_id'])
+        if row['project_id'] not in visible:
+            # Own rows of projects the user no longer sees: only the removal matters.
+            if row['kind'] == Change.PROJECT:
+                deleted[Change.PROJECT].add(row['project_id'])
+            continue
+        (deleted if row['deleted'] else live)[row['kind']].add(row['object_id'])
+
+    if joined:
+        for kind, object_id in (
+            Change.objects.filter(project_id__in=joined, deleted=False).values_list('kind', 'object_id')
+        ):
+            live[kind].add(object_id)
+
+    changes = {}
+    for kind, (serializer_class, base) in _serializers(user).items():
+        ids = live[kind]
+        if not ids:
+            changes[KIND_NAMES[kind]] = []
+            continue
+        rows_of_kind = serializer_class.values(base.filter(pk__in=ids).order_by('pk'))
+        changes[KIND_NAMES[kind]] = serializer_class(rows_of_kind, many=True, context=context).data
+    return {
+        'token': encode_token(seq),
+        'more': has_more and seq > since,
+        'changes': changes,
+        # A moved task is a tombstone in its old project and a change in the new one.
+        'deleted': {KIND_NAMES[kind]: sorted(ids - live[kind]) for kind, ids in deleted.items()},
+    }
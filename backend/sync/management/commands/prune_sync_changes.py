@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from sync.models import Change
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes sync changes superseded by a later one for the same object, '
+        'and tombstones older than --days (SYNC_TOMBSTONE_DAYS): tokens that '
+        'old are refused, so no client still needs them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'SYNC_TOMBSTONE_DAYS', 30))
+
+    def handle(self, *args, **options):
+        newer = Change.objects.filter(
+            kind=OuterRef('kind'),
+            object_id=OuterRef('object_id'),
+            project_id=OuterRef('project_id'),
+            id__gt=OuterRef('id'),
+        )
+        superseded, _ = Change.objects.filter(Exists(newer)).delete()
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        tombstones, _ = Change.objects.filter(deleted=True, changed_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {superseded} superseded changes and {tombstones} tombstones.'
+        ))
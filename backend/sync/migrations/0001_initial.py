@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'project'), (2, 'member'), (3, 'task'), (4, 'comment')])),
+                ('object_id', models.BigIntegerField()),
+                ('project_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField(blank=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'object_id', 'project_id', 'id'], name='sync_change_object_idx'), models.Index(fields=['project_id', 'id'], name='sync_change_project_idx'), models.Index(fields=['user_id', 'id'], name='sync_change_user_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill(apps, schema_editor):
+    """One row per existing object, so a sync without a token returns everything."""
+    Change = apps.get_model('sync', 'Change')
+    sources = [
+        (1, apps.get_model('project', 'Project'), ('id', 'id', 'created_by_id')),
+        (2, apps.get_model('project', 'ProjectMember'), ('id', 'project_id', 'user_id')),
+        (3, apps.get_model('task', 'Task'), ('id', 'project_id', None)),
+        (4, apps.get_model('comment', 'Comment'), ('id', 'project_id', None)),
+    ]
+    db = schema_editor.connection.alias
+    for kind, model, (object_field, project_field, user_field) in sources:
+        fields = [object_field, project_field] + ([user_field] if user_field else [])
+        batch = []
+        for row in model.objects.using(db).order_by('id').values_list(*fields).iterator(chunk_size=BATCH_SIZE):
+            batch.append(Change(
+                kind=kind, object_id=row[0], project_id=row[1], user_id=row[2] if user_field else None,
+            ))
+            if len(batch) == BATCH_SIZE:
+                Change.objects.using(db).bulk_create(batch)
+                batch = []
+        Change.objects.using(db).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0001_initial'),
+        ('comment', '0004_query_indexes'),
+        ('project', '0002_query_indexes'),
+        ('task', '0003_status_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import models
+
+
+class Change(models.Model):
+    """
+    A change of a synced object (``sync.changes``); ``id`` is its position in
+    the change sequence. Rows superseded by a later one for the same object
+    and project are redundant and pruned.
+    """
+    PROJECT = 1
+    MEMBER = 2
+    TASK = 3
+    COMMENT = 4
+    KIND_CHOICES = [
+        (PROJECT, 'project'),
+        (MEMBER, 'member'),
+        (TASK, 'task'),
+        (COMMENT, 'comment'),
+    ]
+
+    kind = models.PositiveSmallIntegerField(choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    project_id = models.BigIntegerField()
+    # Projects: the creator; members: the member. They get the row even
+    # after losing access to the project.
+    user_id = models.BigIntegerField(null=True, blank=True)
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'object_id', 'project_id', 'id'], name='sync_change_object_idx'),
+            models.Index(fields=['project_id', 'id'], name='sync_change_project_idx'),
+            models.Index(fields=['user_id', 'id'], name='sync_change_user_idx'),
+        ]
+
+    def __str__(self):
+        state = 'deleted' if self.deleted else 'changed'
+        return f"{self.get_kind_display()} {self.object_id} {state} (#{self.pk})"
@@ -0,0 +1,88 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from comment.models import Comment
+from project.models import Project, ProjectMember
+from project.signals import project_imported
+from task.models import Task
+from task.signals import tasks_bulk_saved
+
+from . import changes
+
+
+def _deleting_project(origin):
+    # Tasks and comments of a deleted project leave no tombstones of their own.
+    if isinstance(origin, QuerySet):
+        return origin.model is Project
+    return isinstance(origin, Project)
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    changes.record_projects([instance])
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    changes.record_project_deleted(instance)
+
+
+@receiver(post_save, sender=ProjectMember)
+def member_saved(sender, instance, **kwargs):
+    changes.record_members([instance])
+
+
+@receiver(post_delete, sender=ProjectMember)
+def member_deleted(sender, instance, **kwargs):
+    changes.record_members([instance], deleted=True)
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, **kwargs):
+    changes.record_tasks([instance])
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def tasks_bulk_changed(sender, created=(), updated=(), **kwargs):
+    changes.record_tasks(list(created) + list(updated))
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleting_project(origin):
+        changes.record_tasks([instance], deleted=True)
+
+
+@receiver(pre_delete, sender='core.User')
+def assignee_deleting(sender, instance, **kwargs):
+    # SET_NULL on Task.assigned_to is a queryset update without signals.
+    instance._sync_assigned_task_ids = list(
+        Task.objects.filter(assigned_to_id=instance.pk).values_list('pk', flat=True)
+    )
+
+
+@receiver(post_delete, sender='core.User')
+def assignee_deleted(sender, instance, **kwargs):
+    task_ids = getattr(instance, '_sync_assigned_task_ids', None)
+    if task_ids:
+        # Tasks the user created went with them and have tombstones already.
+        changes.record_task_rows(
+            Task.objects.filter(pk__in=task_ids, assigned_to__isnull=True).values_list('pk', 'project_id')
+        )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, **kwargs):
+    changes.record_comments([instance])
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleting_project(origin):
+        changes.record_comments([instance], deleted=True)
+
+
+@receiver(project_imported)
+def project_imported_changes(sender, project, **kwargs):
+    changes.record_project(project)
@@ -0,0 +1,237 @@
+import base64
+import json
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from comment.models import Comment
+from core.models import User
+from core.testing import QueryPlanMixin
+from project.models import Project, ProjectMember
+from task.bulk import apply_operations
+from task.models import Task
+from .changes import changes_since, decode_token
+from .models import Change
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncTests(QueryPlanMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.other = User.objects.create_user(username='other')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        ProjectMember.objects.create(project=self.project, user=self.user, role='OWNER')
+        self.task = Task.objects.create(description='Write docs', project=self.project, created_by=self.user)
+        self.comment = Comment.objects.create(project=self.project, author=self.user, text='Hi')
+        self.foreign = Project.objects.create(title='Foreign', description='', created_by=self.other)
+        Task.objects.create(description='Not mine', project=self.foreign, created_by=self.other)
+        self.client.force_authenticate(self.user)
+
+    def sync(self, token=None, user=None, **params):
+        if user is not None:
+            self.client.force_authenticate(user)
+        if token is not None:
+            params['since'] = token
+        response = self.client.get(reverse('sync'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def ids(self, data, kind):
+        return [item['id'] for item in data['changes'][kind]]
+
+    def test_full_sync_returns_visible_rows(self):
+        data = self.sync()
+        self.assertEqual(self.ids(data, 'projects'), [self.project.pk])
+        self.assertEqual(self.ids(data, 'tasks'), [self.task.pk])
+        self.assertEqual(self.ids(data, 'comments'), [self.comment.pk])
+        self.assertEqual(data['changes']['members'][0]['project'], self.project.pk)
+        self.assertEqual(data['changes']['projects'][0]['user_role'], 'OWNER')
+        self.assertNotIn('members', data['changes']['projects'][0])
+        self.assertFalse(data['more'])
+
+    def test_incremental_sync_returns_only_changes(self):
+        token = self.sync()['token']
+        self.assertEqual(self.sync(token)['changes'], {'projects': [], 'members': [], 'tasks': [], 'comments': []})
+
+        self.task.status = 'DONE'
+        self.task.save()
+        data = self.sync(token)
+        self.assertEqual(data['changes']['tasks'][0]['status'], 'DONE')
+        self.assertEqual(self.ids(data, 'projects'), [])
+        self.assertEqual(self.sync(data['token'])['changes']['tasks'], [])
+
+    def test_query_count_does_not_depend_on_dataset_size(self):
+        token = self.sync()['token']
+        Task.objects.bulk_create(
+            Task(description=f'Old {i}', project=self.project, created_by=self.user) for i in range(50)
+        )
+        self.task.save()
+        # Visible projects, changes, one query per changed kind.
+        with self.assertNumQueries(3):
+            data = changes_since(self.user, decode_token(token))
+        self.assertEqual(self.ids(data, 'tasks'), [self.task.pk])
+
+    def test_repeated_edits_are_sent_once(self):
+        token = self.sync()['token']
+        for status in ('IN_PROGRESS', 'NEEDS_REVIEW', 'DONE'):
+            self.task.status = status
+            self.task.save()
+        data = self.sync(token)
+        self.assertEqual(self.ids(data, 'tasks'), [self.task.pk])
+        self.assertEqual(data['changes']['tasks'][0]['status'], 'DONE')
+
+    def test_delete_after_edit_wins_in_full_sync(self):
+        self.task.save()
+        self.task.delete()
+        self.assertEqual(self.sync()['changes']['tasks'], [])
+
+    def test_write_costs_one_insert(self):
+        self.task.status = 'DONE'
+        with CaptureQueriesContext(connection) as queries:
+            self.task.save()
+        logged = [query['sql'] for query in queries if 'sync_change' in query['sql']]
+        self.assertEqual(len(logged), 1)
+        self.assertIn('INSERT INTO', logged[0])
+
+    def test_deletes_leave_tombstones(self):
+        token = self.sync()['token']
+        task_id, comment_id = self.task.pk, self.comment.pk
+        self.client.delete(reverse('task-delete', args=[task_id]))
+        self.client.delete(reverse('comment-delete', args=[comment_id]))
+        data = self.sync(token)
+        self.assertEqual(data['deleted']['tasks'], [task_id])
+        self.assertEqual(data['deleted']['comments'], [comment_id])
+        # A full sync has nothing to delete.
+        self.assertEqual(self.sync()['deleted']['tasks'], [])
+
+    def test_project_delete_reaches_creator_and_members(self):
+        ProjectMember.objects.create(project=self.project, user=self.other, role='MEMBER')
+        tokens = {user.pk: self.sync(user=user)['token'] for user in (self.user, self.other)}
+        project_id = self.project.pk
+        self.client.force_authenticate(self.user)
+        self.client.delete(reverse('project-delete', args=[project_id]))
+
+        for user in (self.user, self.other):
+            data = self.sync(tokens[user.pk], user=user)
+            self.assertEqual(data['deleted']['projects'], [project_id])
+        # Tasks and comments go with the project.
+        self.assertFalse(Change.objects.filter(project_id=project_id, kind__in=[Change.TASK, Change.COMMENT]).exists())
+
+    def test_deleted_assignee_is_cleared_on_clients(self):
+        assignee = User.objects.create_user(username='assignee')
+        ProjectMember.objects.create(project=self.project, user=assignee, role='MEMBER')
+        Task.objects.filter(pk=self.task.pk).update(assigned_to=assignee)
+        own = Task.objects.create(description='Own', project=self.project, created_by=assignee, assigned_to=assignee)
+        token = self.sync()['token']
+
+        assignee.delete()
+        data = self.sync(token)
+        self.assertEqual(self.ids(data, 'tasks'), [self.task.pk])
+        self.assertIsNone(data['changes']['tasks'][0]['assigned_to'])
+        self.assertEqual(data['deleted']['tasks'], [own.pk])
+
+    def test_joining_a_project_sends_it_whole(self):
+        token = self.sync()['token']
+        ProjectMember.objects.create(project=self.foreign, user=self.user, role='MEMBER')
+        data = self.sync(token)
+        self.assertIn(self.foreign.pk, self.ids(data, 'projects'))
+        self.assertEqual(len(data['changes']['tasks']), 1)
+        self.assertEqual(data['changes']['tasks'][0]['description'], 'Not mine')
+
+    def test_leaving_a_project_sends_a_tombstone(self):
+        member = ProjectMember.objects.create(project=self.foreign, user=self.user, role='MEMBER')
+        token = self.sync()['token']
+        member.delete()
+        data = self.sync(token)
+        self.assertEqual(data['deleted']['projects'], [self.foreign.pk])
+        self.assertEqual(data['changes']['tasks'], [])
+
+    def test_moved_task_is_removed_from_old_project(self):
+        ProjectMember.objects.create(project=self.foreign, user=self.user, role='MEMBER')
+        other_token = self.sync(user=self.other)['token']
+        token = self.sync(user=self.user)['token']
+        self.task.project = self.foreign
+        self.task.save()
+
+        # Sees both projects: the task is a change, not a deletion.
+        data = self.sync(token, user=self.user)
+        self.assertEqual(self.ids(data, 'tasks'), [self.task.pk])
+        self.assertEqual(data['deleted']['tasks'], [])
+
+        self.task.project = self.project
+        self.task.save()
+        data = self.sync(other_token, user=self.other)
+        self.assertEqual(data['deleted']['tasks'], [self.task.pk])
+
+    def test_bulk_operations_and_import_are_recorded(self):
+        token = self.sync()['token']
+        ok, _ = apply_operations([
+            {'op': 'create', 'data': {'description': 'Bulk', 'project': self.project.pk}},
+            {'op': 'update', 'id': self.task.pk, 'data': {'status': 'DONE'}},
+        ], self.user)
+        self.assertTrue(ok)
+        data = self.sync(token)
+        self.assertEqual(sorted(item['description'] for item in data['changes']['tasks']), ['Bulk', 'Write docs'])
+
+        export = self.client.get(reverse('project-export', args=[self.project.pk]))
+        body = b''.join(export.streaming_content)
+        response = self.client.post(reverse('project-import'), body, content_type='application/x-ndjson')
+        data = self.sync(data['token'])
+        self.assertEqual(self.ids(data, 'projects'), [response.data['id']])
+        self.assertEqual(len(data['changes']['tasks']), 2)
+
+    def test_pages_follow_the_sequence(self):
+        Task.objects.bulk_create(
+            Task(description=f'Task {i}', project=self.project, created_by=self.user) for i in range(4)
+        )
+        token = self.sync()['token']
+        for task in Task.objects.filter(project=self.project):
+            task.save()
+        with self.settings(SYNC_PAGE_SIZE=2):
+            seen = []
+            while True:
+                data = self.sync(token)
+                seen += self.ids(data, 'tasks')
+                token = data['token']
+                if not data['more']:
+                    break
+        self.assertEqual(sorted(seen), sorted(Task.objects.filter(project=self.project).values_list('pk', flat=True)))
+
+    @override_settings(SYNC_SETTLE_SECONDS=60)
+    def test_token_waits_for_recent_changes_to_settle(self):
+        token = self.sync()['token']
+        self.task.save()
+        data = self.sync(token)
+        self.assertEqual(self.ids(data, 'tasks'), [self.task.pk])
+        # Sent again until it is old enough that nothing can commit before it.
+        self.assertEqual(data['token'], token)
+
+    def test_bad_and_expired_tokens(self):
+        response = self.client.get(reverse('sync'), {'since': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+        old = base64.urlsafe_b64encode(json.dumps([1, int(time.time()) - 90 * 86400]).encode()).decode()
+        response = self.client.get(reverse('sync'), {'since': old})
+        self.assertEqual(response.status_code, 410)
+
+    def test_prune_superseded_changes_and_old_tombstones(self):
+        token = self.sync()['token']
+        for _ in range(3):
+            self.task.save()
+        self.comment.delete()
+        Change.objects.filter(deleted=True).update(changed_at='2000-01-01T00:00:00Z')
+        call_command('prune_sync_changes', stdout=StringIO())
+        self.assertEqual(Change.objects.filter(kind=Change.TASK, object_id=self.task.pk).count(), 1)
+        self.assertFalse(Change.objects.filter(deleted=True).exists())
+        self.assertEqual(self.ids(self.sync(token), 'tasks'), [self.task.pk])
+
+    def test_changes_query_uses_index(self):
+        self.assertUsesIndex(
+            Change.objects.filter(project_id__in=[self.project.pk], id__gt=10).order_by('id'),
+            'sync_change_project_idx',
+        )
@@ -0,0 +1,17 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from .changes import TokenError, TokenExpired, changes_since, decode_token
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync(request):
+    try:
+        since = decode_token(request.query_params.get('since'))
+    except TokenExpired as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_410_GONE)
+    except TokenError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(changes_since(request.user, since, context={'request': request}))
@@ -0,0 +1,158 @@
+"""
+Flow metrics of a project, computed by the database from the status log
+(``TaskStatusChange``). Every query is a range scan of the project's log on
+its ``(project, changed_at)`` or ``(project, to_status, changed_at)`` index,
+so the cost follows the size of the period, not of the whole history.
+Durations are in seconds.
+"""
+from datetime import timedelta
+
+from django.db.models import (
+    Avg, Count, DurationField, ExpressionWrapper, F, Func, Min, OuterRef, Q, Subquery, Sum, Window,
+)
+from django.db.models.functions import CumeDist, TruncDate, TruncWeek
+from django.utils import timezone
+
+from .models import Task, TaskStatusChange, TaskStatusCounter
+
+STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+DONE = 'DONE'
+PERCENTILES = (50, 85, 95)
+
+
+class RunningTotal(Func):
+    """``SUM`` over an aggregate, for ``Window``: Django's ``Sum`` refuses aggregates."""
+    function = 'SUM'
+    window_compatible = True
+
+
+def _seconds(value):
+    return value.total_seconds() if value is not None else None
+
+
+def _duration(end, start):
+    return ExpressionWrapper(F(end) - F(start), output_field=DurationField())
+
+
+def _log(project_id, since, until):
+    return TaskStatusChange.objects.filter(project_id=project_id, changed_at__gte=since, changed_at__lt=until)
+
+
+def _completions(project_id, since, until):
+    # Moves of finished tasks between projects are not completions.
+    return _log(project_id, since, until).filter(to_status=DONE).exclude(from_status='')
+
+
+def time_in_status(project_id, since, until):
+    """Stays that ended in the period, per status: how many, total and average time."""
+    duration = _duration('changed_at', 'entered_at')
+    rows = (
+        _log(project_id, since, until)
+        .exclude(from_status='').exclude(to_status='').filter(entered_at__isnull=False)
+        .values('from_status')
+        .annotate(transitions=Count('id'), total=Sum(duration))
+        .order_by()
+    )
+    stays = {row['from_status']: (row['transitions'], _seconds(row['total'])) for row in rows}
+    result = []
+    for status in STATUSES:
+        transitions, total = stays.get(status, (0, 0))
+        result.append({
+            'status': status,
+            'transitions': transitions,
+            'total_seconds': total,
+            'average_seconds': total / transitions if transitions else None,
+        })
+    return result
+
+
+def cycle_time(project_id, since, until):
+    """
+    Time from the first move out of TODO to DONE for the tasks finished in
+    the period. Percentiles come from ``CUME_DIST()`` over the cycle times.
+    """
+    started = (
+        TaskStatusChange.objects
+        .filter(task_id=OuterRef('task_id'), changed_at__lte=OuterRef('changed_at'))
+        .exclude(to_status__in=('', 'TODO'))
+        .order_by('changed_at', 'id')
+        .values('changed_at')[:1]
+    )
+    completions = (
+        _completions(project_id, since, until)
+        .annotate(started_at=Subquery(started))
+        .annotate(cycle=_duration('changed_at', 'started_at'))
+        .annotate(rank=Window(CumeDist(), order_by=F('cycle').asc()))
+    )
+    stats = completions.aggregate(
+        completed=Count('id'),
+        average=Avg('cycle'),
+        **{f'p{p}': Min('cycle', filter=Q(rank__gte=p / 100)) for p in PERCENTILES},
+    )
+    return {
+        'completed': stats['completed'],
+        'average_seconds': _seconds(stats['average']),
+        **{f'p{p}_seconds': _seconds(stats[f'p{p}']) for p in PERCENTILES},
+    }
+
+
+def throughput(project_id, since, until):
+    """Tasks finished per week (weeks start on Monday), empty weeks included."""
+    rows = (
+        _completions(project_id, since, until)
+        .annotate(week=TruncWeek('changed_at'))
+        .values('week')
+        .annotate(completed=Count('id'))
+        .order_by()
+    )
+    counts = {row['week'].date(): row['completed'] for row in rows}
+    start = timezone.localtime(since).date()
+    week = start - timedelta(days=start.weekday())
+    last = timezone.localtime(until - timedelta(microseconds=1)).date()
+    weeks = []
+    while week <= last:
+        weeks.append({'week': week.isoformat(), 'completed': counts.get(week, 0)})
+        week += timedelta(days=7)
+    return weeks
+
+
+def cumulative_flow(project_id, since, until):
+    """
+    Tasks in each status at the end of every day of the period. The counts
+    before the period are the counters minus what changed since; within it,
+    one GROUP BY per day with a running ``SUM() OVER (ORDER BY day)``.
+    """
+    net = {
+        status: Count('id', filter=Q(to_status=status)) - Count('id', filter=Q(from_status=status))
+        for status in STATUSES
+    }
+    changed = TaskStatusChange.objects.filter(project_id=project_id, changed_at__gte=since).aggregate(**net)
+    current = dict(
+        TaskStatusCounter.objects.filter(project_id=project_id)
+        .values('status').annotate(total=Sum('count')).values_list('status', 'total')
+    )
+    opening = {status: current.get(status, 0) - (changed[status] or 0) for status in STATUSES}
+
+    daily = {
+        status: Window(RunningTotal(expression), order_by=F('day').asc())
+        for status, expression in net.items()
+    }
+    rows = (
+        _log(project_id, since, until)
+        .annotate(day=TruncDate('changed_at'))
+        .values('day')
+        .annotate(changes=Count('id'))
+        .annotate(**daily)
+        .order_by()
+    )
+    totals = {row['day']: row for row in rows}
+
+    days = []
+    date = timezone.localtime(since).date()
+    last = timezone.localtime(until - timedelta(microseconds=1)).date()
+    previous = dict.fromkeys(STATUSES, 0)
+    while date <= last:
+        previous = totals.get(date, previous)
+        days.append({'date': date.isoformat(), **{status: opening[status] + previous[status] for status in STATUSES}})
+        date += timedelta(days=1)
+    return days
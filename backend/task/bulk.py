@@ -0,0 +1,139 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task
+from .serializers import TaskSerializer
+from .signals import tasks_bulk_saved
+
+MAX_OPERATIONS = 1000
+OPERATIONS = ('create', 'update', 'move', 'delete')
+
+
+def _task_id(operation):
+    try:
+        return int(operation['id'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _changed(task, name, value):
+    field = Task._meta.get_field(name)
+    if field.is_relation:
+        return getattr(task, field.attname) != (value.pk if value is not None else None)
+    return getattr(task, name) != value
+
+
+class BulkResult:
+    def __init__(self, index, op, task_id=None):
+        self.index = index
+        self.op = op
+        self.task_id = task_id
+        self.errors = None
+
+    def as_dict(self):
+        data = {'index': self.index, 'op': self.op, 'id': self.task_id, 'ok': self.errors is None}
+        if self.errors is not None:
+            data['errors'] = self.errors
+        return data
+
+
+def _validate(items, results, context, partial=False):
+    """
+    Validates ``items`` with ``TaskSerializer`` in list mode and returns the
+    validated data per item, recording errors on ``results``.
+    """
+    if not items:
+        return []
+    serializer = TaskSerializer(data=items, many=True, partial=partial, context=context)
+    if serializer.is_valid():
+        return serializer.validated_data
+    for result, errors in zip(results, serializer.errors):
+        if errors:
+            result.errors = errors
+    return None
+
+
+def apply_operations(operations, user, context=None):
+    """
+    Validates every operation first and, if all are valid, applies them in
+    one transaction: one ``bulk_create``, one ``bulk_update`` per set of
+    changed fields and one ``DELETE``. Returns ``(ok, results)``.
+    """
+    results = []
+    creates, updates, deletes = [], [], []
+    seen = set()
+    for index, operation in enumerate(operations):
+        op = operation.get('op') if isinstance(operation, dict) else None
+        result = BulkResult(index, op, _task_id(operation) if op else None)
+        results.append(result)
+        if op not in OPERATIONS:
+            result.errors = {'op': [f'Must be one of: {", ".join(OPERATIONS)}.']}
+        elif op == 'create':
+            creates.append((result, operation.get('data') or {}))
+        elif result.task_id is None:
+            result.errors = {'id': ['This field is required.']}
+        elif result.task_id in seen:
+            # Кожна задача змінюється одним записом: лічильники й історія рахують її раз
+            result.errors = {'id': ['Task appears in more than one operation.']}
+        elif op == 'delete':
+            seen.add(result.task_id)
+            deletes.append(result)
+        elif op == 'move':
+            seen.add(result.task_id)
+            updates.append((result, {'status': operation.get('status')}))
+        else:
+            seen.add(result.task_id)
+            updates.append((result, operation.get('data') or {}))
+
+    existing = Task.objects.in_bulk(
+        [result.task_id for result, _ in updates] + [result.task_id for result in deletes]
+    )
+    for result in [result for result, _ in updates] + deletes:
+        if result.task_id not in existing and result.errors is None:
+            result.errors = {'id': ['Task not found.']}
+
+    created_data = _validate(
+        [data for _, data in creates], [result for result, _ in creates], context
+    )
+    updated_data = _validate(
+        [data for _, data in updates], [result for result, _ in updates], context, partial=True
+    )
+    if any(result.errors for result in results):
+        return False, [result.as_dict() for result in results]
+
+    now = timezone.now()
+    changed = defaultdict(list)
+    for (result, _), data in zip(updates, updated_data):
+        task = existing[result.task_id]
+        fields = tuple(sorted(
+            name for name, value in data.items() if _changed(task, name, value)
+        ))
+        for name in fields:
+            setattr(task, name, data[name])
+        if 'status' in fields:
+            # pre_save does this for save(); bulk_update sends no signals.
+            task.status_changed_at = now
+            fields += ('status_changed_at',)
+        if fields:
+            task.updated_at = now
+            changed[fields].append(task)
+
+    updated_tasks = [task for tasks in changed.values() for task in tasks]
+    with transaction.atomic():
+        new_tasks = Task.objects.bulk_create(
+            Task(created_by=user, **data) for data in created_data
+        )
+        for fields, tasks in changed.items():
+            Task.objects.bulk_update(tasks, fields + ('updated_at',))
+        tasks_bulk_saved.send(sender=Task, created=new_tasks, updated=updated_tasks)
+        if deletes:
+            Task.objects.filter(pk__in=[result.task_id for result in deletes]).delete()
+
+    for task in new_tasks + updated_tasks:
+        task.snapshot()
+
+    for (result, _), task in zip(creates, new_tasks):
+        result.task_id = task.pk
+    return True, [result.as_dict() for result in results]
@@ -0,0 +1,142 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Task, TaskStatusCounter
+
+
+def _key(values):
+    return (
+        values['project_id'],
+        values['status'],
+        values['assigned_to_id'] or TaskStatusCounter.UNASSIGNED,
+    )
+
+
+def bump(project_id, status, assignee_id, delta):
+    """Adds ``delta`` to one counter with a single ``UPDATE ... SET count = count + delta``."""
+    if not delta:
+        return
+    counters = TaskStatusCounter.objects.filter(
+        project_id=project_id, status=status, assignee_id=assignee_id
+    )
+    if counters.update(count=F('count') + delta) or delta < 0:
+        # A missing row on decrement means its project is being deleted.
+        return
+    try:
+        with transaction.atomic():
+            TaskStatusCounter.objects.create(
+                project_id=project_id, status=status, assignee_id=assignee_id, count=delta
+            )
+    except IntegrityError:
+        counters.update(count=F('count') + delta)
+
+
+def apply_changes(changes):
+    """
+    Moves tasks between counters with one UPDATE per affected counter.
+    ``changes`` holds ``(previous, current)`` dicts of ``Task.TRACKED_FIELDS``,
+    ``None`` standing for a created or deleted task.
+    """
+    deltas = {}
+    for previous, current in changes:
+        old = _key(previous) if previous else None
+        new = _key(current) if current else None
+        if old == new:
+            continue
+        if old:
+            deltas[old] = deltas.get(old, 0) - 1
+        if new:
+            deltas[new] = deltas.get(new, 0) + 1
+    for key, delta in deltas.items():
+        bump(*key, delta)
+
+
+def reassign_to_unassigned(user_id):
+    """Folds a deleted user's counters into the unassigned bucket."""
+    counters = TaskStatusCounter.objects.filter(assignee_id=user_id)
+    for counter in counters:
+        bump(counter.project_id, counter.status, TaskStatusCounter.UNASSIGNED, counter.count)
+    counters.delete()
+
+
+def counted_from_tasks(project_id=None):
+    """Recounts from the task table: ``{(project, status, assignee): count}``."""
+    tasks = Task.objects.all()
+    if project_id is not None:
+        tasks = tasks.filter(project_id=project_id)
+    rows = (
+        tasks.order_by()
+        .values('project_id', 'status', 'assigned_to_id')
+        .annotate(total=Count('id'))
+    )
+    result = {}
+    for row in rows.iterator():
+        key = _key(row)
+        result[key] = result.get(key, 0) + row['total']
+    return result
+
+
+def stored_counters(project_id=None):
+    counters = TaskStatusCounter.objects.exclude(count=0)
+    if project_id is not None:
+        counters = counters.filter(project_id=project_id)
+    return {
+        (row.project_id, row.status, row.assignee_id): row.count
+        for row in counters.iterator()
+    }
+
+
+@transaction.atomic
+def rebuild(project_id=None):
+    counters = TaskStatusCounter.objects.all()
+    if project_id is not None:
+        counters = counters.filter(project_id=project_id)
+    counters.delete()
+    TaskStatusCounter.objects.bulk_create(
+        (
+            TaskStatusCounter(project_id=project, status=status, assignee_id=assignee, count=count)
+            for (project, status, assignee), count in counted_from_tasks(project_id).items()
+        ),
+        batch_size=1000,
+    )
+
+
+def board_summary(project_id):
+    """
+    Counts per status and per assignee come from the counter rows; the
+    overdue count depends on the clock and is read from the
+    (project, status, due_date) index instead.
+    """
+    statuses = {status: 0 for status, _ in Task.STATUS_CHOICES}
+    assignees = {}
+    rows = (
+        TaskStatusCounter.objects
+        .filter(project_id=project_id)
+        .exclude(count=0)
+        .values_list('status', 'assignee_id', 'count')
+    )
+    for status, assignee_id, count in rows:
+        statuses[status] = statuses.get(status, 0) + count
+        counts = assignees.setdefault(assignee_id or None, {})
+        counts[status] = counts.get(status, 0) + count
+
+    overdue = (
+        Task.objects
+        .filter(
+            project_id=project_id,
+            status__in=[status for status in statuses if status != 'DONE'],
+            due_date__lt=timezone.now(),
+        )
+        .count()
+    )
+    return {
+        'project': project_id,
+        'total': sum(statuses.values()),
+        'statuses': statuses,
+        'overdue': overdue,
+        'assignees': [
+            {'user': user_id, 'total': sum(counts.values()), 'statuses': counts}
+            for user_id, counts in sorted(assignees.items(), key=lambda item: item[0] or 0)
+        ],
+    }
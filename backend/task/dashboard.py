@@ -0,0 +1,109 @@
+"""
+``/api/me/dashboard/``: the tasks assigned to a user across all projects.
+
+Three queries on the ``(assigned_to, status, due_date)`` index: counts per
+project and status, the first tasks of every status, and the open tasks that
+are overdue or due soon. The result is cached per user and dropped by
+``task.signals`` whenever one of the user's tasks changes; overdue and due
+soon depend on the clock as well, so entries also expire after
+``DASHBOARD_CACHE_TIMEOUT`` seconds.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from core.fast_serializers import datetime_repr
+from core.routers import PRIMARY
+
+from .models import Task
+from .serializers import TaskValuesSerializer
+
+CACHE_KEY = 'dashboard:{}'
+DONE = 'DONE'
+STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _first(tasks, partition_by, limit):
+    """
+    Rows of the first ``limit`` tasks by due date in every ``partition_by``
+    group, ranked by ``ROW_NUMBER()`` on the index.
+    """
+    order_by = [F('due_date').asc(nulls_last=True), F('id').asc()]
+    ranked = (
+        tasks.annotate(position=Window(RowNumber(), partition_by=partition_by, order_by=order_by))
+        .filter(position__lte=limit)
+        .values('pk')
+    )
+    return TaskValuesSerializer.values(Task.objects.using(PRIMARY).filter(pk__in=ranked).order_by(*order_by))
+
+
+def build_dashboard(user_id):
+    now = timezone.now()
+    soon = now + timedelta(days=_setting('DASHBOARD_DUE_SOON_DAYS', 3))
+    limit = _setting('DASHBOARD_TASKS_PER_STATUS', 20)
+    # From the primary: a lagging replica would refill what the signals just dropped.
+    tasks = Task.objects.using(PRIMARY).filter(assigned_to_id=user_id)
+    not_done = ~Q(status=DONE)
+
+    counts = (
+        tasks.values('project_id', 'status')
+        .annotate(
+            total=Count('id'),
+            overdue=Count('id', filter=not_done & Q(due_date__lt=now)),
+            due_soon=Count('id', filter=not_done & Q(due_date__gte=now, due_date__lt=soon)),
+        )
+        .order_by()
+    )
+    statuses = dict.fromkeys(STATUSES, 0)
+    projects = {}
+    for row in counts:
+        statuses[row['status']] += row['total']
+        project = projects.setdefault(row['project_id'], {
+            'project': row['project_id'], 'statuses': dict.fromkeys(STATUSES, 0), 'overdue': 0, 'due_soon': 0,
+        })
+        project['statuses'][row['status']] += row['total']
+        project['overdue'] += row['overdue']
+        project['due_soon'] += row['due_soon']
+
+    serializer = TaskValuesSerializer()
+    by_status = {status: [] for status in STATUSES}
+    for row in _first(tasks, F('status'), limit):
+        by_status[row['status']].append(serializer.to_representation(row))
+    overdue, due_soon = [], []
+    is_overdue = ExpressionWrapper(Q(due_date__lt=now), output_field=BooleanField())
+    for row in _first(tasks.filter(not_done, due_date__lt=soon), is_overdue, limit):
+        (overdue if row['due_date'] < now else due_soon).append(serializer.to_representation(row))
+
+    return {
+        'counts': statuses,
+        'tasks': by_status,
+        'overdue': overdue,
+        'due_soon': due_soon,
+        'projects': sorted(projects.values(), key=lambda project: project['project']),
+        'generated_at': datetime_repr(now),
+    }
+
+
+def get_dashboard(user_id):
+    key = CACHE_KEY.format(user_id)
+    dashboard = cache.get(key)
+    if dashboard is None:
+        dashboard = build_dashboard(user_id)
+        cache.set(key, dashboard, _setting('DASHBOARD_CACHE_TIMEOUT', 60))
+    return dashboard
+
+
+def invalidate_dashboards(user_ids):
+    """Drops the users' entries once the change is committed, so no refill sees it unwritten."""
+    keys = [CACHE_KEY.format(user_id) for user_id in set(user_ids) if user_id]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
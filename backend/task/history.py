@@ -0,0 +1,48 @@
+"""
+Status transition log (``TaskStatusChange``), written from ``task.signals``
+next to the counters, so every save, bulk operation and import is covered.
+"""
+from django.utils import timezone
+
+from core.db import insert_rows
+
+from .models import Task, TaskStatusChange
+
+FIELDS = ('task_id', 'project_id', 'from_status', 'to_status', 'entered_at', 'changed_at')
+
+
+def transitions(task_id, previous, current, now):
+    """
+    Log rows for one task, from ``(previous, current)`` dicts of
+    ``Task.TRACKED_FIELDS`` (``None`` for a created or deleted task).
+    """
+    if previous is None:
+        return [(task_id, current['project_id'], '', current['status'], None, current['status_changed_at'] or now)]
+    if current is None:
+        return [(task_id, previous['project_id'], previous['status'], '', previous['status_changed_at'], now)]
+    if previous['project_id'] != current['project_id']:
+        # Leaves one project and arrives in the other.
+        return [
+            (task_id, previous['project_id'], previous['status'], '', previous['status_changed_at'], now),
+            (task_id, current['project_id'], '', current['status'], None, now),
+        ]
+    if previous['status'] != current['status']:
+        return [(
+            task_id, current['project_id'], previous['status'], current['status'],
+            previous['status_changed_at'], current['status_changed_at'] or now,
+        )]
+    return []
+
+
+def record(changes):
+    """``changes`` holds ``(task_id, previous, current)``; one INSERT for all of them."""
+    now = timezone.now()
+    insert_rows(TaskStatusChange, FIELDS, (
+        row for task_id, previous, current in changes for row in transitions(task_id, previous, current, now)
+    ))
+
+
+def record_project(project_id):
+    """Arrival rows for the tasks of a project created with bulk_create (imports)."""
+    tasks = Task.objects.filter(project_id=project_id).values('id', *Task.TRACKED_FIELDS)
+    record((row['id'], None, row) for row in tasks.iterator())
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task import counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the per-status task counters from the task table, or verifies them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, help='Only this project.')
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Compare counters with the task table without changing anything.',
+        )
+
+    def handle(self, *args, **options):
+        project_id = options['project']
+        if not options['verify']:
+            counters.rebuild(project_id)
+            self.stdout.write(self.style.SUCCESS('Task counters rebuilt.'))
+            return
+
+        expected = counters.counted_from_tasks(project_id)
+        stored = counters.stored_counters(project_id)
+        mismatches = sorted(
+            key for key in expected.keys() | stored.keys()
+            if expected.get(key, 0) != stored.get(key, 0)
+        )
+        for project, status, assignee in mismatches:
+            key = (project, status, assignee)
+            self.stdout.write(
+                f'project={project} status={status} assignee={assignee or "-"}: '
+                f'stored {stored.get(key, 0)}, actual {expected.get(key, 0)}'
+            )
+        if mismatches:
+            raise CommandError(f'{len(mismatches)} task counter(s) out of date.')
+        self.stdout.write(self.style.SUCCESS('Task counters are up to date.'))
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_tasks(apps, schema_editor):
+    Task = apps.get_model('task', 'Task')
+    TaskStatusCounter = apps.get_model('task', 'TaskStatusCounter')
+    rows = (
+        Task.objects.order_by()
+        .values('project_id', 'status', 'assigned_to_id')
+        .annotate(total=Count('id'))
+    )
+    TaskStatusCounter.objects.bulk_create(
+        (
+            TaskStatusCounter(
+                project_id=row['project_id'],
+                status=row['status'],
+                assignee_id=row['assigned_to_id'] or 0,
+                count=row['total'],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0002_query_indexes'),
+        ('task', '0002_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('TODO', 'Готові до виконання'), ('IN_PROGRESS', 'В процесі'), ('NEEDS_REVIEW', 'Потребують перевірки'), ('DONE', 'Виконано')], max_length=20)),
+                ('assignee_id', models.BigIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_project_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'due_date'], name='task_project_status_due_idx'),
+        ),
+        migrations.AddField(
+            model_name='taskstatuscounter',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to='project.project'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskstatuscounter',
+            constraint=models.UniqueConstraint(fields=('project', 'status', 'assignee_id'), name='task_counter_unique'),
+        ),
+        migrations.RunPython(count_existing_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Case, F, When
+
+
+def seed_history(apps, schema_editor):
+    """
+    Earlier transitions are unknown: every task arrives in its current
+    status when it was created, and has been in it since its last update.
+    """
+    Task = apps.get_model('task', 'Task')
+    TaskStatusChange = apps.get_model('task', 'TaskStatusChange')
+    Task.objects.update(status_changed_at=Case(
+        When(status='TODO', then=F('created_at')),
+        default=F('updated_at'),
+    ))
+    TaskStatusChange.objects.bulk_create(
+        (
+            TaskStatusChange(task_id=pk, project_id=project_id, to_status=status, changed_at=created_at)
+            for pk, project_id, status, created_at in (
+                Task.objects.order_by('id').values_list('id', 'project_id', 'status', 'created_at').iterator()
+            )
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0002_query_indexes'),
+        ('task', '0003_status_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='status_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='TaskStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('from_status', models.CharField(blank=True, choices=[('TODO', 'Готові до виконання'), ('IN_PROGRESS', 'В процесі'), ('NEEDS_REVIEW', 'Потребують перевірки'), ('DONE', 'Виконано')], default='', max_length=20)),
+                ('to_status', models.CharField(blank=True, choices=[('TODO', 'Готові до виконання'), ('IN_PROGRESS', 'В процесі'), ('NEEDS_REVIEW', 'Потребують перевірки'), ('DONE', 'Виконано')], default='', max_length=20)),
+                ('entered_at', models.DateTimeField(blank=True, null=True)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='project.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'changed_at'], name='task_change_project_idx'), models.Index(fields=['project', 'to_status', 'changed_at'], name='task_change_project_to_idx'), models.Index(fields=['task_id', 'changed_at'], name='task_change_task_idx')],
+            },
+        ),
+        migrations.RunPython(seed_history, migrations.RunPython.noop),
+    ]
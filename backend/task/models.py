@@ -1,6 +1,10 @@
 from django.db import models
+from django.utils import timezone
 
 class Task(models.Model):
+    # Fields whose previous values signal receivers need (counters etc.).
+    TRACKED_FIELDS = ('project_id', 'status', 'assigned_to_id', 'status_changed_at')
+
     STATUS_CHOICES = [
         ('TODO', 'Готові до виконання'),
         ('IN_PROGRESS', 'В процесі'),
@@ -32,8 +36,95 @@ class Task(models.Model):
         default='TODO'
     )
     due_date = models.DateTimeField(null=True, blank=True)
+    # When the task entered its current status (task.signals).
+    status_changed_at = models.DateTimeField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'status', 'due_date'], name='task_project_status_due_idx'),
+            models.Index(fields=['project', 'created_at'], name='task_project_created_idx'),
+            models.Index(fields=['assigned_to', 'status', 'due_date'], name='task_assignee_status_due_idx'),
+            models.Index(fields=['created_by', 'created_at'], name='task_creator_created_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.snapshot()
+
+    def snapshot(self):
+        """Remembers the tracked values as they are stored in the database."""
+        self._loaded_values = {
+            name: self.__dict__.get(name) for name in self.TRACKED_FIELDS
+        }
+
+    @property
+    def loaded_values(self):
+        return getattr(self, '_loaded_values', None)
+
+    def __str__(self):
+        return f"({self.project})"
+
+
+class TaskStatusCounter(models.Model):
+    """
+    Number of tasks per project, status and assignee (0 = unassigned), kept
+    up to date by ``task.signals`` so board summaries never count tasks.
+    """
+    UNASSIGNED = 0
+
+    project = models.ForeignKey(
+        'project.Project',
+        on_delete=models.CASCADE,
+        related_name='task_counters'
+    )
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    assignee_id = models.BigIntegerField(default=UNASSIGNED)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'status', 'assignee_id'],
+                name='task_counter_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.status} {self.assignee_id}: {self.count}"
+
+class TaskStatusChange(models.Model):
+    """
+    Append-only log of status transitions, written by ``task.history``.
+    ``from_status`` is empty when the task arrives in the project (created,
+    imported or moved in) and ``to_status`` when it leaves (deleted or moved
+    out). ``entered_at`` is when the task entered ``from_status``, so a row
+    is a whole stay in that status.
+    """
+    task_id = models.BigIntegerField()
+    project = models.ForeignKey(
+        'project.Project',
+        on_delete=models.CASCADE,
+        related_name='status_changes'
+    )
+    from_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, blank=True, default='')
+    to_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, blank=True, default='')
+    entered_at = models.DateTimeField(null=True, blank=True)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'changed_at'], name='task_change_project_idx'),
+            models.Index(fields=['project', 'to_status', 'changed_at'], name='task_change_project_to_idx'),
+            models.Index(fields=['task_id', 'changed_at'], name='task_change_task_idx'),
+        ]
+
     def __str__(self):
-        return f"({self.project})"
\ No newline at end of file
+        return f"{self.task_id}: {self.from_status or '-'} -> {self.to_status or '-'}"
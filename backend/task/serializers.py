@@ -2,6 +2,10 @@ from rest_framework import serializers
 from .models import Task
 from project.models import Project
 from django.contrib.auth import get_user_model
+from core.fast_serializers import Expansion, ValuesSerializer
+from core.models import MediaFile
+from core.serializers import MediaFileValuesSerializer
+from project.serializers import UserValuesSerializer
 
 User = get_user_model()
 
@@ -31,4 +35,23 @@ class TaskSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ('created_at', 'updated_at', 'created_by')
\ No newline at end of file
+        read_only_fields = ('created_at', 'updated_at', 'created_by')
+
+
+class TaskValuesSerializer(ValuesSerializer):
+    """``TaskSerializer`` output for lists, built from ``values()`` rows."""
+    fields = (
+        ('id', 'id'),
+        ('description', 'description'),
+        ('project', 'project_id'),
+        ('status', 'status'),
+        ('assigned_to', 'assigned_to_id'),
+        ('created_by', 'created_by_id'),
+        ('due_date', 'due_date', 'datetime'),
+        ('created_at', 'created_at', 'datetime'),
+        ('updated_at', 'updated_at', 'datetime'),
+    )
+    expansions = {
+        'assignee': Expansion(UserValuesSerializer, User.objects.all(), 'assigned_to_id', 'id', many=False),
+        'media_files': Expansion(MediaFileValuesSerializer, MediaFile.objects.order_by('id'), 'id', 'task_id'),
+    }
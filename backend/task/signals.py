@@ -0,0 +1,100 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.db.models import QuerySet
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from project.models import Project
+from project.signals import project_imported
+from . import counters, dashboard, history
+from .models import Task
+
+# Sent by the bulk API after bulk_create/bulk_update, which do not send
+# post_save. ``created`` is a list of new tasks, ``updated`` a list of tasks
+# whose ``loaded_values`` still hold the values before the update.
+tasks_bulk_saved = Signal()
+
+
+def _deleting_project(origin):
+    # The project's status log is deleted with it.
+    if isinstance(origin, QuerySet):
+        return origin.model is Project
+    return isinstance(origin, Project)
+
+
+def _current(task):
+    return {name: getattr(task, name) for name in Task.TRACKED_FIELDS}
+
+
+@receiver(pre_save, sender=Task)
+def load_previous_values(sender, instance, **kwargs):
+    # Instances built by hand with an existing pk were never loaded.
+    if instance.pk is None or instance.loaded_values is not None:
+        return
+    instance._loaded_values = (
+        Task.objects.filter(pk=instance.pk).values(*Task.TRACKED_FIELDS).first()
+    )
+
+
+@receiver(pre_save, sender=Task)
+def stamp_status_change(sender, instance, **kwargs):
+    previous = instance.loaded_values
+    if previous is not None and previous['status'] != instance.status:
+        instance.status_changed_at = timezone.now()
+
+
+def _assignees(changes):
+    return [values['assigned_to_id'] for change in changes for values in change if values]
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    previous = None if created else instance.loaded_values
+    counters.apply_changes([(previous, _current(instance))])
+    history.record([(instance.pk, previous, _current(instance))])
+    dashboard.invalidate_dashboards(_assignees([(previous, _current(instance))]))
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    previous = instance.loaded_values or _current(instance)
+    counters.apply_changes([(previous, None)])
+    dashboard.invalidate_dashboards(_assignees([(previous, None)]))
+    if not _deleting_project(origin):
+        history.record([(instance.pk, previous, None)])
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def tasks_bulk_changed(sender, created=(), updated=(), **kwargs):
+    changes = (
+        [(task.pk, None, _current(task)) for task in created]
+        + [(task.pk, task.loaded_values, _current(task)) for task in updated]
+    )
+    counters.apply_changes([(previous, current) for _, previous, current in changes])
+    history.record(changes)
+    dashboard.invalidate_dashboards(_assignees([(previous, current) for _, previous, current in changes]))
+
+
+@receiver(project_imported)
+def project_imported_counters(sender, project, **kwargs):
+    counters.rebuild(project.pk)
+    history.record_project(project.pk)
+    dashboard.invalidate_dashboards(
+        Task.objects.filter(project_id=project.pk, assigned_to__isnull=False)
+        .values_list('assigned_to_id', flat=True).distinct()
+    )
+
+
+@receiver(pre_delete, sender='core.User')
+def assignee_deleting(sender, instance, **kwargs):
+    # SET_NULL is a queryset update that keeps updated_at, which the task
+    # ETag is built from; the user's own tasks are deleted anyway.
+    Task.objects.filter(assigned_to_id=instance.pk).exclude(created_by_id=instance.pk).update(
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_delete, sender='core.User')
+def assignee_deleted(sender, instance, **kwargs):
+    # Runs after the user's own tasks were deleted; the rest were SET_NULL
+    # without signals, so their counters move to the unassigned bucket here.
+    counters.reassign_to_unassigned(instance.pk)
@@ -1,3 +1,740 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from io import StringIO
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.models import User
+from core.streaming import stream_queryset
+from core.testing import QueryPlanMixin
+from project.models import Project
+from . import analytics, counters, dashboard
+from .bulk import apply_operations
+from .models import Task, TaskStatusChange, TaskStatusCounter
+from .serializers import TaskSerializer
+
+
+def streamed(response):
+    """Body of a streaming response, whether served by the sync or the async view."""
+    if response.is_async:
+        async def collect():
+            return b''.join([chunk async for chunk in response.streaming_content])
+        return async_to_sync(collect)()
+    return b''.join(response.streaming_content)
+
+
+class TaskListPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        self.client.force_authenticate(self.user)
+
+    def create_tasks(self, count):
+        Task.objects.bulk_create(
+            Task(description=f'Task {i}', project=self.project, created_by=self.user)
+            for i in range(count)
+        )
+
+    def next_cursor(self, response):
+        link = response.headers.get('Link')
+        if not link:
+            return None
+        url = link[link.index('<') + 1:link.index('>')]
+        return parse_qs(urlparse(url).query)['cursor'][0]
+
+    def test_pages_cover_every_task_once(self):
+        self.create_tasks(7)
+        # Identical timestamps force the id tie-breaker to do the work.
+        Task.objects.update(created_at=timezone.now())
+
+        seen = []
+        params = {'page_size': 3}
+        while True:
+            response = self.client.get(reverse('task-list'), params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(task['id'] for task in response.data)
+            cursor = self.next_cursor(response)
+            if cursor is None:
+                break
+            params['cursor'] = cursor
+
+        self.assertEqual(seen, list(Task.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_default_page_size_bounds_response(self):
+        self.create_tasks(105)
+        response = self.client.get(reverse('task-list'))
+        self.assertEqual(len(response.data), 100)
+        self.assertIsNotNone(self.next_cursor(response))
+
+    def test_by_project_is_paginated(self):
+        self.create_tasks(3)
+        url = reverse('task-list-by-project', args=[self.project.pk])
+        response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(len(response.data), 2)
+        response = self.client.get(url, {'page_size': 2, 'cursor': self.next_cursor(response)})
+        self.assertEqual(len(response.data), 1)
+        self.assertNotIn('Link', response.headers)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('task-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskListStreamingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        self.client.force_authenticate(self.user)
+        Task.objects.bulk_create(
+            Task(description=f'Task {i}', project=self.project, created_by=self.user)
+            for i in range(5)
+        )
+        self.url = reverse('task-list-by-project', args=[self.project.pk])
+
+    def test_stream_json_matches_serializer(self):
+        response = self.client.get(self.url, {'stream': '1'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = json.loads(streamed(response))
+        expected = TaskSerializer(Task.objects.order_by('id'), many=True).data
+        self.assertEqual(data, json.loads(json.dumps(expected)))
+
+    def test_stream_ndjson_via_accept_header(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/x-ndjson')
+        self.assertTrue(response.streaming)
+        lines = streamed(response).decode().splitlines()
+        self.assertEqual([json.loads(line)['description'] for line in lines],
+                         [f'Task {i}' for i in range(5)])
+
+    def test_stream_empty_project(self):
+        Task.objects.all().delete()
+        response = self.client.get(self.url, {'stream': '1'})
+        self.assertEqual(json.loads(streamed(response)), [])
+
+    def test_stream_batches_rows(self):
+        response = stream_queryset(Task.objects.order_by('id'), TaskSerializer, chunk_size=2)
+        data = json.loads(streamed(response))
+        self.assertEqual(len(data), 5)
+
+
+class TaskConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        project = Project.objects.create(title='Board', description='', created_by=self.user)
+        self.task = Task.objects.create(description='Task', project=project, created_by=self.user)
+        self.client.force_authenticate(self.user)
+        self.url = reverse('task', args=[self.task.pk])
+
+    def test_validators_and_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_modified_task_is_served(self):
+        etag = self.client.get(self.url)['ETag']
+        self.task.status = 'DONE'
+        self.task.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'DONE')
+
+    def test_unassigned_by_user_delete_is_served(self):
+        assignee = User.objects.create_user(username='assignee')
+        self.task.assigned_to = assignee
+        self.task.save()
+        etag = self.client.get(self.url)['ETag']
+        assignee.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['assigned_to'])
+
+    def test_etag_follows_the_representation(self):
+        response = self.client.get(self.url)
+        self.assertIn('Accept', response['Vary'])
+        etags = {
+            response['ETag'],
+            self.client.get(self.url, {'fields': 'id,status'})['ETag'],
+            self.client.get(self.url, HTTP_ACCEPT='application/json; indent=2')['ETag'],
+        }
+        self.assertEqual(len(etags), 3)
+
+    def test_expansions_named_in_fields_skip_the_etag(self):
+        self.assertIn('ETag', self.client.get(self.url, {'fields': 'id,status'}))
+        for params in ({'fields': 'id,assignee'}, {'expand': 'media_files'}):
+            self.assertNotIn('ETag', self.client.get(self.url, params))
+
+
+class TaskIndexTests(QueryPlanMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+
+    def test_board_columns_use_project_status_index(self):
+        self.assertUsesIndex(
+            Task.objects.filter(project=self.project, status='TODO'),
+            'task_project_status_due_idx',
+        )
+
+    def test_assignee_due_dates_use_assignee_index(self):
+        self.assertUsesIndex(
+            Task.objects.filter(assigned_to=self.user, status='TODO', due_date__lt=timezone.now()),
+            'task_assignee_status_due_idx',
+        )
+
+    def test_dashboard_counts_search_by_assignee(self):
+        # Either assignee index will do; the planner picks one by statistics.
+        plan = self.explain(
+            Task.objects.filter(assigned_to=self.user).values('project_id', 'status').annotate(Count('id'))
+        )
+        self.assertNotIn('SCAN task_task', plan)
+
+    def test_project_pages_use_project_created_index(self):
+        self.assertUsesIndex(
+            Task.objects.filter(project=self.project).order_by('created_at', 'id'),
+            'task_project_created_idx',
+        )
+
+    def test_creator_pages_use_creator_index(self):
+        self.assertUsesIndex(
+            Task.objects.filter(created_by=self.user).order_by('created_at', 'id'),
+            'task_creator_created_idx',
+        )
+
+
+class TaskBulkTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        self.client.force_authenticate(self.user)
+        self.url = reverse('task-bulk')
+
+    def create_tasks(self, count):
+        return Task.objects.bulk_create(
+            Task(description=f'Task {i}', project=self.project, created_by=self.user)
+            for i in range(count)
+        )
+
+    def test_many_moves_cost_a_handful_of_queries(self):
+        tasks = self.create_tasks(500)
+        operations = [{'op': 'move', 'id': task.pk, 'status': 'DONE'} for task in tasks]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, operations, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        statements = [
+            query for query in context.captured_queries
+            if 'SAVEPOINT' not in query['sql']
+        ]
+        # Plus one INSERT into the status log for all 500 moves.
+        self.assertLessEqual(len(statements), 11)
+        self.assertTrue(all(item['ok'] for item in response.data['results']))
+        self.assertEqual(Task.objects.filter(status='DONE').count(), 500)
+        self.assertEqual(TaskStatusChange.objects.filter(to_status='DONE', from_status='TODO').count(), 500)
+
+    def test_mixed_operations(self):
+        keep, remove = self.create_tasks(2)
+        operations = {'operations': [
+            {'op': 'create', 'data': {'description': 'New', 'project': self.project.pk}},
+            {'op': 'update', 'id': keep.pk, 'data': {'description': 'Edited', 'assigned_to': self.user.pk}},
+            {'op': 'delete', 'id': remove.pk},
+        ]}
+
+        response = self.client.post(self.url, operations, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        created = Task.objects.get(pk=results[0]['id'])
+        self.assertEqual(created.created_by, self.user)
+        keep.refresh_from_db()
+        self.assertEqual(keep.description, 'Edited')
+        self.assertEqual(keep.assigned_to, self.user)
+        self.assertFalse(Task.objects.filter(pk=remove.pk).exists())
+
+    def test_unchanged_fields_are_not_written(self):
+        task, = self.create_tasks(1)
+        before = Task.objects.get(pk=task.pk).updated_at
+        response = self.client.post(self.url, [{'op': 'move', 'id': task.pk, 'status': 'TODO'}], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.get(pk=task.pk).updated_at, before)
+
+    def test_invalid_operation_applies_nothing(self):
+        task, other = self.create_tasks(2)
+        operations = [
+            {'op': 'move', 'id': task.pk, 'status': 'DONE'},
+            {'op': 'move', 'id': other.pk, 'status': 'BOGUS'},
+            {'op': 'delete', 'id': 0},
+            {'op': 'rename'},
+        ]
+
+        response = self.client.post(self.url, operations, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        ok = [item['ok'] for item in response.data['results']]
+        self.assertEqual(ok, [True, False, False, False])
+        self.assertIn('status', response.data['results'][1]['errors'])
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'TODO')
+
+    def test_repeated_task_is_rejected(self):
+        task = Task.objects.create(description='Task', project=self.project, created_by=self.user)
+        operations = [
+            {'op': 'move', 'id': task.pk, 'status': 'IN_PROGRESS'},
+            {'op': 'move', 'id': task.pk, 'status': 'DONE'},
+            {'op': 'delete', 'id': task.pk},
+        ]
+
+        response = self.client.post(self.url, operations, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([item['ok'] for item in response.data['results']], [True, False, False])
+        self.assertIn('id', response.data['results'][1]['errors'])
+        self.assertEqual(Task.objects.get(pk=task.pk).status, 'TODO')
+        self.assertEqual(counters.stored_counters(), counters.counted_from_tasks())
+        self.assertFalse(TaskStatusChange.objects.exclude(from_status='').exists())
+
+    def test_requires_operations(self):
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class BoardCounterTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.other = User.objects.create_user(username='other')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        self.client.force_authenticate(self.user)
+
+    def assertCountersMatchTasks(self):
+        self.assertEqual(counters.stored_counters(), counters.counted_from_tasks())
+
+    def summary(self):
+        response = self.client.get(reverse('board-summary', args=[self.project.pk]))
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_counters_follow_single_task_changes(self):
+        task = Task.objects.create(description='A', project=self.project, created_by=self.user)
+        Task.objects.create(description='B', project=self.project, created_by=self.user,
+                            assigned_to=self.other, status='IN_PROGRESS')
+        self.assertCountersMatchTasks()
+
+        task = Task.objects.get(pk=task.pk)
+        task.status = 'DONE'
+        task.assigned_to = self.other
+        task.save()
+        self.assertCountersMatchTasks()
+
+        Task(pk=task.pk, description='A', project=self.project, created_by=self.user,
+             status='TODO', created_at=task.created_at).save()
+        self.assertCountersMatchTasks()
+
+        Task.objects.get(pk=task.pk).delete()
+        self.assertCountersMatchTasks()
+
+    def test_counters_follow_bulk_api(self):
+        tasks = Task.objects.bulk_create(
+            Task(description=str(i), project=self.project, created_by=self.user) for i in range(4)
+        )
+        counters.rebuild()
+        operations = [{'op': 'move', 'id': task.pk, 'status': 'DONE'} for task in tasks[:3]]
+        operations += [
+            {'op': 'delete', 'id': tasks[3].pk},
+            {'op': 'create', 'data': {'description': 'new', 'project': self.project.pk,
+                                      'assigned_to': self.other.pk}},
+        ]
+        response = self.client.post(reverse('task-bulk'), operations, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertCountersMatchTasks()
+
+    def test_board_summary(self):
+        Task.objects.create(description='A', project=self.project, created_by=self.user)
+        Task.objects.create(description='B', project=self.project, created_by=self.user,
+                            assigned_to=self.other, due_date=timezone.now() - timedelta(days=1))
+        Task.objects.create(description='C', project=self.project, created_by=self.user,
+                            assigned_to=self.other, status='DONE',
+                            due_date=timezone.now() - timedelta(days=1))
+
+        with self.assertNumQueries(2):
+            data = counters.board_summary(self.project.pk)
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(data['statuses'], {'TODO': 2, 'IN_PROGRESS': 0, 'NEEDS_REVIEW': 0, 'DONE': 1})
+        self.assertEqual(data['overdue'], 1)
+        self.assertEqual(data['assignees'], [
+            {'user': None, 'total': 1, 'statuses': {'TODO': 1}},
+            {'user': self.other.pk, 'total': 2, 'statuses': {'TODO': 1, 'DONE': 1}},
+        ])
+        self.assertEqual(self.summary(), data)
+
+    def test_deleted_assignee_moves_to_unassigned(self):
+        Task.objects.create(description='A', project=self.project, created_by=self.user,
+                            assigned_to=self.other)
+        Task.objects.create(description='B', project=self.project, created_by=self.other,
+                            assigned_to=self.other)
+        self.other.delete()
+        self.assertCountersMatchTasks()
+
+    def test_project_delete_removes_counters(self):
+        Task.objects.create(description='A', project=self.project, created_by=self.user)
+        self.project.delete()
+        self.assertFalse(TaskStatusCounter.objects.exists())
+
+    def test_rebuild_command_verifies_and_repairs(self):
+        Task.objects.create(description='A', project=self.project, created_by=self.user)
+        TaskStatusCounter.objects.update(count=5)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_task_counters', '--verify', stdout=StringIO())
+        call_command('rebuild_task_counters', stdout=StringIO())
+        call_command('rebuild_task_counters', '--verify', stdout=StringIO())
+        self.assertCountersMatchTasks()
+
+
+class TaskStatusHistoryTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        self.other_project = Project.objects.create(title='Other', description='', created_by=self.user)
+        self.client.force_authenticate(self.user)
+
+    def log(self, task_id):
+        return list(
+            TaskStatusChange.objects.filter(task_id=task_id).order_by('id')
+            .values_list('project_id', 'from_status', 'to_status')
+        )
+
+    def test_status_changes_are_logged(self):
+        task = Task.objects.create(description='A', project=self.project, created_by=self.user)
+        entered_at = task.status_changed_at
+        task.description = 'Not a transition'
+        task.save()
+        self.client.put(reverse('task-edit', args=[task.pk]), {'status': 'IN_PROGRESS'}, format='json')
+
+        self.assertEqual(self.log(task.pk), [
+            (self.project.pk, '', 'TODO'),
+            (self.project.pk, 'TODO', 'IN_PROGRESS'),
+        ])
+        change = TaskStatusChange.objects.get(task_id=task.pk, to_status='IN_PROGRESS')
+        self.assertEqual(change.entered_at, entered_at)
+        task.refresh_from_db()
+        self.assertEqual(task.status_changed_at, change.changed_at)
+
+    def test_moves_and_deletes_are_logged(self):
+        task = Task.objects.create(description='A', project=self.project, created_by=self.user)
+        task_id = task.pk
+        task.project = self.other_project
+        task.save()
+        task.delete()
+        self.assertEqual(self.log(task_id), [
+            (self.project.pk, '', 'TODO'),
+            (self.project.pk, 'TODO', ''),
+            (self.other_project.pk, '', 'TODO'),
+            (self.other_project.pk, 'TODO', ''),
+        ])
+
+    def test_project_delete_drops_its_log(self):
+        Task.objects.create(description='A', project=self.project, created_by=self.user)
+        self.project.delete()
+        self.assertFalse(TaskStatusChange.objects.exists())
+
+    def test_bulk_moves_stamp_the_tasks(self):
+        task = Task.objects.create(description='A', project=self.project, created_by=self.user)
+        ok, _ = apply_operations([{'op': 'move', 'id': task.pk, 'status': 'DONE'}], self.user)
+        self.assertTrue(ok)
+        change = TaskStatusChange.objects.get(task_id=task.pk, to_status='DONE')
+        self.assertEqual(change.entered_at, task.status_changed_at)
+        self.assertEqual(Task.objects.get(pk=task.pk).status_changed_at, change.changed_at)
+
+    def test_import_logs_arrivals(self):
+        Task.objects.create(description='A', project=self.project, created_by=self.user, status='DONE')
+        export = self.client.get(reverse('project-export', args=[self.project.pk]))
+        body = b''.join(export.streaming_content)
+        response = self.client.post(reverse('project-import'), body, content_type='application/x-ndjson')
+        self.assertEqual(
+            list(TaskStatusChange.objects.filter(project_id=response.data['id']).values_list('from_status', 'to_status')),
+            [('', 'DONE')],
+        )
+
+
+class TaskAnalyticsTests(QueryPlanMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        self.client.force_authenticate(self.user)
+        self.start = timezone.make_aware(timezone.datetime(2026, 3, 2, 9))  # Monday
+
+    def at(self, days=0, hours=0):
+        return self.start + timedelta(days=days, hours=hours)
+
+    def change(self, task_id, from_status, to_status, entered_at, changed_at):
+        TaskStatusChange.objects.create(
+            task_id=task_id, project=self.project, from_status=from_status, to_status=to_status,
+            entered_at=entered_at, changed_at=changed_at,
+        )
+
+    def get(self, name, **params):
+        params.setdefault('since', '2026-03-01')
+        params.setdefault('until', '2026-03-31')
+        response = self.client.get(reverse(name, args=[self.project.pk]), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_time_in_status(self):
+        self.change(1, 'TODO', 'IN_PROGRESS', self.at(), self.at(hours=2))
+        self.change(2, 'TODO', 'IN_PROGRESS', self.at(), self.at(hours=4))
+        self.change(1, 'IN_PROGRESS', 'DONE', self.at(hours=2), self.at(days=1, hours=2))
+        # Deleted while in TODO: not a finished stay.
+        self.change(3, 'TODO', '', self.at(), self.at(hours=1))
+
+        statuses = {row['status']: row for row in self.get('analytics-time-in-status')['statuses']}
+        self.assertEqual(statuses['TODO']['transitions'], 2)
+        self.assertEqual(statuses['TODO']['average_seconds'], 3 * 3600)
+        self.assertEqual(statuses['IN_PROGRESS']['total_seconds'], 86400)
+        self.assertEqual(statuses['DONE'], {
+            'status': 'DONE', 'transitions': 0, 'total_seconds': 0, 'average_seconds': None,
+        })
+
+    def test_cycle_time(self):
+        self.change(1, '', 'TODO', None, self.at())
+        self.change(1, 'TODO', 'IN_PROGRESS', self.at(), self.at(days=1))
+        self.change(1, 'IN_PROGRESS', 'DONE', self.at(days=1), self.at(days=3))
+        self.change(2, '', 'IN_PROGRESS', None, self.at(days=1))
+        self.change(2, 'IN_PROGRESS', 'DONE', self.at(days=1), self.at(days=5))
+        # Arrived finished from another project: not a completion.
+        self.change(3, '', 'DONE', None, self.at(days=2))
+
+        data = self.get('analytics-cycle-time')
+        self.assertEqual(data['completed'], 2)
+        self.assertEqual(data['average_seconds'], 3 * 86400)
+        self.assertEqual(data['p50_seconds'], 2 * 86400)
+        self.assertEqual(data['p85_seconds'], 4 * 86400)
+
+    def test_throughput_includes_empty_weeks(self):
+        self.change(1, 'IN_PROGRESS', 'DONE', self.at(), self.at(days=1))
+        self.change(2, 'NEEDS_REVIEW', 'DONE', self.at(), self.at(days=2))
+        self.change(3, 'IN_PROGRESS', 'DONE', self.at(), self.at(days=15))
+
+        weeks = self.get('analytics-throughput', since='2026-03-02', until='2026-03-22')['weeks']
+        self.assertEqual(weeks, [
+            {'week': '2026-03-02', 'completed': 2},
+            {'week': '2026-03-09', 'completed': 0},
+            {'week': '2026-03-16', 'completed': 1},
+        ])
+
+    def test_cumulative_flow(self):
+        first = Task.objects.create(description='A', project=self.project, created_by=self.user)
+        Task.objects.create(description='B', project=self.project, created_by=self.user)
+        first.status = 'DONE'
+        first.save()
+        TaskStatusChange.objects.filter(from_status='').update(changed_at=self.at())
+        TaskStatusChange.objects.filter(to_status='DONE').update(changed_at=self.at(days=2))
+
+        days = self.get('analytics-flow', since='2026-03-01', until='2026-03-04')['days']
+        self.assertEqual([(day['date'], day['TODO'], day['DONE']) for day in days], [
+            ('2026-03-01', 0, 0),
+            ('2026-03-02', 2, 0),
+            ('2026-03-03', 2, 0),
+            ('2026-03-04', 1, 1),
+        ])
+        # Starts from the counters, not from the beginning of the log.
+        days = self.get('analytics-flow', since='2026-03-03', until='2026-03-04')['days']
+        self.assertEqual([(day['TODO'], day['DONE']) for day in days], [(2, 0), (1, 1)])
+
+    def test_bad_periods(self):
+        url = reverse('analytics-flow', args=[self.project.pk])
+        for params in ({'since': 'yesterday'}, {'since': '2026-03-05', 'until': '2026-03-01'},
+                       {'since': '2020-01-01', 'until': '2026-01-01'}):
+            self.assertEqual(self.client.get(url, params).status_code, 400)
+        self.assertEqual(self.client.get(reverse('analytics-flow', args=[0])).status_code, 404)
+
+    def test_queries_use_log_indexes(self):
+        self.assertUsesIndex(
+            analytics._log(self.project.pk, self.at(), self.at(days=7)).order_by('changed_at'),
+            'task_change_project_idx',
+        )
+        self.assertUsesIndex(
+            analytics._completions(self.project.pk, self.at(), self.at(days=7)).order_by('changed_at'),
+            'task_change_project_to_idx',
+        )
+
+
+class DashboardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner')
+        self.other = User.objects.create_user(username='other')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.other)
+        self.second = Project.objects.create(title='Second', description='', created_by=self.other)
+        self.client.force_authenticate(self.user)
+        self.now = timezone.now()
+
+    def task(self, project=None, status='TODO', due_in=None, assignee=None, **kwargs):
+        due_date = self.now + due_in if due_in is not None else None
+        return Task.objects.create(
+            description='Task', project=project or self.project, created_by=self.other,
+            assigned_to=assignee or self.user, status=status, due_date=due_date, **kwargs
+        )
+
+    def dashboard(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_assigned_tasks_grouped_with_counts(self):
+        first = self.task(due_in=timedelta(days=2))
+        self.task(status='IN_PROGRESS')
+        self.task(project=self.second, status='DONE', due_in=-timedelta(days=1))
+        self.task(assignee=self.other)
+        # Created by the user but assigned to someone else: not theirs.
+        Task.objects.create(description='Mine', project=self.project, created_by=self.user)
+
+        data = self.dashboard()
+        self.assertEqual(data['counts'], {'TODO': 1, 'IN_PROGRESS': 1, 'NEEDS_REVIEW': 0, 'DONE': 1})
+        self.assertEqual([task['id'] for task in data['tasks']['TODO']], [first.pk])
+        self.assertEqual(data['tasks']['NEEDS_REVIEW'], [])
+        self.assertEqual([(p['project'], p['statuses']['TODO'], p['statuses']['DONE']) for p in data['projects']], [
+            (self.project.pk, 1, 0), (self.second.pk, 0, 1),
+        ])
+
+    def test_overdue_and_due_soon(self):
+        late = self.task(due_in=-timedelta(hours=1))
+        soon = self.task(status='NEEDS_REVIEW', due_in=timedelta(days=1))
+        self.task(due_in=timedelta(days=30))
+        self.task(status='DONE', due_in=-timedelta(days=1))
+
+        data = self.dashboard()
+        self.assertEqual([task['id'] for task in data['overdue']], [late.pk])
+        self.assertEqual([task['id'] for task in data['due_soon']], [soon.pk])
+        self.assertEqual(data['projects'][0]['overdue'], 1)
+        self.assertEqual(data['projects'][0]['due_soon'], 1)
+
+    @override_settings(DASHBOARD_TASKS_PER_STATUS=2)
+    def test_lists_are_limited_per_status(self):
+        tasks = [self.task(due_in=timedelta(days=days)) for days in (5, 1, 3)]
+        self.task(status='DONE')
+        data = self.dashboard()
+        self.assertEqual([task['id'] for task in data['tasks']['TODO']], [tasks[1].pk, tasks[2].pk])
+        self.assertEqual(len(data['tasks']['DONE']), 1)
+        self.assertEqual(data['counts']['TODO'], 3)
+
+    def test_cached_until_a_task_changes(self):
+        task = self.task()
+        with self.assertNumQueries(3):
+            dashboard.get_dashboard(self.user.pk)
+        with self.assertNumQueries(0):
+            dashboard.get_dashboard(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.status = 'DONE'
+            task.save()
+        self.assertEqual(dashboard.get_dashboard(self.user.pk)['counts']['DONE'], 1)
+
+    def test_previous_and_new_assignees_are_invalidated(self):
+        task = self.task()
+        dashboard.get_dashboard(self.user.pk)
+        dashboard.get_dashboard(self.other.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            ok, _ = apply_operations([{'op': 'update', 'id': task.pk, 'data': {'assigned_to': self.other.pk}}], self.user)
+        self.assertTrue(ok)
+        self.assertEqual(dashboard.get_dashboard(self.user.pk)['counts']['TODO'], 0)
+        self.assertEqual(dashboard.get_dashboard(self.other.pk)['counts']['TODO'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.get(pk=task.pk).delete()
+        self.assertEqual(dashboard.get_dashboard(self.other.pk)['counts']['TODO'], 0)
+
+
+class TaskValuesSerializerParityTests(TestCase):
+    def test_matches_model_serializer(self):
+        from rest_framework.renderers import JSONRenderer
+        from .serializers import TaskValuesSerializer
+
+        user = User.objects.create_user(username='owner')
+        project = Project.objects.create(title='P', description='', created_by=user)
+        Task.objects.create(description='Без виконавця', project=project, created_by=user)
+        Task.objects.create(
+            description='Assigned', project=project, created_by=user, assigned_to=user,
+            status='DONE', due_date=timezone.now() + timedelta(days=3),
+        )
+        tasks = Task.objects.order_by('id')
+        expected = TaskSerializer(tasks, many=True).data
+        actual = TaskValuesSerializer(TaskValuesSerializer.values(tasks), many=True).data
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_list_endpoint_shape_is_unchanged(self):
+        user = User.objects.create_user(username='owner')
+        project = Project.objects.create(title='P', description='', created_by=user)
+        task = Task.objects.create(description='T', project=project, created_by=user)
+        self.client.force_login(user)
+        response = self.client.get(reverse('task-list-by-project', args=[project.pk]))
+        self.assertEqual(response.json(), [json.loads(json.dumps(TaskSerializer(task).data))])
+
+
+class TaskSparseFieldsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', first_name='Олена')
+        self.project = Project.objects.create(title='Board', description='', created_by=self.user)
+        self.client.force_authenticate(self.user)
+        self.url = reverse('task-list-by-project', args=[self.project.pk])
+
+    def create_tasks(self, count):
+        from core.models import MediaFile
+
+        for i in range(count):
+            task = Task.objects.create(
+                description=f'Task {i}', project=self.project, created_by=self.user, assigned_to=self.user
+            )
+            MediaFile.objects.create(
+                file=f'task_media/{i}.txt', file_type='FILE', task=task, uploaded_by=self.user, size=i
+            )
+
+    def test_fields_limit_output_and_columns(self):
+        self.create_tasks(2)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {'fields': 'id,status'})
+        self.assertEqual(set(response.data[0]), {'id', 'status'})
+        page_query = context.captured_queries[-1]['sql']
+        self.assertNotIn('description', page_query)
+
+    def test_expand_costs_one_query_per_expansion(self):
+        self.create_tasks(2)
+        params = {'fields': 'id', 'expand': 'assignee,media_files'}
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, params)
+        self.create_tasks(10)
+        with self.assertNumQueries(len(context.captured_queries)):
+            self.client.get(self.url, params)
+
+        item = response.data[0]
+        self.assertEqual(item['assignee']['first_name'], 'Олена')
+        self.assertEqual(item['media_files'][0]['file'], 'http://testserver/media/task_media/0.txt')
+        self.assertEqual(set(item), {'id', 'assignee', 'media_files'})
+
+    def test_stream_with_expand(self):
+        self.create_tasks(3)
+        response = self.client.get(self.url, {'stream': '1', 'expand': 'media_files'})
+        data = json.loads(streamed(response))
+        self.assertEqual([len(item['media_files']) for item in data], [1, 1, 1])
+
+    def test_detail_fields_and_expand(self):
+        task = Task.objects.create(description='T', project=self.project, created_by=self.user)
+        url = reverse('task', args=[task.pk])
+        self.assertEqual(self.client.get(url, {'fields': 'description'}).data, {'description': 'T'})
+        response = self.client.get(url, {'expand': 'assignee'})
+        self.assertIsNone(response.data['assignee'])
+        self.assertNotIn('ETag', response)
+        self.assertEqual(self.client.get(url, {'fields': 'nope'}).status_code, 400)
@@ -1,11 +1,13 @@
 from django.urls import path
-from . import views
+from core.async_api import read_view
+from . import views, views_async
 
 urlpatterns = [
-    path('', views.task_list, name='task-list'),
-    path('<int:pk>', views.task_detail, name='task'),
+    path('', read_view(views.task_list, views_async.task_list), name='task-list'),
+    path('<int:pk>', read_view(views.task_detail, views_async.task_detail), name='task'),
     path('add/', views.task_add, name='task-add'),
     path('edit/<int:pk>/', views.task_edit, name='task-edit'),
     path('del/<int:pk>/', views.task_delete, name='task-delete'),
-    path('by-project/<int:project_id>/', views.task_list, name='task-list-by-project'),
+    path('bulk/', views.task_bulk, name='task-bulk'),
+    path('by-project/<int:project_id>/', read_view(views.task_list, views_async.task_list), name='task-list-by-project'),
 ]
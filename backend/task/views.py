@@ -1,44 +1,80 @@
-from rest_framework.decorators import api_view, permission_classes
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from .serializers import TaskSerializer
+from rest_framework.settings import api_settings
+from . import analytics
+from .dashboard import get_dashboard
+from .bulk import MAX_OPERATIONS, apply_operations
+from .counters import board_summary as count_board
+from .serializers import TaskSerializer, TaskValuesSerializer
 from .models import Task
+from project.access import get_project_access
 from project.models import Project
+from core.conditional import conditional, untracked_expansions
+from core.pagination import KeysetPagination
+from core.streaming import NDJSONRenderer, stream_format, stream_queryset
+
+def task_list_queryset(request, project_id=None):
+    if project_id is not None:
+        return Task.objects.filter(project_id=project_id)
+
+    user_id = request.query_params.get('user', None)
+    if user_id:
+        return Task.objects.filter(created_by__id=user_id)
+    return Task.objects.all()
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes(api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer])
 def task_list(request, project_id=None):
 
-    if project_id is not None:
-        try:
-            project = Project.objects.get(id=project_id)
-            tasks = Task.objects.filter(project=project)
-        except Project.DoesNotExist:
-            return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
-    else:
+    if project_id is not None and not Project.objects.filter(id=project_id).exists():
+        return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+    tasks = task_list_queryset(request, project_id)
+    serializer_class = TaskValuesSerializer.for_request(request)
 
-        user_id = request.query_params.get('user', None)
-        if user_id:
-            tasks = Task.objects.filter(created_by__id=user_id)
-        else:
-            tasks = Task.objects.all()
+    fmt = stream_format(request)
+    if fmt is not None:
+        return stream_queryset(
+            serializer_class.values(tasks.order_by('id')),
+            serializer_class,
+            fmt=fmt,
+            context={'request': request},
+        )
 
-    serializer = TaskSerializer(tasks, many=True, context={'request': request})
-    return Response(serializer.data)
+    paginator = KeysetPagination(ordering=('created_at', 'id'))
+    page = paginator.paginate_queryset(serializer_class.values(tasks, *paginator.fields), request)
+    serializer = serializer_class(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
+
+def task_validators(request, pk):
+    # The assignee and attachments are not part of the state; responses
+    # with them are not cached.
+    if untracked_expansions(TaskValuesSerializer.for_request(request)):
+        return None
+    updated_at = Task.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return None
+    return (pk, updated_at), updated_at
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(task_validators)
 def task_detail(request, pk):
-    try:
-        task = Task.objects.get(pk=pk)
-        serializer = TaskSerializer(task, context={'request': request})
-        return Response(serializer.data)
-    except Task.DoesNotExist:
+    serializer_class = TaskValuesSerializer.for_request(request)
+    task = serializer_class.values(Task.objects.filter(pk=pk)).first()
+    if task is None:
         return Response(
             {'error': 'Task not found'}, 
             status=status.HTTP_404_NOT_FOUND
         )
+    serializer = serializer_class(task, context={'request': request})
+    return Response(serializer.data)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -75,4 +111,98 @@ def task_delete(request, pk):
         task.delete()
         return Response({'success': True})
     except Task.DoesNotExist:
-        return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def task_bulk(request):
+    operations = request.data
+    if isinstance(operations, dict):
+        operations = operations.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return Response({'error': 'A list of operations is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(operations) > MAX_OPERATIONS:
+        return Response(
+            {'error': f'At most {MAX_OPERATIONS} operations per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    ok, results = apply_operations(operations, request.user, context={'request': request})
+    return Response(
+        {'results': results},
+        status=status.HTTP_200_OK if ok else status.HTTP_400_BAD_REQUEST
+    )
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def board_summary(request, pk):
+    if get_project_access(pk) is None:
+        return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(count_board(pk))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard(request):
+    return Response(get_dashboard(request.user.pk))
+
+ANALYTICS_DAYS = 90
+MAX_ANALYTICS_DAYS = 366
+
+def _parse_moment(value, end=False):
+    """A datetime, or a date meaning its start (``end``: the start of the next day)."""
+    day = parse_date(value)
+    if day is not None:
+        moment = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+    else:
+        moment = parse_datetime(value)
+        if moment is None:
+            raise ValueError(value)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+def analytics_period(request):
+    """``(since, until)`` from ``?since=`` and ``?until=``; the last 90 days by default."""
+    params = request.query_params
+    until = _parse_moment(params['until'], end=True) if params.get('until') else timezone.now()
+    since = _parse_moment(params['since']) if params.get('since') else until - timedelta(days=ANALYTICS_DAYS)
+    return since, until
+
+def analytics_response(request, pk, compute, key):
+    if get_project_access(pk) is None:
+        return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        since, until = analytics_period(request)
+    except ValueError:
+        return Response({'error': 'since and until must be ISO dates or datetimes'}, status=status.HTTP_400_BAD_REQUEST)
+    if since >= until:
+        return Response({'error': 'since must be before until'}, status=status.HTTP_400_BAD_REQUEST)
+    if until - since > timedelta(days=MAX_ANALYTICS_DAYS):
+        return Response(
+            {'error': f'The period is limited to {MAX_ANALYTICS_DAYS} days'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    result = compute(pk, since, until)
+    data = {'since': since.isoformat(), 'until': until.isoformat()}
+    data.update(result if key is None else {key: result})
+    return Response(data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def time_in_status(request, pk):
+    return analytics_response(request, pk, analytics.time_in_status, 'statuses')
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def cycle_time(request, pk):
+    return analytics_response(request, pk, analytics.cycle_time, None)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def throughput(request, pk):
+    return analytics_response(request, pk, analytics.throughput, 'weeks')
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def cumulative_flow(request, pk):
+    return analytics_response(request, pk, analytics.cumulative_flow, 'days')
@@ -0,0 +1,44 @@
+# task/views_async.py — async read views, routed when ASYNC_READ_VIEWS is on
+
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.settings import api_settings
+from .models import Task
+from .serializers import TaskValuesSerializer
+from .views import task_list_queryset, task_validators
+from project.models import Project
+from core.async_api import async_api_view
+from core.conditional import conditional
+from core.pagination import KeysetPagination
+from core.streaming import NDJSONRenderer, astream_queryset, stream_format
+
+
+@async_api_view(renderer_classes=api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer])
+async def task_list(request, project_id=None):
+    if project_id is not None and not await Project.objects.filter(id=project_id).aexists():
+        return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+    tasks = task_list_queryset(request, project_id)
+    serializer_class = TaskValuesSerializer.for_request(request)
+
+    fmt = stream_format(request)
+    if fmt is not None:
+        return astream_queryset(
+            serializer_class.values(tasks.order_by('id')),
+            serializer_class,
+            fmt=fmt,
+            context={'request': request},
+        )
+
+    paginator = KeysetPagination(ordering=('created_at', 'id'))
+    page = await paginator.apaginate_queryset(serializer_class.values(tasks, *paginator.fields), request)
+    serializer = serializer_class(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(await serializer.adata())
+
+@async_api_view()
+@conditional(task_validators)
+async def task_detail(request, pk):
+    serializer_class = TaskValuesSerializer.for_request(request)
+    task = await serializer_class.values(Task.objects.filter(pk=pk)).afirst()
+    if task is None:
+        return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(await serializer_class(task, context={'request': request}).adata())
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Modal, Button, Form, Spinner, Alert } from 'react-bootstrap';
+import { fetchAllPages } from '../fetchAllPages';
 
 function getCookie(name) {
   const cookieValue = document.cookie
@@ -25,7 +26,7 @@ const AddParticipantsModal = ({ show, onHide, onParticipantsSubmit, projectId })
         setParticipantsError(null);
 
         try {
-          const usersResponse = await fetch('http://localhost:8000/api/users/', {
+          const { response: usersResponse, data: usersData } = await fetchAllPages('http://localhost:8000/api/users/', {
             method: 'GET',
             headers: {
               'Content-Type': 'application/json',
@@ -41,8 +42,6 @@ const AddParticipantsModal = ({ show, onHide, onParticipantsSubmit, projectId })
             throw new Error(`Не вдалося завантажити список користувачів: ${usersResponse.status}`);
           }
 
-          const usersData = await usersResponse.json();
-
           // Получаем текущих участников проекта
           const membersResponse = await fetch(`http://localhost:8000/api/projects/${projectId}/members/`, {
             method: 'GET',
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Modal, Button, Form, Spinner, Alert } from 'react-bootstrap';
+import { fetchAllPages } from '../fetchAllPages';
 
 function getCookie(name) {
   const cookieValue = document.cookie
@@ -34,7 +35,7 @@ const AddTaskModal = ({ show, onHide, onTaskSubmit, projectId }) => {
         console.log('document.cookie:', document.cookie);
 
         try {
-          const response = await fetch('http://127.0.0.1:8000/api/users/', {
+          const { response, data } = await fetchAllPages('http://127.0.0.1:8000/api/users/', {
             method: 'GET',
             headers: {
               'Content-Type': 'application/json',
@@ -45,17 +46,16 @@ const AddTaskModal = ({ show, onHide, onTaskSubmit, projectId }) => {
 
           console.log('Response status:', response.status);
           console.log('Response headers:', response.headers);
-          const text = await response.text();
-          console.log('Response text:', text);
 
           if (!response.ok) {
+            const text = await response.text();
+            console.log('Response text:', text);
             if (response.status === 403) {
               throw new Error('Доступ заборонено. Перевірте авторизацію. Деталі: ' + text);
             }
             throw new Error(`Не вдалося завантажити список користувачів: ${response.status} - ${text}`);
           }
 
-          const data = JSON.parse(text);
           setParticipants(data);
         } catch (e) {
           console.error('Error fetching participants:', e);
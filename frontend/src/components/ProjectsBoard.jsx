@@ -7,6 +7,7 @@ import {
   faPlus, faUsers, faCalendarAlt, faUser 
 } from '@fortawesome/free-solid-svg-icons';
 import { Link, useNavigate } from 'react-router-dom';
+import { fetchAllPages } from '../fetchAllPages';
 
 function getCookie(name) {
   const cookieValue = document.cookie
@@ -34,7 +35,7 @@ const ProjectsBoard = ({ userId }) => {
     setLoading(true);
     setError(null);
     try {
-      const response = await fetch(`http://localhost:8000/api/projects/?user=${userId}`, {
+      const { response, data } = await fetchAllPages(`http://localhost:8000/api/projects/?user=${userId}`, {
         method: 'GET',
         headers: { 
           'Content-Type': 'application/json',
@@ -51,7 +52,6 @@ const ProjectsBoard = ({ userId }) => {
           throw new Error(`HTTP error! status: ${response.status} - ${errorText}`);
         }
       } else {
-        const data = await response.json();
         setProjects(data);
       }
     } catch (e) {
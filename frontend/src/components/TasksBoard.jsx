@@ -7,6 +7,7 @@ import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import { 
   faFlag, faTrashAlt, faExchangeAlt 
 } from '@fortawesome/free-solid-svg-icons';
+import { fetchAllPages } from '../fetchAllPages';
 
 function getCookie(name) {
     const cookieValue = document.cookie
@@ -198,7 +199,7 @@ const TasksBoard = ({ projectId, userId }) => {
         }
       }
 
-      const response = await fetch(url, {
+      const { response, data } = await fetchAllPages(url, {
         method: 'GET',
         headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken },
         credentials: 'include',
@@ -212,7 +213,6 @@ const TasksBoard = ({ projectId, userId }) => {
           throw new Error(`HTTP error! status: ${response.status} - ${errorText}`);
         }
       } else {
-        const data = await response.json();
         setAllTasks(Array.isArray(data) ? data : []);
       }
     } catch (e) {
@@ -0,0 +1,25 @@
+// Списки API (задачі, проекти, користувачі, коментарі) віддаються сторінками;
+// адреса наступної сторінки приходить у заголовку Link з rel="next".
+const NEXT_LINK = /<([^>]+)>;\s*rel="next"/;
+
+export function nextPageUrl(response) {
+  const match = NEXT_LINK.exec(response.headers.get('Link') || '');
+  return match ? match[1] : null;
+}
+
+// Читає всі сторінки списку. Повертає останню відповідь і зібрані елементи;
+// якщо якась сторінка не вдалася, data === null, а response — її відповідь.
+export async function fetchAllPages(url, options) {
+  const data = [];
+  let next = url;
+  let response;
+  while (next) {
+    response = await fetch(next, options);
+    if (!response.ok) {
+      return { response, data: null };
+    }
+    data.push(...(await response.json()));
+    next = nextPageUrl(response);
+  }
+  return { response, data };
+}
@@ -6,6 +6,7 @@ import { faEdit, faTrashAlt, faUser, faCalendarAlt } from '@fortawesome/free-sol
 import AddTaskModal from '../components/AddTaskModal';
 import TasksBoard from '../components/TasksBoard';
 import ParticipantsBoard from '../components/ParticipantsBoard';
+import { fetchAllPages } from '../fetchAllPages';
 
 const ProjectItemPage = () => {
     const [showModal, setShowModal] = useState(false);
@@ -73,7 +74,7 @@ const ProjectItemPage = () => {
 
     const fetchTasks = async () => {
         try {
-            const response = await fetch(`http://localhost:8000/api/tasks/by-project/${pk}/`, {
+            const { response, data } = await fetchAllPages(`http://localhost:8000/api/tasks/by-project/${pk}/`, {
                 method: 'GET',
                 headers: { 'Content-Type': 'application/json' },
                 credentials: 'include',
@@ -81,7 +82,6 @@ const ProjectItemPage = () => {
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
-            const data = await response.json();
             const normalizedTasks = data.map(task => ({
                 ...task,
                 status: task.status.toLowerCase()